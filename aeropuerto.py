@@ -1,19 +1,84 @@
-#esta linea importa tkinter con el alias tk para construir la interfaz
-import tkinter as tk
-#esta linea trae messagebox para mostrar cuadros de dialogo simples
-from tkinter import messagebox
-#esta linea importa la clase Image y ImageTk para cargar y usar imagenes en tkinter
-from PIL import Image, ImageTk
+#tkinter y PIL se importan hasta que se abre una ventana (ver cargar_gui), asi el modo
+#de consola y quien solo use Grafo no pagan el costo de la interfaz grafica; numpy, los
+#procesos, la memoria compartida, mmap y los perfiladores tambien se importan dentro de
+#las funciones que los usan
+#esta linea importa argparse para los comandos de consola
+import argparse
 #esta linea permite construir rutas relativas al archivo actual
 from pathlib import Path
 #esta linea importa funciones para generar numeros aleatorios
 import random
-#esta linea importa time para medir tiempos y usar sleep en la animacion
+#esta linea importa time para medir tiempos de los algoritmos y de la animacion
 import time
 #esta linea importa heapq para usar colas con prioridad en dijkstra
 import heapq
-#esta linea importa deepcopy para clonar estructuras sin referencia compartida
-from copy import deepcopy
+#esta linea importa bisect para ubicar horas en los horarios ordenados
+import bisect
+#esta linea importa array para guardar vertices y pesos en buffers compactos
+from array import array
+#esta linea importa deque para la cola de spfa y OrderedDict para el cache lru
+from collections import deque, OrderedDict
+#esta linea importa las interfaces de diccionario y de secuencia para las vistas del grafo
+from collections.abc import Mapping, MutableMapping, Sequence
+#esta linea importa sys para estimar la memoria que ocupa el cache de rutas
+import sys
+#estas lineas importan csv y json para leer redes de rutas desde archivos
+import csv
+import json
+#esta linea importa math para calcular distancias sobre la esfera terrestre
+import math
+#estas lineas importan el pool de hilos, la cola y los eventos para calcular sin congelar la ventana
+from concurrent.futures import ThreadPoolExecutor
+import queue
+import threading
+#esta linea importa os para saber cuantos nucleos hay
+import os
+#esta linea importa struct para el encabezado del formato binario de snapshot
+import struct
+
+#numpy es opcional: queda en None hasta llamar a cargar_numpy (y sigue en None si no esta instalado)
+np = None
+_numpy_revisado = False
+
+#modulos de la interfaz grafica, quedan en None hasta llamar a cargar_gui
+tk = None
+messagebox = None
+Image = None
+ImageTk = None
+ImageDraw = None
+ImageFont = None
+
+
+#importa numpy la primera vez que se necesita; devuelve el modulo o None si no esta instalado
+def cargar_numpy():
+    global np, _numpy_revisado
+    if not _numpy_revisado:
+        _numpy_revisado = True
+        try:
+            #si esta instalado se usan vistas sin copia sobre los buffers
+            import numpy
+            np = numpy
+        except ImportError:
+            pass
+    return np
+
+
+#importa tkinter y PIL la primera vez que se necesitan y los deja como globales del modulo
+def cargar_gui():
+    global tk, messagebox, Image, ImageTk, ImageDraw, ImageFont
+    if tk is not None:
+        return
+    #esta linea importa tkinter con el alias tk para construir la interfaz
+    import tkinter
+    #esta linea trae messagebox para mostrar cuadros de dialogo simples
+    from tkinter import messagebox as cuadros
+    #esta linea importa la clase Image y ImageTk para cargar y usar imagenes en tkinter
+    from PIL import Image as imagen, ImageTk as imagen_tk
+    #ImageDraw e ImageFont componen la capa estatica (mapa + aristas + nombres) fuera del canvas
+    from PIL import ImageDraw as dibujo, ImageFont as fuentes
+    tk, messagebox, Image, ImageTk = tkinter, cuadros, imagen, imagen_tk
+    ImageDraw, ImageFont = dibujo, fuentes
+
 
 #esta funcion centra la ventana en la pantalla segun ancho y alto dados
 def centrar_ventana(ventana, ancho, alto):
@@ -27,21 +92,509 @@ def centrar_ventana(ventana, ancho, alto):
     ventana.geometry(f"{ancho}x{alto}+{x}+{y}")
 
 
+#contadores de una corrida de un algoritmo de caminos minimos (se piden con estadisticas=...)
+class EstadisticasRuta:
+    """
+    relajaciones: aristas revisadas; mejoras: relajaciones que bajaron una distancia
+    inserciones / extracciones: operaciones sobre la cola (heap, cubetas o cola de spfa)
+    extracciones_obsoletas: entradas sacadas del heap que ya no servian
+    rondas: pasadas de bellman-ford hasta la salida temprana; cola_maxima: mayor tamaño de la cola
+    desde_cache: True si rutas_desde respondio con el cache (los contadores quedan en 0)
+    """
+    __slots__ = ("algoritmo", "origen", "segundos", "relajaciones", "mejoras", "inserciones",
+                 "extracciones", "extracciones_obsoletas", "rondas", "cola_maxima", "desde_cache")
+
+    #constructor con todos los contadores en cero
+    def __init__(self):
+        self.algoritmo = None
+        self.origen = None
+        self.segundos = 0.0
+        self.relajaciones = 0
+        self.mejoras = 0
+        self.inserciones = 0
+        self.extracciones = 0
+        self.extracciones_obsoletas = 0
+        self.rondas = 0
+        self.cola_maxima = 0
+        self.desde_cache = False
+
+    #suma los contadores de una corrida (cola_maxima se queda con el mayor)
+    def anotar(self, cola_maxima=0, **contadores):
+        for nombre, valor in contadores.items():
+            setattr(self, nombre, getattr(self, nombre) + valor)
+        self.cola_maxima = max(self.cola_maxima, cola_maxima)
+
+    #diccionario con todos los campos (para json o logs)
+    def como_dict(self):
+        return {nombre: getattr(self, nombre) for nombre in self.__slots__}
+
+    def __repr__(self):
+        campos = ", ".join(f"{k}={v!r}" for k, v in self.como_dict().items())
+        return f"EstadisticasRuta({campos})"
+
+
+#envoltura para Grafo.envoltura que perfila cada corrida con cProfile
+class PerfilCProfile:
+    #constructor: perfiles guarda (algoritmo, origen, pstats.Stats) de cada corrida
+    def __init__(self):
+        self.perfiles = []
+
+    def __call__(self, algoritmo, origen, correr):
+        #estas lineas importan el perfilador solo cuando se usa
+        import cProfile
+        import pstats
+        perfil = cProfile.Profile()
+        resultado = perfil.runcall(correr)
+        self.perfiles.append((algoritmo, origen, pstats.Stats(perfil)))
+        return resultado
+
+
+#envoltura para Grafo.envoltura que mide el pico de memoria de cada corrida con tracemalloc
+class PerfilMemoria:
+    #constructor: picos guarda (algoritmo, origen, bytes) de cada corrida
+    def __init__(self):
+        self.picos = []
+
+    def __call__(self, algoritmo, origen, correr):
+        #esta linea importa tracemalloc solo cuando se usa
+        import tracemalloc
+        #si tracemalloc ya estaba activo no detenerlo al terminar
+        propio = not tracemalloc.is_tracing()
+        if propio:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        antes = tracemalloc.get_traced_memory()[0]
+        try:
+            resultado = correr()
+        finally:
+            pico = tracemalloc.get_traced_memory()[1] - antes
+            if propio:
+                tracemalloc.stop()
+        self.picos.append((algoritmo, origen, pico))
+        return resultado
+
+
+#cola de prioridad con indice de posiciones: cada clave aparece una sola vez y su prioridad se puede bajar
+class HeapIndexado:
+    """
+    Heap binario con decrease-key: a diferencia de heapq con entradas repetidas, nunca
+    guarda mas de una entrada por vertice (tamaño O(V) en vez de O(E)).
+    """
+    __slots__ = ("claves", "prioridades", "posicion")
+
+    #constructor de un heap vacio
+    def __init__(self):
+        self.claves = []
+        self.prioridades = []
+        #clave -> indice en las listas paralelas
+        self.posicion = {}
+
+    #numero de claves pendientes
+    def __len__(self):
+        return len(self.claves)
+
+    #agrega la clave o baja su prioridad si la nueva es menor (si es mayor no hace nada)
+    def insertar_o_bajar(self, clave, prioridad):
+        i = self.posicion.get(clave)
+        if i is None:
+            i = len(self.claves)
+            self.claves.append(clave)
+            self.prioridades.append(prioridad)
+        elif prioridad < self.prioridades[i]:
+            self.prioridades[i] = prioridad
+        else:
+            return
+        self._subir(i, clave, prioridad)
+
+    #saca y devuelve (prioridad, clave) con la menor prioridad
+    def extraer(self):
+        claves, prioridades = self.claves, self.prioridades
+        clave, prioridad = claves[0], prioridades[0]
+        del self.posicion[clave]
+        ultima_clave, ultima_prioridad = claves.pop(), prioridades.pop()
+        if claves:
+            self._bajar(0, ultima_clave, ultima_prioridad)
+        return prioridad, clave
+
+    #mueve hacia la raiz el elemento que debe quedar en i
+    def _subir(self, i, clave, prioridad):
+        claves, prioridades, posicion = self.claves, self.prioridades, self.posicion
+        while i > 0:
+            padre = (i - 1) >> 1
+            if prioridades[padre] <= prioridad:
+                break
+            claves[i] = claves[padre]
+            prioridades[i] = prioridades[padre]
+            posicion[claves[i]] = i
+            i = padre
+        claves[i] = clave
+        prioridades[i] = prioridad
+        posicion[clave] = i
+
+    #mueve hacia las hojas el elemento que debe quedar en i
+    def _bajar(self, i, clave, prioridad):
+        claves, prioridades, posicion = self.claves, self.prioridades, self.posicion
+        n = len(claves)
+        while True:
+            hijo = 2 * i + 1
+            if hijo >= n:
+                break
+            if hijo + 1 < n and prioridades[hijo + 1] < prioridades[hijo]:
+                hijo += 1
+            if prioridades[hijo] >= prioridad:
+                break
+            claves[i] = claves[hijo]
+            prioridades[i] = prioridades[hijo]
+            posicion[claves[i]] = i
+            i = hijo
+        claves[i] = clave
+        prioridades[i] = prioridad
+        posicion[clave] = i
+
+
+#cola de cubetas de dial para prioridades enteras que crecen de a lo mas peso_maximo por paso
+class ColaCubetas:
+    """
+    Sirve para dijkstra con pesos enteros entre 0 y peso_maximo: todas las prioridades
+    pendientes estan en [actual, actual + peso_maximo], asi que peso_maximo + 1 cubetas
+    circulares bastan. Insertar y bajar son O(1); extraer avanza sobre cubetas vacias.
+    """
+    __slots__ = ("cubetas", "tam", "prioridad", "actual")
+
+    #constructor que recibe el mayor peso de arista posible
+    def __init__(self, peso_maximo):
+        self.tam = peso_maximo + 1
+        #cada cubeta es un dict usado como conjunto (borrar una clave es O(1))
+        self.cubetas = [{} for _ in range(self.tam)]
+        #clave -> prioridad actual
+        self.prioridad = {}
+        #menor prioridad que puede quedar pendiente
+        self.actual = 0
+
+    #numero de claves pendientes
+    def __len__(self):
+        return len(self.prioridad)
+
+    #agrega la clave o la cambia a una cubeta menor si la nueva prioridad es menor
+    def insertar_o_bajar(self, clave, prioridad):
+        vieja = self.prioridad.get(clave)
+        if vieja is not None:
+            if prioridad >= vieja:
+                return
+            del self.cubetas[vieja % self.tam][clave]
+        self.prioridad[clave] = prioridad
+        self.cubetas[prioridad % self.tam][clave] = None
+
+    #saca y devuelve (prioridad, clave) con la menor prioridad
+    def extraer(self):
+        cubetas, tam = self.cubetas, self.tam
+        while not cubetas[self.actual % tam]:
+            self.actual += 1
+        clave, _ = cubetas[self.actual % tam].popitem()
+        return self.prioridad.pop(clave), clave
+
+
 #clase que representa un grafo usando listas de adyacencia
 class Grafo:
+    #algoritmos de una sola fuente que devuelven (dist, prev): nombre corto -> metodo
+    ALGORITMOS = {
+        "bellman": "bellman_ford_con_prev",
+        "spfa": "spfa_con_prev",
+        "dijkstra": "dijkstra_con_prev",
+    }
+    #mayor peso entero con el que dijkstra usa cubetas de dial (una cubeta por valor posible)
+    CUBETAS_MAXIMO = 1024
+    #arboles hacia un destino que se guardan para k_rutas_mas_cortas (los de uso mas reciente)
+    MAX_ARBOLES_DESTINO = 16
+    #nombres para mostrar en la interfaz
+    NOMBRES_ALGORITMOS = {
+        "bellman": "Bellman-Ford",
+        "spfa": "SPFA",
+        "dijkstra": "Dijkstra",
+        "bidireccional": "Dijkstra bidireccional",
+        "astar": "A*",
+    }
+    #algoritmos de origen a destino que devuelven (distancia, camino): nombre corto -> metodo
+    PUNTO_A_PUNTO = {
+        "bidireccional": "dijkstra_bidireccional",
+        "astar": "a_estrella",
+    }
+
     #constructor que inicializa la estructura de adyacencia vacia
-    def __init__(self):
+    #cache_max_entradas y cache_max_bytes limitan el cache de rutas por (algoritmo, origen)
+    def __init__(self, cache_max_entradas=64, cache_max_bytes=32 * 1024 * 1024):
         #diccionario donde cada clave es un nodo y el valor es lista de tuplas (destino,peso)
         #ejemplo: {'CDMX': [('Cancun',3), ('Guadalajara',1)], ...}
         self.adyacencia = {}
+        #contador que aumenta con cada modificacion; invalida los resultados guardados
+        self.revision = 0
+        #tabla de todos los pares guardada como (revision, tabla)
+        self._tabla = None
+        #jerarquia de contraccion guardada como (revision, minimo, jerarquia)
+        self._jerarquia = None
+        #arboles de caminos minimos hacia cada destino (lru): destino -> (revision, dist, siguiente)
+        self._arboles_destino = OrderedDict()
+        #(revision, peso minimo, peso maximo, todos enteros) para elegir la cola de dijkstra
+        self._resumen = None
+        #funcion (algoritmo, origen, correr) que envuelve cada calculo de rutas_desde, por ejemplo
+        #PerfilCProfile() o PerfilMemoria(); None para correr directo
+        self.envoltura = None
+        #cache lru: (algoritmo, origen) -> (dist, prev, bytes estimados)
+        self._cache = OrderedDict()
+        #revision del grafo a la que corresponde el contenido del cache
+        self._cache_revision = 0
+        self._cache_bytes = 0
+        self.cache_max_entradas = cache_max_entradas
+        self.cache_max_bytes = cache_max_bytes
+        #contadores de aciertos y fallos para saber si el cache esta sirviendo
+        self.cache_aciertos = 0
+        self.cache_fallos = 0
+        #aristas entrantes destino -> [(origen,peso)], se arma solo cuando se necesita
+        self._inverso = None
+        #indice (origen,destino) -> lista de pesos de los vuelos paralelos, tambien bajo demanda
+        self._indice_pesos = None
+        #coordenadas reales nombre -> (lat, lon) para la cota de a_estrella
+        self.coordenadas = {}
+        #(revision, horas por km minimas, hay pesos negativos) calculado para la revision indicada
+        self._cota = None
+        #tarifa de cada vuelo (origen, destino) -> precio para rutas_pareto (los paralelos comparten tarifa)
+        self.tarifas = {}
 
     #agrega una arista dirigida origen->destino con un peso
     def agregar_arista(self, origen, destino, peso):
+        #peso efectivo anterior, solo hace falta si hay rutas guardadas que reparar
+        viejo = self._peso_efectivo(origen, destino) if self._cache_vigente() else None
         #si el origen no existe en el diccionario, crear lista vacia
         if origen not in self.adyacencia:
             self.adyacencia[origen] = []
         #añadir la tupla (destino,peso) a la lista del origen
         self.adyacencia[origen].append((destino, peso))
+        #mantener las aristas entrantes y el indice de pesos si ya estaban armados
+        if self._inverso is not None:
+            self._inverso.setdefault(destino, []).append((origen, peso))
+        if self._indice_pesos is not None:
+            self._indice_pesos.setdefault((origen, destino), []).append(peso)
+        #marcar el grafo como modificado y reparar las rutas guardadas
+        self._registrar_cambio(origen, destino, viejo)
+
+    #cambia el peso del vuelo origen->destino (si hay vuelos paralelos cambian todos)
+    def actualizar_peso(self, origen, destino, peso):
+        lista = self.adyacencia.get(origen, [])
+        if not any(d == destino for d, _ in lista):
+            raise KeyError(f"No existe la arista {origen} -> {destino}")
+        viejo = self._peso_efectivo(origen, destino) if self._cache_vigente() else None
+        self.adyacencia[origen] = [(d, peso if d == destino else w) for d, w in lista]
+        if self._inverso is not None:
+            self._inverso[destino] = [(o, peso if o == origen else w) for o, w in self._inverso[destino]]
+        if self._indice_pesos is not None:
+            legs = self._indice_pesos[(origen, destino)]
+            legs[:] = [peso] * len(legs)
+        self._registrar_cambio(origen, destino, viejo)
+
+    #elimina el vuelo origen->destino (todos los paralelos)
+    def eliminar_arista(self, origen, destino):
+        lista = self.adyacencia.get(origen, [])
+        if not any(d == destino for d, _ in lista):
+            raise KeyError(f"No existe la arista {origen} -> {destino}")
+        viejo = self._peso_efectivo(origen, destino) if self._cache_vigente() else None
+        self.adyacencia[origen] = [(d, w) for d, w in lista if d != destino]
+        if self._inverso is not None:
+            self._inverso[destino] = [(o, w) for o, w in self._inverso[destino] if o != origen]
+        if self._indice_pesos is not None:
+            del self._indice_pesos[(origen, destino)]
+        self._registrar_cambio(origen, destino, viejo)
+
+    #reemplaza todas las aristas que salen de origen por la lista de tuplas (destino,peso)
+    def reemplazar_aristas(self, origen, aristas):
+        nuevas = list(aristas)
+        #actualizar el indice de pesos solo en las aristas de este origen
+        if self._indice_pesos is not None:
+            for v, _ in self.adyacencia.get(origen, ()):
+                self._indice_pesos.pop((origen, v), None)
+            for v, w in nuevas:
+                self._indice_pesos.setdefault((origen, v), []).append(w)
+        self.adyacencia[origen] = nuevas
+        #las entrantes se vuelven a armar cuando se necesiten
+        self._inverso = None
+        #marcar el grafo como modificado
+        self.revision += 1
+
+    #peso de la arista origen->destino en O(1); con vuelos paralelos el menor, None si no existe
+    def peso(self, origen, destino):
+        legs = self._pesos_por_arista().get((origen, destino))
+        if not legs:
+            return None
+        return legs[0] if len(legs) == 1 else min(legs)
+
+    #todos los pesos de los vuelos paralelos origen->destino (lista vacia si no hay)
+    def pesos_paralelos(self, origen, destino):
+        return list(self._pesos_por_arista().get((origen, destino), ()))
+
+    #devuelve el indice (origen,destino) -> [pesos], armandolo la primera vez
+    def _pesos_por_arista(self):
+        if self._indice_pesos is None:
+            self._indice_pesos = {}
+            for u, lista in self.adyacencia.items():
+                for v, w in lista:
+                    self._indice_pesos.setdefault((u, v), []).append(w)
+        return self._indice_pesos
+
+    #peso minimo entre los vuelos origen->destino (inf si no hay ninguno)
+    def _peso_efectivo(self, origen, destino):
+        w = self.peso(origen, destino)
+        return float("inf") if w is None else w
+
+    #devuelve el diccionario de aristas entrantes destino -> [(origen,peso)]
+    def _entrantes(self):
+        if self._inverso is None:
+            self._inverso = {}
+            for u, lista in self.adyacencia.items():
+                for v, w in lista:
+                    self._inverso.setdefault(v, []).append((u, w))
+        return self._inverso
+
+    #true si el cache tiene rutas que corresponden a la revision actual
+    def _cache_vigente(self):
+        return bool(self._cache) and self._cache_revision == self.revision
+
+    #sube la revision y repara las rutas guardadas tras cambiar la arista origen->destino
+    def _registrar_cambio(self, origen, destino, viejo):
+        self.revision += 1
+        #viejo es None cuando no habia rutas vigentes: el cache se vaciara en la proxima consulta
+        if viejo is None:
+            return
+        nuevo = self._peso_efectivo(origen, destino)
+        #origen sigue siendo clave de la adyacencia; destino deja de ser vertice si era su ultima arista
+        desaparecido = None
+        if destino not in self.adyacencia and not self._entrantes().get(destino):
+            desaparecido = destino
+        for clave, (dist, prev, tam) in list(self._cache.items()):
+            algoritmo, inicio = clave
+            #dijkstra no es exacto con negativos, un ciclo guardado puede haber desaparecido
+            #y un origen que no existia (dist vacio) puede haber aparecido
+            #si el origen de la consulta ya no esta en el grafo una corrida nueva devuelve ({}, {})
+            if not dist or algoritmo not in ("bellman", "spfa") or inicio == desaparecido:
+                del self._cache[clave]
+                self._cache_bytes -= tam
+                continue
+            #reparar una copia para no cambiar resultados que ya se entregaron
+            dist, prev = dict(dist), dict(prev)
+            if not self._reparar_arbol(dist, prev, origen, destino, viejo, nuevo):
+                #la disminucion pudo formar un ciclo negativo: recalcular completo
+                dist, prev = getattr(self, self.ALGORITMOS[algoritmo])(inicio)
+            elif desaparecido is not None:
+                #igual que una corrida nueva: un vertice sin aristas no aparece en dist ni en prev
+                dist.pop(desaparecido, None)
+                prev.pop(desaparecido, None)
+            #el tamaño cambia si entraron o salieron vertices
+            nuevo_tam = self._tam_resultado(dist, prev)
+            self._cache[clave] = (dist, prev, nuevo_tam)
+            self._cache_bytes += nuevo_tam - tam
+        self._cache_revision = self.revision
+        self._recortar_cache()
+
+    #repara en el lugar un arbol de caminos minimos (dist, prev) tras cambiar u->v de viejo a nuevo
+    def _reparar_arbol(self, dist, prev, u, v, viejo, nuevo):
+        """
+        Actualizacion incremental al estilo Ramalingam-Reps.
+        Las distancias viejas sirven de potenciales: w(x,y) + d(x) - d(y) >= 0 en todas las
+        aristas que no cambiaron, asi que basta una busqueda tipo dijkstra sobre los vertices
+        afectados ordenada por cuanto cambio su distancia.
+        devuelve False si la disminucion pudo formar un ciclo negativo.
+        """
+        inf = float("inf")
+        #vertices nuevos entran como no alcanzables
+        for x in (u, v):
+            if x not in dist:
+                dist[x] = inf
+                prev[x] = None
+        if dist[u] == inf or nuevo == viejo:
+            return True
+
+        if nuevo < viejo:
+            #disminucion: solo cambia algo si mejora a v
+            nd = dist[u] + nuevo
+            if nd >= dist[v]:
+                return True
+            #un lazo negativo es un ciclo negativo
+            if v == u:
+                return False
+            #clave = distancia nueva - distancia original (la propia distancia si antes era inf)
+            original = {v: dist[v]}
+            dist[v] = nd
+            prev[v] = u
+            #aristas de la cadena de mejoras desde u: si llega a V repite un vertice, y como
+            #cada llegada tuvo que mejorar a la anterior, ese ciclo es negativo
+            #(cubre ciclos que ya existian en una zona que antes no era alcanzable)
+            aristas = {v: 1}
+            n = len(dist)
+            heap = [(nd - original[v] if original[v] != inf else nd, v)]
+            while heap:
+                clave, x = heapq.heappop(heap)
+                dx = dist[x]
+                #entrada vieja: x mejoro otra vez despues de encolarse
+                if clave != (dx - original[x] if original[x] != inf else dx):
+                    continue
+                for y, w in self.adyacencia.get(x, ()):
+                    nd = dx + w
+                    if nd < dist[y]:
+                        #si mejora el propio u el camino paso por un ciclo negativo
+                        if y == u:
+                            return False
+                        aristas[y] = aristas[x] + 1
+                        if aristas[y] >= n:
+                            return False
+                        if y not in original:
+                            original[y] = dist[y]
+                        dist[y] = nd
+                        prev[y] = x
+                        heapq.heappush(heap, (nd - original[y] if original[y] != inf else nd, y))
+            return True
+
+        #aumento o eliminacion: solo importa si u->v era arista del arbol
+        if prev.get(v) != u or dist[u] + viejo != dist[v]:
+            return True
+        #vertices afectados: el subarbol de v en el arbol de caminos minimos
+        hijos = {}
+        for x, p in prev.items():
+            if p is not None:
+                hijos.setdefault(p, []).append(x)
+        afectados = set()
+        pila = [v]
+        while pila:
+            x = pila.pop()
+            afectados.add(x)
+            pila.extend(hijos.get(x, ()))
+
+        #mejor llegada de cada afectado desde los vertices no afectados
+        original = {x: dist[x] for x in afectados}
+        entrantes = self._entrantes()
+        heap = []
+        for x in afectados:
+            mejor, mejor_p = inf, None
+            for p, w in entrantes.get(x, ()):
+                if p in afectados or dist[p] == inf:
+                    continue
+                if dist[p] + w < mejor:
+                    mejor, mejor_p = dist[p] + w, p
+            dist[x] = mejor
+            prev[x] = mejor_p
+            if mejor != inf:
+                heapq.heappush(heap, (mejor - original[x], x))
+
+        #dijkstra restringido a los afectados con clave = aumento de la distancia (siempre >= 0)
+        fijados = set()
+        while heap:
+            clave, x = heapq.heappop(heap)
+            if x in fijados or clave != dist[x] - original[x]:
+                continue
+            fijados.add(x)
+            for y, w in self.adyacencia.get(x, ()):
+                if y in afectados and y not in fijados and dist[x] + w < dist[y]:
+                    dist[y] = dist[x] + w
+                    prev[y] = x
+                    heapq.heappush(heap, (dist[y] - original[y], y))
+        return True
 
     #devuelve la lista de vertices del grafo (tanto claves como destinos)
     def obtener_vertices(self):
@@ -54,114 +607,2683 @@ class Grafo:
         #convertir a lista y devolver
         return list(vertices)
 
-    #metodo bellman-ford que tambien devuelve el diccionario prev para reconstruir caminos
-    def bellman_ford_con_prev(self, inicio):
-        """
-        Ejecuta Bellman-Ford: devuelve (dist, prev) o (None, None) si detecta ciclo negativo.
-        dist: dict nodo -> distancia mínima desde inicio
-        prev: dict nodo -> predecesor en camino mínimo
-        """
-        #obtener todos los vertices presentes en el grafo
-        vertices = self.obtener_vertices()
-        #inicializar distancias con infinito para todos los vertices
-        dist = {v: float("inf") for v in vertices}
-        #inicializar predecesores en None
-        prev = {v: None for v in vertices}
-        #si el nodo inicio no esta en el grafo, devolver diccionarios vacios
-        if inicio not in dist:
-            #inicio no en grafo
-            return {}, {}
+    #asigna las coordenadas (lat, lon) de los aeropuertos; acepta dict o pares (nombre, (lat, lon))
+    def fijar_coordenadas(self, coordenadas):
+        self.coordenadas = dict(coordenadas)
+        self._cota = None
+
+    #devuelve (horas por km minimas, hay pesos negativos) para la revision actual
+    def _cota_horas_por_km(self):
+        """
+        La cota de a_estrella es factor * distancia_gran_circulo(v, destino). Con el factor
+        igual al menor peso/km de todas las aristas la cota nunca supera el costo real y es
+        consistente (desigualdad del triangulo), asi que A* puede cerrar cada vertice una vez.
+        Si falta la coordenada de algun vertice el factor es 0 y A* se comporta como Dijkstra.
+        """
+        if self._cota is not None and self._cota[0] == self.revision:
+            return self._cota[1], self._cota[2]
+        coords = self.coordenadas
+        factor = float("inf")
+        negativos = self._resumen_pesos()[0] < 0
+        for u, lista in self.adyacencia.items():
+            for v, w in lista:
+                if u not in coords or v not in coords:
+                    factor = 0
+                    continue
+                km = distancia_gran_circulo(*coords[u], *coords[v])
+                if km > 0:
+                    factor = min(factor, max(0, w) / km)
+        if factor == float("inf"):
+            factor = 0
+        self._cota = (self.revision, factor, negativos)
+        return factor, negativos
+
+    #guarda la tarifa de cada vuelo: dict o pares ((origen, destino), tarifa)
+    def fijar_tarifas(self, tarifas):
+        self.tarifas = dict(tarifas)
+
+    #con pesos negativos las busquedas de punto a punto no son validas: usar bellman-ford completo
+    def _ruta_con_bellman(self, origen, destino):
+        dist, prev = self.rutas_desde(origen, "bellman")
+        if dist is None:
+            return None, None
+        return dist.get(destino, float("inf")), reconstruir_camino(prev, origen, destino)
+
+    #dijkstra desde ambos extremos a la vez; termina en cuanto los dos frentes garantizan el minimo
+    def dijkstra_bidireccional(self, origen, destino):
+        """
+        Devuelve (distancia, camino). Sin camino: (inf, [origen]). Si el grafo tiene pesos
+        negativos usa bellman-ford (ciclo negativo alcanzable: (None, None)).
+        """
+        if self._cota_horas_por_km()[1]:
+            return self._ruta_con_bellman(origen, destino)
+        if origen == destino:
+            return 0, [origen]
+        inf = float("inf")
+        #adelante sigue las aristas salientes y atras las entrantes; cada lado con su heap
+        lados = (
+            {"ady": self.adyacencia, "dist": {origen: 0}, "prev": {origen: None}, "heap": [(0, origen)], "fijos": set()},
+            {"ady": self._entrantes(), "dist": {destino: 0}, "prev": {destino: None}, "heap": [(0, destino)], "fijos": set()},
+        )
+        mejor = inf
+        encuentro = None
+        while lados[0]["heap"] and lados[1]["heap"]:
+            #criterio de paro: ningun camino por vertices sin fijar puede mejorar al encontrado
+            if lados[0]["heap"][0][0] + lados[1]["heap"][0][0] >= mejor:
+                break
+            #avanzar el lado con la frontera mas corta
+            lado, otro = (lados[0], lados[1]) if len(lados[0]["heap"]) <= len(lados[1]["heap"]) else (lados[1], lados[0])
+            d_u, u = heapq.heappop(lado["heap"])
+            if u in lado["fijos"]:
+                continue
+            lado["fijos"].add(u)
+            dist, prev = lado["dist"], lado["prev"]
+            for v, w in lado["ady"].get(u, ()):
+                nd = d_u + w
+                if nd < dist.get(v, inf):
+                    dist[v] = nd
+                    prev[v] = u
+                    heapq.heappush(lado["heap"], (nd, v))
+                #si el otro lado ya alcanzo v hay un camino completo candidato
+                if v in otro["dist"] and dist[v] + otro["dist"][v] < mejor:
+                    mejor = dist[v] + otro["dist"][v]
+                    encuentro = v
+        if encuentro is None:
+            return inf, [origen]
+        #mitad de ida: del encuentro hacia atras hasta el origen; mitad de vuelta: hasta el destino
+        camino = reconstruir_camino(lados[0]["prev"], origen, encuentro)
+        cur = lados[1]["prev"][encuentro]
+        while cur is not None:
+            camino.append(cur)
+            cur = lados[1]["prev"][cur]
+        return mejor, camino
+
+    #a* con cota de gran circulo: explora primero los vertices que van hacia el destino
+    def a_estrella(self, origen, destino):
+        """
+        Devuelve (distancia, camino) como dijkstra_bidireccional. La cota usa
+        self.coordenadas (ver fijar_coordenadas); sin coordenadas equivale a Dijkstra que
+        se detiene al fijar el destino.
+        """
+        factor, negativos = self._cota_horas_por_km()
+        if negativos:
+            return self._ruta_con_bellman(origen, destino)
+        inf = float("inf")
+        coords = self.coordenadas
+        #un destino que no esta en el grafo no tiene coordenadas: sin cota
+        if destino not in coords:
+            factor = 0
+        #cota de cada vertice, calculada la primera vez que se alcanza
+        cotas = {}
+
+        #un vertice sin coordenadas (p. ej. un origen que no esta en el grafo) tiene cota 0
+        def cota(v):
+            if v not in cotas:
+                cotas[v] = factor * distancia_gran_circulo(*coords[v], *coords[destino]) if factor and v in coords else 0
+            return cotas[v]
+
+        dist = {origen: 0}
+        prev = {origen: None}
+        #heap de (distancia + cota, distancia, vertice)
+        heap = [(cota(origen), 0, origen)]
+        cerrados = set()
+        while heap:
+            _, d_u, u = heapq.heappop(heap)
+            if u in cerrados:
+                continue
+            #la cota es consistente: al sacar el destino su distancia ya es la minima
+            if u == destino:
+                return d_u, reconstruir_camino(prev, origen, destino)
+            cerrados.add(u)
+            for v, w in self.adyacencia.get(u, ()):
+                nd = d_u + w
+                if nd < dist.get(v, inf):
+                    dist[v] = nd
+                    prev[v] = u
+                    heapq.heappush(heap, (nd + cota(v), nd, v))
+        return inf, [origen]
+
+    #ruta de origen a destino con un algoritmo de PUNTO_A_PUNTO, devuelve (distancia, camino)
+    def ruta_entre(self, origen, destino, algoritmo="astar"):
+        return getattr(self, self.PUNTO_A_PUNTO[algoritmo])(origen, destino)
+
+    #frontera de pareto entre origen y destino con tres criterios: tiempo, tarifa y escalas
+    def rutas_pareto(self, origen, destino, epsilon=0, max_escalas=None):
+        """
+        Devuelve [(tiempo, tarifa, escalas, camino), ...] ordenado por tiempo: las rutas que
+        ninguna otra mejora en los tres criterios a la vez. La tarifa sale de self.tarifas
+        (ver fijar_tarifas), se suponen no negativas; un vuelo sin tarifa cuenta 0.
+        epsilon: una ruta nueva se descarta si otra ya es a lo mas (1 + epsilon) veces peor en
+        tiempo y tarifa con no mas escalas; con epsilon > 0 la frontera queda mas chica y rapida.
+        max_escalas: limite de escalas (opcional). Ciclo negativo alcanzable: None.
+        """
+        negativos = self._resumen_pesos()[0] < 0
+        #con negativos la busqueda sigue siendo correcta, pero un ciclo negativo no tiene frontera
+        if negativos and self.rutas_desde(origen, "bellman")[0] is None:
+            return None
+        if origen == destino:
+            return [(0, 0, 0, [origen])]
+        tarifas = self.tarifas
+        #sin negativos: lo minimo que falta desde cada vertice hasta el destino en cada criterio
+        #(una sola busqueda hacia atras por criterio); sirve para podar contra la frontera ya hallada
+        if not negativos:
+            faltan_tiempo = self._minimos_hacia(destino, lambda u, v, w: w)
+            faltan_tarifa = self._minimos_hacia(destino, lambda u, v, w: max(0, tarifas.get((u, v), 0)))
+            faltan_tramos = self._minimos_hacia(destino, lambda u, v, w: 1)
+        #una ruta de pareto nunca repite aeropuerto (el ciclo solo suma escalas), asi que basta n-1 tramos
+        limite = max(1, len(self.obtener_vertices()) - 1)
+        if max_escalas is not None:
+            limite = min(limite, max_escalas + 1)
+        #etiquetas[i] = (tiempo, tarifa, tramos, vertice, etiqueta padre); las bolsas solo guardan ids
+        etiquetas = [(0, 0, 0, origen, -1)]
+        vivas = bytearray(b"\x01")
+        bolsas = {origen: [0]}
+        heap = [(0, 0, 0, 0)]
+        while heap:
+            _, _, _, e = heapq.heappop(heap)
+            #una etiqueta dominada despues de entrar al heap ya no se extiende
+            if not vivas[e]:
+                continue
+            tiempo, tarifa, tramos, u, _ = etiquetas[e]
+            if u == destino or tramos >= limite:
+                continue
+            for v, w in self.adyacencia.get(u, ()):
+                nt, nf, nk = tiempo + w, tarifa + tarifas.get((u, v), 0), tramos + 1
+                #tope de tiempo y tarifa para que otra etiqueta la domine (con la tolerancia epsilon)
+                tt = nt + epsilon * abs(nt)
+                tf = nf + epsilon * abs(nf)
+                #sin negativos: si ni con lo minimo que falta supera a la frontera del destino, no sirve
+                if not negativos and v != destino:
+                    if v not in faltan_tiempo:
+                        continue
+                    ct, cf, ck = tt + faltan_tiempo[v], tf + faltan_tarifa[v], nk + faltan_tramos[v]
+                    if any(etiquetas[i][0] <= ct and etiquetas[i][1] <= cf and etiquetas[i][2] <= ck
+                           for i in bolsas.get(destino, ())):
+                        continue
+                bolsa = bolsas.setdefault(v, [])
+                if any(etiquetas[i][0] <= tt and etiquetas[i][1] <= tf and etiquetas[i][2] <= nk for i in bolsa):
+                    continue
+                #la nueva etiqueta saca de la bolsa a las que domina
+                quedan = []
+                for i in bolsa:
+                    t_i, f_i, k_i = etiquetas[i][:3]
+                    if nt <= t_i and nf <= f_i and nk <= k_i:
+                        vivas[i] = 0
+                    else:
+                        quedan.append(i)
+                quedan.append(len(etiquetas))
+                bolsas[v] = quedan
+                heapq.heappush(heap, (nt, nf, nk, len(etiquetas)))
+                etiquetas.append((nt, nf, nk, v, e))
+                vivas.append(1)
+        #reconstruir cada ruta siguiendo los padres
+        frontera = []
+        for i in bolsas.get(destino, ()):
+            t_i, f_i, k_i = etiquetas[i][:3]
+            camino = []
+            while i >= 0:
+                camino.append(etiquetas[i][3])
+                i = etiquetas[i][4]
+            camino.reverse()
+            frontera.append((t_i, f_i, k_i - 1, camino))
+        frontera.sort(key=lambda r: r[:3])
+        return frontera
+
+    #dijkstra sobre las aristas entrantes: costo minimo de cada vertice hasta destino (sin los inalcanzables)
+    #si se pasa siguiente, se llena con el vertice que sigue a cada uno en su camino minimo
+    def _minimos_hacia(self, destino, costo, siguiente=None):
+        dist = {destino: 0}
+        heap = [(0, destino)]
+        while heap:
+            d_v, v = heapq.heappop(heap)
+            if d_v > dist[v]:
+                continue
+            for u, w in self._entrantes().get(v, ()):
+                nd = d_v + costo(u, v, w)
+                if nd < dist.get(u, float("inf")):
+                    dist[u] = nd
+                    if siguiente is not None:
+                        siguiente[u] = v
+                    heapq.heappush(heap, (nd, u))
+        return dist
+
+    #arbol de caminos minimos hacia destino: (dist, siguiente), guardado hasta que el grafo cambie
+    def _arbol_hacia(self, destino):
+        """
+        dist[v]: distancia minima de v a destino (solo los vertices que llegan a destino)
+        siguiente[v]: vertice que sigue a v en ese camino (None en el destino)
+        Con pesos negativos se usa bellman-ford hacia atras; si un ciclo negativo llega
+        al destino devuelve (None, None).
+        """
+        guardado = self._arboles_destino.get(destino)
+        if guardado is not None and guardado[0] == self.revision:
+            self._arboles_destino.move_to_end(destino)
+            return guardado[1], guardado[2]
+        siguiente = {destino: None}
+        if self._resumen_pesos()[0] >= 0:
+            dist = self._minimos_hacia(destino, lambda u, v, w: w, siguiente)
+        else:
+            entrantes = self._entrantes()
+            dist = {destino: 0}
+            inf = float("inf")
+            #a lo mas n-1 rondas; si la ronda n aun mejora hay un ciclo negativo
+            for _ in range(len(self.obtener_vertices())):
+                cambio = False
+                for v in list(dist):
+                    for u, w in entrantes.get(v, ()):
+                        if dist[v] + w < dist.get(u, inf):
+                            dist[u] = dist[v] + w
+                            siguiente[u] = v
+                            cambio = True
+                if not cambio:
+                    break
+            else:
+                dist = siguiente = None
+        self._arboles_destino[destino] = (self.revision, dist, siguiente)
+        self._arboles_destino.move_to_end(destino)
+        #los arboles de revisiones viejas o de uso menos reciente se descartan
+        for viejo in [d for d, (revision, _, _) in self._arboles_destino.items() if revision != self.revision]:
+            del self._arboles_destino[viejo]
+        while len(self._arboles_destino) > self.MAX_ARBOLES_DESTINO:
+            self._arboles_destino.popitem(last=False)
+        return dist, siguiente
+
+    #las k rutas mas cortas sin ciclos de origen a destino (algoritmo de yen)
+    def k_rutas_mas_cortas(self, origen, destino, k=3):
+        """
+        Devuelve [(distancia, camino), ...] de menor a mayor, a lo mas k rutas sin aeropuertos
+        repetidos ([] si no hay camino). Ciclo negativo que llega al destino: None.
+        Las distancias hacia el destino se calculan una vez (se guardan las de los ultimos
+        MAX_ARBOLES_DESTINO destinos): la primera ruta sale directo del arbol, y cada desvio
+        de yen es un a* cuya cota es esa distancia, que con aristas quitadas sigue siendo una
+        cota valida y casi exacta.
+        Si el arbol ya evita lo quitado, el desvio se toma del arbol sin buscar.
+        """
+        faltan, siguiente = self._arbol_hacia(destino)
+        if faltan is None:
+            return None
+        if origen not in faltan:
+            return []
+        inf = float("inf")
+
+        #camino del arbol desde v hasta el destino
+        def por_arbol(v):
+            camino = [v]
+            while siguiente[camino[-1]] is not None:
+                camino.append(siguiente[camino[-1]])
+            return camino
+
+        #camino minimo de desvio a destino sin pasar por bloqueados ni por las aristas quitadas
+        def desvio(desde, bloqueados, quitadas):
+            #atajo: el camino del arbol ya cumple las restricciones y su costo es la cota
+            camino = por_arbol(desde)
+            if (desde, camino[1]) not in quitadas and bloqueados.isdisjoint(camino):
+                return faltan[desde], camino
+            #a*: con la distancia exacta hacia el destino los costos reducidos nunca son negativos
+            dist = {desde: 0}
+            prev = {desde: None}
+            #heap de (distancia + cota, cota, distancia, vertice): en empates va primero el mas cercano al destino
+            heap = [(faltan[desde], faltan[desde], 0, desde)]
+            cerrados = set()
+            while heap:
+                _, _, d_u, u = heapq.heappop(heap)
+                if u in cerrados:
+                    continue
+                if u == destino:
+                    return d_u, reconstruir_camino(prev, desde, destino)
+                cerrados.add(u)
+                for v, w in self.adyacencia.get(u, ()):
+                    #los vertices que no llegan al destino ni se miran
+                    if v in bloqueados or v not in faltan or (u, v) in quitadas:
+                        continue
+                    nd = d_u + w
+                    if nd < dist.get(v, inf):
+                        dist[v] = nd
+                        prev[v] = u
+                        heapq.heappush(heap, (nd + faltan[v], faltan[v], nd, v))
+            return None
+
+        rutas = [(faltan[origen], por_arbol(origen))]
+        #indice donde cada ruta se separo de su antecesora: antes de el no hay desvios nuevos (lawler)
+        separacion = [0]
+        #candidatas (distancia, camino, separacion) y caminos ya vistos para no repetirlos
+        candidatas = []
+        vistos = {tuple(rutas[0][1])}
+        while len(rutas) < k:
+            ultimo = rutas[-1][1]
+            #costo acumulado de cada prefijo del ultimo camino (con vuelos paralelos, el menor)
+            acumulado = [0]
+            for u, v in zip(ultimo, ultimo[1:]):
+                acumulado.append(acumulado[-1] + self.peso(u, v))
+            for i in range(separacion[-1], len(ultimo) - 1):
+                raiz = ultimo[:i + 1]
+                #quitar la arista siguiente de cada ruta ya elegida que comparte esta raiz
+                quitadas = {(camino[i], camino[i + 1]) for _, camino in rutas
+                            if len(camino) > i + 1 and camino[:i + 1] == raiz}
+                encontrado = desvio(ultimo[i], set(raiz[:-1]), quitadas)
+                if encontrado is None:
+                    continue
+                costo, resto = encontrado
+                camino = raiz[:-1] + resto
+                if tuple(camino) not in vistos:
+                    vistos.add(tuple(camino))
+                    heapq.heappush(candidatas, (acumulado[i] + costo, camino, i))
+            if not candidatas:
+                break
+            costo, camino, i = heapq.heappop(candidatas)
+            rutas.append((costo, camino))
+            separacion.append(i)
+        return rutas
+
+    #metodo bellman-ford que tambien devuelve el diccionario prev para reconstruir caminos
+    def bellman_ford_con_prev(self, inicio, estadisticas=None):
+        """
+        Ejecuta Bellman-Ford: devuelve (dist, prev) o (None, None) si detecta ciclo negativo.
+        dist: dict nodo -> distancia mínima desde inicio
+        prev: dict nodo -> predecesor en camino mínimo
+        estadisticas: EstadisticasRuta opcional donde se suman los contadores de la corrida
+        """
+        #obtener todos los vertices presentes en el grafo
+        vertices = self.obtener_vertices()
+        #inicializar distancias con infinito para todos los vertices
+        dist = {v: float("inf") for v in vertices}
+        #inicializar predecesores en None
+        prev = {v: None for v in vertices}
+        #si el nodo inicio no esta en el grafo, devolver diccionarios vacios
+        if inicio not in dist:
+            #inicio no en grafo
+            return {}, {}
+
+        #distancia al inicio es cero
+        dist[inicio] = 0
+        #contadores para estadisticas (se suman por vertice, no por arista, para no frenar el ciclo)
+        rondas = relajaciones = mejoras = 0
+
+        #relajar las aristas V-1 veces para propagar distancias
+        for _ in range(len(vertices) - 1):
+            rondas += 1
+            #bandera para detectar si hubo algun cambio en una iteracion
+            cambio = False
+            #recorrer cada nodo que tiene lista de adyacencia
+            for u in self.adyacencia:
+                #si la distancia a u es infinita no se puede relajar sus aristas
+                if dist[u] == float("inf"):
+                    continue
+                lista = self.adyacencia[u]
+                relajaciones += len(lista)
+                #para cada arista u->v con peso, intentar relajar
+                for v, peso in lista:
+                    #si pasando por u llegamos a v con menor costo, actualizar
+                    if dist[u] + peso < dist[v]:
+                        dist[v] = dist[u] + peso
+                        prev[v] = u
+                        cambio = True
+                        mejoras += 1
+            #si en una pasada no hubo cambios, ya convergio y podemos salir
+            if not cambio:
+                break
+        if estadisticas is not None:
+            estadisticas.anotar(rondas=rondas, relajaciones=relajaciones, mejoras=mejoras)
+
+        #una iteracion extra para detectar ciclo negativo: si se puede relajar, hay ciclo negativo
+        for u in self.adyacencia:
+            #si u no fue alcanzable, ignorarlo
+            if dist[u] == float("inf"):
+                continue
+            for v, peso in self.adyacencia[u]:
+                if dist[u] + peso < dist[v]:
+                    #retornar None para indicar deteccion de ciclo negativo
+                    return None, None  # ciclo negativo
+
+        #devolver distancias y predecesores
+        return dist, prev
+
+    #metodo dijkstra que devuelve dist y prev (no valido si hay pesos negativos)
+    def dijkstra_con_prev(self, inicio, cola="auto", estadisticas=None):
+        """
+        Ejecuta Dijkstra (solo válido si no hay aristas con peso negativo).
+        devuelve (dist, prev).
+        cola: "heap" (heapq con entradas repetidas), "indexado" (HeapIndexado),
+        "cubetas" (ColaCubetas, pesos enteros no negativos) o "auto" (ver _elegir_cola).
+        estadisticas: EstadisticasRuta opcional donde se suman los contadores de la corrida
+        """
+        #obtener vertices y preparar diccionarios
+        vertices = self.obtener_vertices()
+        dist = {v: float("inf") for v in vertices}
+        prev = {v: None for v in vertices}
+        #si inicio no esta en el grafo devolver diccionarios vacios
+        if inicio not in dist:
+            return {}, {}
+
+        #distancia al inicio es cero
+        dist[inicio] = 0
+        if cola == "auto":
+            cola = self._elegir_cola()
+        if cola != "heap":
+            return self._dijkstra_con_cola(inicio, cola, dist, prev, estadisticas)
+        #crear heap de prioridad con la tupla (dist,nodo)
+        heap = [(0, inicio)]
+        #conjunto para marcar nodos ya procesados
+        visited = set()
+        #contadores para estadisticas
+        extracciones = obsoletas = relajaciones = inserciones = 0
+        cola_maxima = 1
+
+        #mientras queden nodos en la cola
+        while heap:
+            #sacar el nodo con menor distancia conocida
+            d_u, u = heapq.heappop(heap)
+            extracciones += 1
+            #si ya fue procesado, saltarlo
+            if u in visited:
+                obsoletas += 1
+                continue
+            #marcar como procesado
+            visited.add(u)
+            #si el valor obtenido es mayor que el guardado, ignorar
+            if d_u > dist[u]:
+                obsoletas += 1
+                continue
+            #si u no tiene vecinos seguir con la siguiente iteracion
+            if u not in self.adyacencia:
+                continue
+            lista = self.adyacencia[u]
+            relajaciones += len(lista)
+            #recorrer vecinos de u
+            for v, peso in lista:
+                #nota: si peso es negativo dijkstra puede fallar, aqui se usa solo para comparar
+                nd = dist[u] + peso
+                #si al pasar por u se mejora la distancia a v, actualizar y encolar
+                if nd < dist[v]:
+                    dist[v] = nd
+                    prev[v] = u
+                    heapq.heappush(heap, (nd, v))
+                    inserciones += 1
+                    if len(heap) > cola_maxima:
+                        cola_maxima = len(heap)
+
+        if estadisticas is not None:
+            #la insercion del inicio tambien cuenta; cada insercion vino de una mejora
+            estadisticas.anotar(relajaciones=relajaciones, mejoras=inserciones, inserciones=inserciones + 1,
+                                extracciones=extracciones, extracciones_obsoletas=obsoletas,
+                                cola_maxima=cola_maxima)
+        #devolver distancias y predecesores
+        return dist, prev
+
+    #elige la cola de dijkstra segun los pesos actuales
+    def _elegir_cola(self):
+        """
+        Con pesos negativos se queda heapq para conservar exactamente el resultado de
+        siempre (la comparacion de la ventana muestra como falla dijkstra). Con enteros
+        pequeños (horas) usa cubetas de dial y con el resto el heap indexado, que no crece
+        mas alla de un elemento por vertice.
+        """
+        minimo, maximo, enteros = self._resumen_pesos()
+        if minimo < 0:
+            return "heap"
+        if enteros and maximo <= self.CUBETAS_MAXIMO:
+            return "cubetas"
+        return "indexado"
+
+    #devuelve (peso minimo, peso maximo, todos enteros) para la revision actual
+    def _resumen_pesos(self):
+        if self._resumen is not None and self._resumen[0] == self.revision:
+            return self._resumen[1:]
+        minimo, maximo, enteros = 0, 0, True
+        for lista in self.adyacencia.values():
+            for _, w in lista:
+                minimo = min(minimo, w)
+                maximo = max(maximo, w)
+                if enteros and not isinstance(w, int):
+                    enteros = False
+        self._resumen = (self.revision, minimo, maximo, enteros)
+        return minimo, maximo, enteros
+
+    #dijkstra con una cola que permite bajar prioridades: cada vertice se saca una sola vez
+    def _dijkstra_con_cola(self, inicio, cola, dist, prev, estadisticas=None):
+        if cola == "cubetas":
+            minimo, maximo, enteros = self._resumen_pesos()
+            if minimo < 0 or not enteros:
+                raise ValueError("la cola de cubetas necesita pesos enteros no negativos")
+            pendientes = ColaCubetas(maximo)
+        elif cola == "indexado":
+            pendientes = HeapIndexado()
+        else:
+            raise ValueError(f"cola desconocida: {cola}")
+        pendientes.insertar_o_bajar(inicio, 0)
+        adyacencia = self.adyacencia
+        extracciones = relajaciones = mejoras = 0
+        cola_maxima = 1
+        while pendientes:
+            d_u, u = pendientes.extraer()
+            extracciones += 1
+            lista = adyacencia.get(u, ())
+            relajaciones += len(lista)
+            for v, peso in lista:
+                nd = d_u + peso
+                if nd < dist[v]:
+                    dist[v] = nd
+                    prev[v] = u
+                    pendientes.insertar_o_bajar(v, nd)
+                    mejoras += 1
+                    if len(pendientes) > cola_maxima:
+                        cola_maxima = len(pendientes)
+        if estadisticas is not None:
+            #aqui cada mejora es una insercion o un decrease-key y nunca hay entradas obsoletas
+            estadisticas.anotar(relajaciones=relajaciones, mejoras=mejoras, inserciones=mejoras + 1,
+                                extracciones=extracciones, cola_maxima=cola_maxima)
+        return dist, prev
+
+    #variante de bellman-ford con cola: solo relaja aristas de vertices que acaban de mejorar
+    def spfa_con_prev(self, inicio, estadisticas=None):
+        """
+        Ejecuta SPFA (Bellman-Ford con cola) con las heuristicas SLF y LLL.
+        devuelve (dist, prev) o (None, None) si detecta ciclo negativo, igual que bellman_ford_con_prev.
+        estadisticas: EstadisticasRuta opcional donde se suman los contadores de la corrida
+        """
+        #obtener vertices y preparar diccionarios igual que bellman-ford
+        vertices = self.obtener_vertices()
+        dist = {v: float("inf") for v in vertices}
+        prev = {v: None for v in vertices}
+        if inicio not in dist:
+            return {}, {}
+        dist[inicio] = 0
+        n = len(vertices)
+
+        #numero de aristas del camino que dio la ultima mejora de cada vertice
+        #si llega a V el camino repite un vertice y por lo tanto hay un ciclo negativo
+        aristas_camino = {inicio: 0}
+        #cola de vertices pendientes y conjunto para saber si ya estan formados
+        cola = deque([inicio])
+        en_cola = {inicio}
+        #suma de distancias de la cola para la heuristica LLL
+        suma = 0
+        #contadores para estadisticas
+        extracciones = relajaciones = mejoras = inserciones = 0
+        cola_maxima = 1
+
+        while cola:
+            #LLL (large label last): mandar al final los vertices con distancia mayor al promedio
+            promedio = suma / len(cola)
+            for _ in range(len(cola) - 1):
+                if dist[cola[0]] <= promedio:
+                    break
+                cola.rotate(-1)
+            u = cola.popleft()
+            extracciones += 1
+            en_cola.discard(u)
+            suma -= dist[u]
+            #si u no tiene vecinos no hay nada que relajar
+            if u not in self.adyacencia:
+                continue
+            lista = self.adyacencia[u]
+            relajaciones += len(lista)
+            for v, peso in lista:
+                nd = dist[u] + peso
+                if nd < dist[v]:
+                    mejoras += 1
+                    #contar la relajacion: el camino a v tiene una arista mas que el de u
+                    aristas_camino[v] = aristas_camino[u] + 1
+                    if aristas_camino[v] >= n:
+                        if estadisticas is not None:
+                            estadisticas.anotar(relajaciones=relajaciones, mejoras=mejoras, inserciones=inserciones + 1,
+                                                extracciones=extracciones, cola_maxima=cola_maxima)
+                        #retornar None para indicar deteccion de ciclo negativo
+                        return None, None
+                    if v in en_cola:
+                        #v ya esta en la cola: solo actualizar la suma
+                        suma += nd - dist[v]
+                        dist[v] = nd
+                    else:
+                        dist[v] = nd
+                        #SLF (small label first): si es menor que el frente va adelante
+                        if cola and nd < dist[cola[0]]:
+                            cola.appendleft(v)
+                        else:
+                            cola.append(v)
+                        en_cola.add(v)
+                        suma += nd
+                        inserciones += 1
+                        if len(cola) > cola_maxima:
+                            cola_maxima = len(cola)
+                    prev[v] = u
+
+        if estadisticas is not None:
+            estadisticas.anotar(relajaciones=relajaciones, mejoras=mejoras, inserciones=inserciones + 1,
+                                extracciones=extracciones, cola_maxima=cola_maxima)
+        #devolver distancias y predecesores
+        return dist, prev
+
+    #ejecuta el algoritmo elegido por nombre corto ("bellman", "spfa" o "dijkstra")
+    def rutas_desde(self, inicio, algoritmo="bellman", usar_cache=True, estadisticas=None):
+        """
+        Devuelve (dist, prev) desde inicio con el algoritmo indicado.
+        Los resultados se guardan por (algoritmo, inicio) hasta que el grafo cambie de
+        revision; los diccionarios devueltos se comparten con el cache y no deben modificarse.
+        estadisticas: EstadisticasRuta opcional con los contadores y el tiempo de la corrida.
+        """
+        if not usar_cache:
+            return self._ejecutar(algoritmo, inicio, estadisticas)
+        #si el grafo cambio desde que se lleno el cache, vaciarlo
+        if self._cache_revision != self.revision:
+            self.limpiar_cache()
+        clave = (algoritmo, inicio)
+        guardado = self._cache.get(clave)
+        if guardado is not None:
+            #acierto: marcarlo como el mas reciente
+            self._cache.move_to_end(clave)
+            self.cache_aciertos += 1
+            if estadisticas is not None:
+                estadisticas.algoritmo, estadisticas.origen, estadisticas.desde_cache = algoritmo, inicio, True
+            return guardado[0], guardado[1]
+        self.cache_fallos += 1
+        dist, prev = self._ejecutar(algoritmo, inicio, estadisticas)
+        self._guardar_en_cache(clave, dist, prev)
+        return dist, prev
+
+    #corre un algoritmo por nombre corto, midiendo y pasando por la envoltura si hay
+    def _ejecutar(self, algoritmo, inicio, estadisticas=None):
+        metodo = getattr(self, self.ALGORITMOS[algoritmo])
+        if estadisticas is None:
+            correr = lambda: metodo(inicio)
+        else:
+            estadisticas.algoritmo, estadisticas.origen = algoritmo, inicio
+            correr = lambda: metodo(inicio, estadisticas=estadisticas)
+        t0 = time.perf_counter()
+        resultado = correr() if self.envoltura is None else self.envoltura(algoritmo, inicio, correr)
+        if estadisticas is not None:
+            estadisticas.segundos += time.perf_counter() - t0
+        return resultado
+
+    #bytes estimados de un resultado: los dos diccionarios mas un numero por vertice
+    @staticmethod
+    def _tam_resultado(dist, prev):
+        return sys.getsizeof(dist) + sys.getsizeof(prev) + 24 * len(dist or ())
+
+    #guarda un resultado en el cache y expulsa los menos usados si se pasa de los limites
+    def _guardar_en_cache(self, clave, dist, prev):
+        tam = self._tam_resultado(dist, prev)
+        #un resultado que no cabe en todo el cache no se guarda
+        if tam > self.cache_max_bytes or self.cache_max_entradas <= 0:
+            return
+        anterior = self._cache.pop(clave, None)
+        if anterior is not None:
+            self._cache_bytes -= anterior[2]
+        self._cache[clave] = (dist, prev, tam)
+        self._cache_bytes += tam
+        self._recortar_cache()
+
+    #expulsa por el lado menos reciente hasta respetar los limites del cache
+    def _recortar_cache(self):
+        while len(self._cache) > self.cache_max_entradas or self._cache_bytes > self.cache_max_bytes:
+            _, (_, _, tam_viejo) = self._cache.popitem(last=False)
+            self._cache_bytes -= tam_viejo
+
+    #vacia el cache de rutas y lo asocia a la revision actual
+    def limpiar_cache(self):
+        self._cache.clear()
+        self._cache_bytes = 0
+        self._cache_revision = self.revision
+
+    #tabla de distancias y siguiente salto para todos los pares (johnson)
+    def todos_los_pares(self):
+        """
+        Devuelve una TablaRutas con todos los pares o None si hay ciclo negativo.
+        La tabla se guarda y se reutiliza hasta que el grafo se modifique.
+        """
+        #si la tabla guardada corresponde a la revision actual reutilizarla
+        if self._tabla is not None and self._tabla[0] == self.revision:
+            return self._tabla[1]
+        tabla = self.a_csr().johnson()
+        self._tabla = (self.revision, tabla)
+        return tabla
+
+    #jerarquia de contraccion sobre los pesos max(minimo, w), reutilizada hasta que el grafo cambie
+    def jerarquia(self, minimo=1):
+        if self._jerarquia is not None and self._jerarquia[:2] == (self.revision, minimo):
+            return self._jerarquia[2]
+        jerarquia = JerarquiaContraccion.desde_grafo(self, minimo)
+        self._jerarquia = (self.revision, minimo, jerarquia)
+        return jerarquia
+
+    #vista que comparte la topologia con pesos transformados (ver VistaPesos)
+    def con_pesos(self, minimo=None, maximo=None, escala=1, desplazamiento=0):
+        return VistaPesos(self, minimo, maximo, escala, desplazamiento)
+
+    #vista con copia al escribir: se puede modificar sin tocar este grafo (ver VistaCopiaEscritura)
+    def copia_ligera(self):
+        return VistaCopiaEscritura(self)
+
+    #construye la version compacta (csr) de este grafo
+    def a_csr(self):
+        return GrafoCSR.desde_grafo(self)
+
+    #construye un Grafo desde un csr en una sola pasada (sin agregar_arista por cada vuelo)
+    @classmethod
+    def desde_csr(cls, csr, **opciones):
+        grafo = cls(**opciones)
+        nombres, offsets, destinos, pesos = csr.nombres, csr.offsets, csr.destinos, csr.pesos
+        #cada lista de adyacencia sale de su rango en los buffers; como en agregar_arista,
+        #solo los vertices con vuelos de salida son claves
+        grafo.adyacencia = {
+            nombres[u]: [(nombres[destinos[k]], pesos[k]) for k in range(offsets[u], offsets[u + 1])]
+            for u in range(len(nombres)) if offsets[u] != offsets[u + 1]
+        }
+        return grafo
+
+    #bellman-ford vectorizado sobre el csr, devuelve (dist, prev, ciclo)
+    def bellman_ford_vectorizado(self, inicio):
+        return self.a_csr().bellman_ford_vectorizado(inicio)
+
+
+#lista de solo lectura (destino, peso transformado) sobre la lista del grafo base
+class _ListaTransformada(Sequence):
+    #slots para que la vista que se crea en cada consulta sea lo mas ligera posible
+    __slots__ = ("lista", "funcion")
+
+    #constructor que recibe la lista base y la funcion peso -> peso nuevo
+    def __init__(self, lista, funcion):
+        self.lista = lista
+        self.funcion = funcion
+
+    #el peso se transforma al leer la arista, la lista base no se copia
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [(v, self.funcion(w)) for v, w in self.lista[i]]
+        v, w = self.lista[i]
+        return v, self.funcion(w)
+
+    def __iter__(self):
+        f = self.funcion
+        for v, w in self.lista:
+            yield v, f(w)
+
+    def __len__(self):
+        return len(self.lista)
+
+
+#adyacencia de solo lectura que transforma los pesos del grafo base al consultarla
+class _AdyacenciaTransformada(Mapping):
+    #constructor que recibe la adyacencia base y la funcion peso -> peso nuevo
+    def __init__(self, base, funcion):
+        self.base = base
+        self.funcion = funcion
+
+    #vista (destino, peso transformado) sobre la lista del vertice; no copia las aristas
+    def __getitem__(self, u):
+        return _ListaTransformada(self.base[u], self.funcion)
+
+    def __iter__(self):
+        return iter(self.base)
+
+    def __len__(self):
+        return len(self.base)
+
+    def __contains__(self, u):
+        return u in self.base
+
+
+#adyacencia que lee del grafo base salvo en los vertices cuyas aristas ya se modificaron
+class _AdyacenciaSuperpuesta(MutableMapping):
+    #constructor que recibe la adyacencia base (nunca se modifica)
+    def __init__(self, base):
+        self.base = base
+        #vertice -> lista propia, copiada la primera vez que se modifica
+        self.propias = {}
+
+    def __getitem__(self, u):
+        lista = self.propias.get(u)
+        return self.base[u] if lista is None else lista
+
+    #asignar una lista solo la guarda en la capa propia
+    def __setitem__(self, u, lista):
+        self.propias[u] = lista
+
+    def __delitem__(self, u):
+        raise TypeError("no se pueden quitar vertices de una vista")
+
+    def __iter__(self):
+        yield from self.base
+        for u in self.propias:
+            if u not in self.base:
+                yield u
+
+    def __len__(self):
+        return len(self.base) + sum(1 for u in self.propias if u not in self.base)
+
+    def __contains__(self, u):
+        return u in self.propias or u in self.base
+
+    #copia la lista del vertice a la capa propia para poder modificarla en el lugar
+    def copiar(self, u):
+        if u not in self.propias and u in self.base:
+            self.propias[u] = list(self.base[u])
+
+
+#base de las vistas: un Grafo que comparte la topologia de otro sin copiarla
+class _VistaGrafo(Grafo):
+    """
+    La revision de la vista sube cuando cambia el grafo base o la propia vista, asi el
+    cache de rutas, la tabla de johnson y los demas resultados guardados se invalidan solos.
+    """
+    #constructor que recibe el grafo base y la adyacencia que se expone
+    def __init__(self, base, adyacencia):
+        self.base = base
+        super().__init__(base.cache_max_entradas, base.cache_max_bytes)
+        self.adyacencia = adyacencia
+        self.coordenadas = base.coordenadas
+        self.tarifas = base.tarifas
+        #revision a la que corresponden las entrantes y el indice de pesos
+        self._revision_indices = self.revision
+
+    #revision combinada: cambios del base mas cambios propios (siempre crece)
+    @property
+    def revision(self):
+        return self.base.revision + self._revision_propia
+
+    @revision.setter
+    def revision(self, valor):
+        self._revision_propia = valor - self.base.revision
+
+    #descarta las entrantes y el indice de pesos si el grafo base cambio desde que se armaron
+    def _al_dia(self):
+        if self._revision_indices != self.revision:
+            self._inverso = None
+            self._indice_pesos = None
+            self._revision_indices = self.revision
+
+    def _entrantes(self):
+        self._al_dia()
+        return super()._entrantes()
+
+    def _pesos_por_arista(self):
+        self._al_dia()
+        return super()._pesos_por_arista()
+
+
+#vista con los pesos del grafo base transformados: max(minimo, min(maximo, w * escala + desplazamiento))
+class VistaPesos(_VistaGrafo):
+    """
+    Los algoritmos ven los pesos transformados sin que se copie la adyacencia, por ejemplo
+    VistaPesos(grafo, minimo=1) es la version sin negativos que usa la comparacion.
+    Es de solo lectura: los cambios se hacen en el grafo base y la vista los ve.
+    """
+    #constructor que recibe el grafo base y la transformacion
+    def __init__(self, base, minimo=None, maximo=None, escala=1, desplazamiento=0):
+        self.minimo = minimo
+        self.maximo = maximo
+        self.escala = escala
+        self.desplazamiento = desplazamiento
+        super().__init__(base, _AdyacenciaTransformada(base.adyacencia, self.transformar))
+
+    #aplica la transformacion a un peso
+    def transformar(self, w):
+        w = w * self.escala + self.desplazamiento
+        if self.minimo is not None and w < self.minimo:
+            w = self.minimo
+        if self.maximo is not None and w > self.maximo:
+            w = self.maximo
+        return w
+
+    #la vista no se modifica directamente
+    def _solo_lectura(self, *args):
+        raise TypeError("VistaPesos es de solo lectura, modifica el grafo base")
+
+    agregar_arista = actualizar_peso = eliminar_arista = reemplazar_aristas = _solo_lectura
+
+
+#vista con copia al escribir: los cambios quedan en la vista y el grafo base no se toca
+class VistaCopiaEscritura(_VistaGrafo):
+    """
+    Lee las aristas del grafo base; al modificar las aristas de un vertice solo se copia
+    la lista de ese vertice. Los cambios del base se ven en los vertices no modificados.
+    """
+    #constructor que recibe el grafo base
+    def __init__(self, base):
+        super().__init__(base, _AdyacenciaSuperpuesta(base.adyacencia))
+
+    #las modificaciones usan la logica de Grafo (cache incremental incluido) sobre la capa propia
+    def agregar_arista(self, origen, destino, peso):
+        self._al_dia()
+        #Grafo.agregar_arista hace append: primero copiar la lista del origen
+        self.adyacencia.copiar(origen)
+        super().agregar_arista(origen, destino, peso)
+        self._revision_indices = self.revision
+
+    def actualizar_peso(self, origen, destino, peso):
+        self._al_dia()
+        super().actualizar_peso(origen, destino, peso)
+        self._revision_indices = self.revision
+
+    def eliminar_arista(self, origen, destino):
+        self._al_dia()
+        super().eliminar_arista(origen, destino)
+        self._revision_indices = self.revision
+
+    def reemplazar_aristas(self, origen, aristas):
+        self._al_dia()
+        super().reemplazar_aristas(origen, aristas)
+        self._revision_indices = self.revision
+
+
+#clase que representa un grafo congelado en formato csr (compressed sparse row)
+class GrafoCSR:
+    """
+    Grafo dirigido inmutable con vertices internados como enteros.
+    nombres: lista id -> nombre del vertice
+    indice: dict nombre -> id
+    offsets: las aristas del vertice i ocupan destinos[offsets[i]:offsets[i+1]]
+    destinos, pesos: buffers paralelos con el destino y el peso de cada arista
+    """
+    #slots para no crear un diccionario por instancia
+    __slots__ = ("nombres", "indice", "offsets", "destinos", "pesos")
+    #algoritmos de una sola fuente que devuelven (dist, prev): nombre corto -> metodo
+    ALGORITMOS = {
+        "bellman": "bellman_ford_con_prev",
+        "dijkstra": "dijkstra_con_prev",
+    }
+
+    #constructor que recibe los buffers ya armados
+    def __init__(self, nombres, offsets, destinos, pesos):
+        #lista de nombres en el orden de sus ids
+        self.nombres = nombres
+        #diccionario inverso para traducir nombre -> id
+        self.indice = {nombre: i for i, nombre in enumerate(nombres)}
+        #buffers csr (array de la biblioteca estandar o cualquier buffer indexable)
+        self.offsets = offsets
+        self.destinos = destinos
+        self.pesos = pesos
+
+    #construye el csr a partir de un Grafo con listas de adyacencia
+    @classmethod
+    def desde_grafo(cls, grafo):
+        #generador que recorre las aristas sin crear una lista intermedia
+        aristas = ((u, v, w) for u, lista in grafo.adyacencia.items() for v, w in lista)
+        return cls.desde_aristas(aristas)
+
+    #construye el csr a partir de cualquier iterable de tuplas (origen, destino, peso)
+    @classmethod
+    def desde_aristas(cls, aristas):
+        #ids asignados en el orden en que aparece cada vertice
+        nombres = []
+        indice = {}
+        #buffers temporales con las aristas en el orden de entrada
+        origenes = array("i")
+        destinos = array("i")
+        #los pesos se guardan como enteros mientras todos lo sean, si no como flotantes
+        pesos = array("q")
+        for u, v, w in aristas:
+            #internar el origen
+            iu = indice.get(u)
+            if iu is None:
+                iu = indice[u] = len(nombres)
+                nombres.append(u)
+            #internar el destino
+            iv = indice.get(v)
+            if iv is None:
+                iv = indice[v] = len(nombres)
+                nombres.append(v)
+            #si aparece un peso no entero pasar el buffer a flotantes
+            if pesos.typecode == "q" and not isinstance(w, int):
+                pesos = array("d", pesos)
+            origenes.append(iu)
+            destinos.append(iv)
+            pesos.append(w)
+
+        #contar cuantas aristas salen de cada vertice
+        n = len(nombres)
+        offsets = array("q", bytes(8 * (n + 1)))
+        for iu in origenes:
+            offsets[iu + 1] += 1
+        #suma acumulada para obtener el inicio de cada bloque
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+
+        #colocar cada arista en su bloque respetando el orden original (ordenamiento por conteo)
+        m = len(origenes)
+        csr_destinos = array("i", bytes(4 * m))
+        csr_pesos = array(pesos.typecode, bytes(pesos.itemsize * m))
+        siguiente = array("q", offsets[:n])
+        for k in range(m):
+            iu = origenes[k]
+            pos = siguiente[iu]
+            csr_destinos[pos] = destinos[k]
+            csr_pesos[pos] = pesos[k]
+            siguiente[iu] = pos + 1
+
+        return cls(nombres, offsets, csr_destinos, csr_pesos)
+
+    #"q" si los pesos son enteros y "d" si son flotantes (array y memoryview usan las mismas letras)
+    def tipo_pesos(self):
+        return getattr(self.pesos, "typecode", None) or self.pesos.format
+
+    #recorre las aristas como tuplas (origen, destino, peso) con los nombres originales
+    def aristas(self):
+        nombres, offsets, destinos, pesos = self.nombres, self.offsets, self.destinos, self.pesos
+        for u in range(len(nombres)):
+            for k in range(offsets[u], offsets[u + 1]):
+                yield nombres[u], nombres[destinos[k]], pesos[k]
+
+    #numero de vertices
+    def num_vertices(self):
+        return len(self.nombres)
+
+    #numero de aristas
+    def num_aristas(self):
+        return len(self.destinos)
+
+    #devuelve los buffers como arreglos de numpy sin copiarlos (requiere numpy)
+    def como_numpy(self):
+        if cargar_numpy() is None:
+            raise RuntimeError("numpy no esta instalado")
+        offsets = np.frombuffer(self.offsets, dtype=np.int64)
+        destinos = np.frombuffer(self.destinos, dtype=np.int32)
+        tipo = np.int64 if self.tipo_pesos() == "q" else np.float64
+        pesos = np.frombuffer(self.pesos, dtype=tipo)
+        return offsets, destinos, pesos
+
+    #traduce listas indexadas por id a diccionarios por nombre (mismo formato que Grafo)
+    def _a_nombres(self, dist, prev):
+        nombres = self.nombres
+        dist_n = {nombres[i]: d for i, d in enumerate(dist)}
+        prev_n = {nombres[i]: (nombres[p] if p >= 0 else None) for i, p in enumerate(prev)}
+        return dist_n, prev_n
+
+    #bellman-ford sobre los buffers csr, devuelve (dist, prev) o (None, None) si hay ciclo negativo
+    def bellman_ford_con_prev(self, inicio):
+        #si el inicio no existe devolver diccionarios vacios igual que Grafo
+        s = self.indice.get(inicio)
+        if s is None:
+            return {}, {}
+        #referencias locales para no buscar atributos en cada relajacion
+        offsets, destinos, pesos = self.offsets, self.destinos, self.pesos
+        n = len(self.nombres)
+        inf = float("inf")
+        dist = [inf] * n
+        prev = [-1] * n
+        dist[s] = 0
+
+        #relajar todas las aristas hasta V-1 veces con salida temprana
+        for _ in range(n - 1):
+            cambio = False
+            for u in range(n):
+                du = dist[u]
+                if du == inf:
+                    continue
+                for k in range(offsets[u], offsets[u + 1]):
+                    v = destinos[k]
+                    nd = du + pesos[k]
+                    if nd < dist[v]:
+                        dist[v] = nd
+                        prev[v] = u
+                        cambio = True
+            if not cambio:
+                break
+
+        #pasada extra: si todavia se puede relajar hay ciclo negativo
+        for u in range(n):
+            du = dist[u]
+            if du == inf:
+                continue
+            for k in range(offsets[u], offsets[u + 1]):
+                if du + pesos[k] < dist[destinos[k]]:
+                    return None, None
+
+        return self._a_nombres(dist, prev)
+
+    #bellman-ford por rondas que relaja todas las aristas a la vez con operaciones de arreglos
+    def bellman_ford_vectorizado(self, inicio):
+        """
+        Ejecuta Bellman-Ford relajando todas las aristas en cada ronda.
+        devuelve (dist, prev, ciclo):
+         - sin ciclo negativo: ciclo es None
+         - con ciclo negativo: dist y prev son None y ciclo es la lista de vertices
+           del ciclo, cerrada (el primero se repite al final)
+        Usa numpy si esta instalado; si no, hace las mismas rondas en python puro.
+        """
+        s = self.indice.get(inicio)
+        if s is None:
+            return {}, {}, None
+        if cargar_numpy() is None:
+            dist, prev, ciclo = self._rondas_python(s)
+        else:
+            dist, prev, ciclo = self._rondas_numpy(s)
+        #si se encontro un ciclo traducir sus ids a nombres
+        if ciclo is not None:
+            return None, None, [self.nombres[i] for i in ciclo]
+        #si los pesos son enteros devolver distancias enteras como Grafo
+        if self.tipo_pesos() == "q":
+            dist = [int(d) if d != float("inf") else d for d in dist]
+        dist, prev = self._a_nombres(dist, [int(p) for p in prev])
+        return dist, prev, None
+
+    #rondas de relajacion con numpy: gather dist[src] + w y luego scatter-min sobre dist[dst]
+    def _rondas_numpy(self, s):
+        offsets, destinos, pesos = self.como_numpy()
+        n = len(self.nombres)
+        #origen de cada arista (repetir cada id segun su grado de salida)
+        origenes = np.repeat(np.arange(n, dtype=np.int32), np.diff(offsets))
+        #ordenar las aristas por destino una sola vez: asi el scatter-min es un reduceat
+        orden = np.argsort(destinos, kind="stable")
+        src = origenes[orden]
+        dst = destinos[orden]
+        w = pesos[orden].astype(np.float64)
+        #inicio de cada grupo de aristas con el mismo destino
+        if len(dst):
+            inicios = np.flatnonzero(np.r_[True, dst[1:] != dst[:-1]])
+        else:
+            inicios = np.zeros(0, dtype=np.int64)
+        dst_unicos = dst[inicios]
+
+        dist = np.full(n, np.inf)
+        dist[s] = 0.0
+        prev = np.full(n, -1, dtype=np.int64)
+
+        #hasta V-1 rondas normales mas una extra que solo detecta el ciclo
+        for ronda in range(n):
+            if not len(dst):
+                break
+            #gather: costo de llegar a cada destino pasando por su origen
+            cand = dist[src] + w
+            #scatter-min: minimo por destino
+            minimos = np.minimum.reduceat(cand, inicios)
+            mejora = minimos < dist[dst_unicos]
+            #bandera cambio: si ninguna distancia mejoro ya convergio
+            if not mejora.any():
+                break
+            nuevo = dist.copy()
+            nuevo[dst_unicos[mejora]] = minimos[mejora]
+            #predecesor: una arista cuyo candidato alcanzo el nuevo minimo
+            ganadoras = np.flatnonzero((cand == nuevo[dst]) & (cand < dist[dst]))
+            prev[dst[ganadoras]] = src[ganadoras]
+            dist = nuevo
+            #si en la ronda V todavia hubo mejora hay un ciclo negativo
+            if ronda == n - 1:
+                mejorados = dst_unicos[mejora].tolist()
+                return None, None, self._extraer_ciclo(mejorados, prev.tolist())
+        return dist.tolist(), prev.tolist(), None
+
+    #las mismas rondas simultaneas de _rondas_numpy escritas con listas (pesos: otro vector de pesos)
+    def _rondas_python(self, s, pesos=None):
+        offsets, destinos = self.offsets, self.destinos
+        pesos = self.pesos if pesos is None else pesos
+        n = len(self.nombres)
+        inf = float("inf")
+        dist = [inf] * n
+        dist[s] = 0
+        prev = [-1] * n
+        for ronda in range(n):
+            #cada ronda lee las distancias de la ronda anterior
+            nuevo = dist[:]
+            mejorados = []
+            for u in range(n):
+                du = dist[u]
+                if du == inf:
+                    continue
+                for k in range(offsets[u], offsets[u + 1]):
+                    v = destinos[k]
+                    nd = du + pesos[k]
+                    if nd < nuevo[v]:
+                        if nuevo[v] == dist[v]:
+                            mejorados.append(v)
+                        nuevo[v] = nd
+                        prev[v] = u
+            if not mejorados:
+                break
+            dist = nuevo
+            if ronda == n - 1:
+                return None, None, self._extraer_ciclo(mejorados, prev)
+        return dist, prev, None
+
+    #recorre prev desde vertices mejorados en la ultima ronda hasta caer dentro del ciclo
+    def _extraer_ciclo(self, mejorados, prev):
+        n = len(self.nombres)
+        for v in mejorados:
+            #retroceder n pasos garantiza terminar dentro de un ciclo de prev (si no se corta antes)
+            x = v
+            for _ in range(n):
+                x = prev[x]
+                if x < 0:
+                    break
+            if x < 0:
+                continue
+            #seguir prev desde x hasta volver a x para listar el ciclo
+            ciclo = [x]
+            y = prev[x]
+            while y != x:
+                ciclo.append(y)
+                y = prev[y]
+            #prev apunta hacia atras: invertir para que quede en el sentido de los vuelos
+            ciclo.reverse()
+            ciclo.append(ciclo[0])
+            return ciclo
+        #no deberia pasar: se detecto el ciclo pero prev no lo contiene
+        return []
+
+    #genera k vectores de pesos (uno por escenario) sumando a cada arista un entero al azar
+    def escenarios_pesos(self, k, variacion=(-2, 2), semilla=None, minimo=None):
+        """
+        Devuelve una matriz k x E (numpy) o, sin numpy, una lista de k arrays.
+        La fila i tiene el peso de cada arista (en el orden del csr) mas un entero uniforme
+        entre variacion[0] y variacion[1], como aplicar_variacion_aleatoria; con minimo
+        los pesos menores se suben a ese valor. La misma semilla da los mismos escenarios.
+        """
+        bajo, alto = variacion
+        m = self.num_aristas()
+        if cargar_numpy() is not None:
+            rng = semilla if isinstance(semilla, np.random.Generator) else np.random.default_rng(semilla)
+            pesos = self.como_numpy()[2]
+            matriz = pesos + rng.integers(bajo, alto + 1, size=(k, m))
+            if minimo is not None:
+                np.maximum(matriz, minimo, out=matriz)
+            return matriz
+        rng = semilla if isinstance(semilla, random.Random) else random.Random(semilla)
+        filas = []
+        for _ in range(k):
+            fila = array(self.tipo_pesos(), (w + rng.randint(bajo, alto) for w in self.pesos))
+            if minimo is not None:
+                fila = array(fila.typecode, (max(minimo, w) for w in fila))
+            filas.append(fila)
+        return filas
+
+    #bellman-ford por rondas para varios escenarios de pesos a la vez (misma topologia)
+    def rutas_por_escenario(self, inicio, pesos):
+        """
+        pesos: matriz k x E de escenarios_pesos. Devuelve (dist, prev, ciclo) con una fila por
+        escenario: dist[i][v] distancia (inf sin camino), prev[i][v] id del predecesor (-1 sin
+        predecesor) y ciclo[i] True si el escenario tiene un ciclo negativo alcanzable (su fila
+        de dist no es valida). Con numpy son arreglos; sin numpy, listas.
+        """
+        s = self.indice.get(inicio)
+        if s is None:
+            raise KeyError(f"{inicio} no esta en el grafo")
+        if cargar_numpy() is None:
+            resultados = [self._rondas_python(s, fila) for fila in pesos]
+            ciclo = [r[2] is not None for r in resultados]
+            dist = [r[0] for r in resultados]
+            prev = [r[1] for r in resultados]
+            return dist, prev, ciclo
+        return self._rondas_lote_numpy(s, np.asarray(pesos))
+
+    #rondas de _rondas_numpy con una fila de distancias por escenario
+    def _rondas_lote_numpy(self, s, pesos):
+        offsets, destinos, _ = self.como_numpy()
+        n = len(self.nombres)
+        k = pesos.shape[0]
+        origenes = np.repeat(np.arange(n, dtype=np.int32), np.diff(offsets))
+        orden = np.argsort(destinos, kind="stable")
+        src = origenes[orden]
+        dst = destinos[orden]
+        w = pesos[:, orden].astype(np.float64)
+        dist = np.full((k, n), np.inf)
+        dist[:, s] = 0.0
+        prev = np.full((k, n), -1, dtype=np.int64)
+        ciclo = np.zeros(k, dtype=bool)
+        if not len(dst):
+            return dist, prev, ciclo
+        inicios = np.flatnonzero(np.r_[True, dst[1:] != dst[:-1]])
+        dst_unicos = dst[inicios]
+
+        for ronda in range(n):
+            cand = dist[:, src] + w
+            #scatter-min por fila: minimo de cada destino en cada escenario
+            minimos = np.minimum.reduceat(cand, inicios, axis=1)
+            mejora = minimos < dist[:, dst_unicos]
+            if not mejora.any():
+                break
+            #en la ronda V los escenarios que todavia mejoran tienen ciclo negativo
+            if ronda == n - 1:
+                ciclo = mejora.any(axis=1)
+                break
+            nuevo = dist.copy()
+            filas, columnas = np.nonzero(mejora)
+            nuevo[filas, dst_unicos[columnas]] = minimos[filas, columnas]
+            filas, aristas = np.nonzero((cand == nuevo[:, dst]) & (cand < dist[:, dst]))
+            prev[filas, dst[aristas]] = src[aristas]
+            dist = nuevo
+        return dist, prev, ciclo
+
+
+    #potenciales h de johnson: bellman-ford desde un vertice virtual unido a todos con peso 0
+    def _potenciales(self):
+        offsets, destinos, pesos = self.offsets, self.destinos, self.pesos
+        n = len(self.nombres)
+        #la primera ronda desde el vertice virtual deja todas las distancias en 0
+        h = [0] * n
+        #con el vertice virtual hay V+1 vertices: V-1 rondas mas y una ultima que detecta el ciclo
+        for _ in range(n):
+            cambio = False
+            for u in range(n):
+                hu = h[u]
+                for k in range(offsets[u], offsets[u + 1]):
+                    v = destinos[k]
+                    if hu + pesos[k] < h[v]:
+                        h[v] = hu + pesos[k]
+                        cambio = True
+            if not cambio:
+                return h
+        #ciclo negativo
+        return None
+
+    #caminos minimos de todos los pares con el algoritmo de johnson
+    def johnson(self):
+        """
+        Calcula la TablaRutas de todos los pares: un Bellman-Ford para los potenciales
+        y despues un Dijkstra por fuente con los pesos reajustados w + h[u] - h[v] >= 0.
+        devuelve None si hay ciclo negativo.
+        """
+        h = self._potenciales()
+        if h is None:
+            return None
+        offsets, destinos, pesos = self.offsets, self.destinos, self.pesos
+        n = len(self.nombres)
+        inf = float("inf")
+        #pesos reajustados (no negativos), se limita a 0 por errores de redondeo con flotantes
+        ajustados = [0] * len(destinos)
+        for u in range(n):
+            for k in range(offsets[u], offsets[u + 1]):
+                ajustados[k] = max(0, pesos[k] + h[u] - h[destinos[k]])
+        tipo = self.tipo_pesos()
+
+        filas_dist = []
+        filas_sig = []
+        for s in range(n):
+            #dijkstra desde s con los pesos reajustados
+            dist = [inf] * n
+            prev = [-1] * n
+            dist[s] = 0
+            heap = [(0, s)]
+            visitado = bytearray(n)
+            #orden en que se fijan los vertices: el predecesor siempre se fija antes
+            orden = []
+            while heap:
+                d_u, u = heapq.heappop(heap)
+                if visitado[u]:
+                    continue
+                visitado[u] = 1
+                orden.append(u)
+                for k in range(offsets[u], offsets[u + 1]):
+                    v = destinos[k]
+                    nd = d_u + ajustados[k]
+                    if nd < dist[v]:
+                        dist[v] = nd
+                        prev[v] = u
+                        heapq.heappush(heap, (nd, v))
+
+            #siguiente salto desde s: el del predecesor, o v mismo si el predecesor es s
+            sig = array("i", [-1]) * n
+            for v in orden[1:]:
+                p = prev[v]
+                sig[v] = v if p == s else sig[p]
+            #deshacer el reajuste para obtener las distancias reales
+            fila = array("d", [inf]) * n
+            for v in orden:
+                fila[v] = dist[v] - h[s] + h[v]
+            filas_dist.append(fila)
+            filas_sig.append(sig)
+
+        return TablaRutas(self.nombres, filas_dist, filas_sig, tipo)
+
+    #dijkstra sobre los buffers csr (no valido con pesos negativos), devuelve (dist, prev)
+    def dijkstra_con_prev(self, inicio):
+        s = self.indice.get(inicio)
+        if s is None:
+            return {}, {}
+        offsets, destinos, pesos = self.offsets, self.destinos, self.pesos
+        n = len(self.nombres)
+        inf = float("inf")
+        dist = [inf] * n
+        prev = [-1] * n
+        dist[s] = 0
+        #heap de (distancia, id) y marcas de vertices ya procesados
+        heap = [(0, s)]
+        visitado = bytearray(n)
+
+        while heap:
+            d_u, u = heapq.heappop(heap)
+            if visitado[u]:
+                continue
+            visitado[u] = 1
+            if d_u > dist[u]:
+                continue
+            for k in range(offsets[u], offsets[u + 1]):
+                v = destinos[k]
+                nd = dist[u] + pesos[k]
+                if nd < dist[v]:
+                    dist[v] = nd
+                    prev[v] = u
+                    heapq.heappush(heap, (nd, v))
+
+        return self._a_nombres(dist, prev)
+
+
+#tabla densa de distancias y siguiente salto para todos los pares de vertices
+class TablaRutas:
+    """
+    Resultado de johnson: consultas O(1) de distancia y O(largo del camino) de ruta.
+    dist[i][j]: distancia minima del vertice i al j (inf si no hay camino)
+    siguiente[i][j]: id del vertice que sigue a i en el camino hacia j (-1 si no hay)
+    """
+    __slots__ = ("nombres", "indice", "dist", "siguiente", "tipo")
+
+    #constructor que recibe los nombres y las filas ya calculadas
+    def __init__(self, nombres, dist, siguiente, tipo="d"):
+        self.nombres = nombres
+        self.indice = {nombre: i for i, nombre in enumerate(nombres)}
+        self.dist = dist
+        self.siguiente = siguiente
+        #"q" si los pesos son enteros para devolver distancias enteras como Grafo
+        self.tipo = tipo
+
+    #distancia minima entre dos vertices por nombre (inf si no hay camino)
+    def distancia(self, origen, destino):
+        i = self.indice.get(origen)
+        j = self.indice.get(destino)
+        if i is None or j is None:
+            return float("inf")
+        d = self.dist[i][j]
+        if self.tipo == "q" and d != float("inf"):
+            return int(d)
+        return d
+
+    #camino minimo como lista de nombres siguiendo los saltos, [origen] si no hay camino
+    def camino(self, origen, destino):
+        i = self.indice.get(origen)
+        j = self.indice.get(destino)
+        #mismo criterio que reconstruir_camino: solo el origen indica "sin camino real"
+        if i is None or j is None or (i != j and self.siguiente[i][j] < 0):
+            return [origen]
+        camino = [origen]
+        while i != j:
+            i = self.siguiente[i][j]
+            camino.append(self.nombres[i])
+        return camino
+
+
+#jerarquia de contraccion sobre la version sin pesos negativos del grafo
+class JerarquiaContraccion:
+    """
+    Preproceso para consultas rapidas de origen a destino en un grafo que casi no cambia.
+    Los vertices se contraen de menos a mas importante; al quitar v se agrega un atajo
+    u->x (que pasa por v) cuando no hay otro camino igual de corto entre u y x.
+    La consulta es un dijkstra bidireccional que solo sube de rango, asi toca muy pocos vertices.
+    rango[i]: orden de contraccion del vertice i
+    origenes, destinos, pesos, medios: todas las aristas finales (originales y atajos);
+    medios[k] es el vertice por el que pasa el atajo k, -1 si es una arista original
+    """
+    __slots__ = ("nombres", "indice", "rango", "origenes", "destinos", "pesos", "medios",
+                 "tipo", "arriba", "arriba_inverso", "medio_de")
+
+    #constructor que recibe los buffers ya calculados y arma las listas de busqueda
+    def __init__(self, nombres, rango, origenes, destinos, pesos, medios, tipo="q"):
+        self.nombres = nombres
+        self.indice = {nombre: i for i, nombre in enumerate(nombres)}
+        self.rango = rango
+        self.origenes = origenes
+        self.destinos = destinos
+        self.pesos = pesos
+        self.medios = medios
+        self.tipo = tipo
+        n = len(nombres)
+        #arriba[u]: aristas u->x hacia un rango mayor (busqueda desde el origen)
+        #arriba_inverso[x]: aristas u->x con u de rango mayor (busqueda desde el destino)
+        self.arriba = [[] for _ in range(n)]
+        self.arriba_inverso = [[] for _ in range(n)]
+        #(u, x) -> vertice intermedio, solo para los atajos
+        self.medio_de = {}
+        for u, x, w, m in zip(origenes, destinos, pesos, medios):
+            if rango[x] > rango[u]:
+                self.arriba[u].append((x, w))
+            else:
+                self.arriba_inverso[x].append((u, w))
+            if m >= 0:
+                self.medio_de[(u, x)] = m
+
+    #construye la jerarquia de un Grafo con los pesos forzados a max(minimo, w)
+    @classmethod
+    def desde_grafo(cls, grafo, minimo=1, limite_testigos=100):
+        aristas = ((u, v, w) for u, lista in grafo.adyacencia.items() for v, w in lista)
+        return cls.desde_aristas(aristas, minimo, limite_testigos)
+
+    #construye la jerarquia desde un iterable de (origen, destino, peso)
+    @classmethod
+    def desde_aristas(cls, aristas, minimo=1, limite_testigos=100):
+        """
+        minimo: los pesos menores se suben a este valor (la jerarquia necesita pesos >= 0).
+        limite_testigos: vertices que puede fijar cada busqueda de caminos alternos; si se
+        alcanza se agrega el atajo por si acaso (mas atajos, nunca respuestas incorrectas).
+        """
+        indice = {}
+        nombres = []
+        #ady[u] y inv[x]: dict vecino -> menor peso (los vuelos paralelos se quedan con el menor)
+        ady = []
+        inv = []
+        tipo = "q"
+        for o, d, w in aristas:
+            for nombre in (o, d):
+                if nombre not in indice:
+                    indice[nombre] = len(nombres)
+                    nombres.append(nombre)
+                    ady.append({})
+                    inv.append({})
+            u, x = indice[o], indice[d]
+            w = max(minimo, w)
+            if isinstance(w, float):
+                tipo = "d"
+            #los lazos no sirven para caminos minimos con pesos no negativos
+            if u != x and w < ady[u].get(x, float("inf")):
+                ady[u][x] = w
+                inv[x][u] = w
+        n = len(nombres)
+        medio = {}
+        contraido = bytearray(n)
+        vecinos_contraidos = [0] * n
+        nivel = [0] * n
+
+        #atajos necesarios para contraer v: lista de (u, x, peso)
+        def atajos_de(v):
+            entrantes = [(u, w) for u, w in inv[v].items() if not contraido[u]]
+            salientes = [(x, w) for x, w in ady[v].items() if not contraido[x]]
+            atajos = []
+            for u, w_uv in entrantes:
+                objetivos = {x: w_uv + w_vx for x, w_vx in salientes if x != u}
+                if not objetivos:
+                    continue
+                #dijkstra local desde u sin pasar por v, hasta el mayor costo por v
+                limite = max(objetivos.values())
+                dist = {u: 0}
+                heap = [(0, u)]
+                fijados = 0
+                pendientes = set(objetivos)
+                while heap and fijados < limite_testigos:
+                    d_y, y = heapq.heappop(heap)
+                    if d_y > limite:
+                        break
+                    if d_y > dist[y]:
+                        continue
+                    fijados += 1
+                    #termina en cuanto todos los destinos tienen su distancia final
+                    pendientes.discard(y)
+                    if not pendientes:
+                        break
+                    for z, w in ady[y].items():
+                        if z == v or contraido[z]:
+                            continue
+                        nd = d_y + w
+                        if nd < dist.get(z, float("inf")):
+                            dist[z] = nd
+                            heapq.heappush(heap, (nd, z))
+                for x, costo in objetivos.items():
+                    if dist.get(x, float("inf")) > costo:
+                        atajos.append((u, x, costo))
+            return atajos, len(entrantes) + len(salientes)
+
+        #prioridad: atajos que agrega menos aristas que quita, mas vecinos ya contraidos y nivel
+        #(el nivel reparte la contraccion por todo el grafo y deja la jerarquia menos profunda)
+        def prioridad(v):
+            atajos, quitadas = atajos_de(v)
+            return 2 * (len(atajos) - quitadas) + vecinos_contraidos[v] + nivel[v], atajos
+
+        heap = [(prioridad(v)[0], v) for v in range(n)]
+        heapq.heapify(heap)
+        rango = array("i", [0]) * n
+        siguiente_rango = 0
+        while heap:
+            _, v = heapq.heappop(heap)
+            #actualizacion perezosa: si la prioridad real ya no es la menor, regresar al heap
+            p, atajos = prioridad(v)
+            if heap and p > heap[0][0]:
+                heapq.heappush(heap, (p, v))
+                continue
+            contraido[v] = 1
+            rango[v] = siguiente_rango
+            siguiente_rango += 1
+            for u, x, costo in atajos:
+                if costo < ady[u].get(x, float("inf")):
+                    ady[u][x] = costo
+                    inv[x][u] = costo
+                    medio[(u, x)] = v
+            for y in set(ady[v]) | set(inv[v]):
+                vecinos_contraidos[y] += 1
+                nivel[y] = max(nivel[y], nivel[v] + 1)
+
+        origenes, destinos, medios = array("i"), array("i"), array("i")
+        pesos = array(tipo)
+        for u in range(n):
+            for x, w in ady[u].items():
+                origenes.append(u)
+                destinos.append(x)
+                pesos.append(w)
+                medios.append(medio.get((u, x), -1))
+        return cls(nombres, rango, origenes, destinos, pesos, medios, tipo)
+
+    #distancia y camino de origen a destino, devuelve (distancia, camino) como Grafo.ruta_entre
+    def ruta(self, origen, destino):
+        s = self.indice.get(origen)
+        t = self.indice.get(destino)
+        if origen == destino:
+            return 0, [origen]
+        inf = float("inf")
+        if s is None or t is None:
+            return inf, [origen]
+        #busqueda hacia arriba desde s por arriba y desde t por arriba_inverso
+        lados = (
+            (self.arriba, {s: 0}, {s: -1}, [(0, s)]),
+            (self.arriba_inverso, {t: 0}, {t: -1}, [(0, t)]),
+        )
+        mejor = inf
+        encuentro = -1
+        while lados[0][3] or lados[1][3]:
+            for i in (0, 1):
+                listas, dist, prev, heap = lados[i]
+                #un lado termina cuando su frontera ya no puede mejorar el mejor encontrado
+                if not heap or heap[0][0] >= mejor:
+                    heap.clear()
+                    continue
+                d_u, u = heapq.heappop(heap)
+                if d_u > dist[u]:
+                    continue
+                otro = lados[1 - i][1]
+                if u in otro and d_u + otro[u] < mejor:
+                    mejor = d_u + otro[u]
+                    encuentro = u
+                for v, w in listas[u]:
+                    nd = d_u + w
+                    if nd < dist.get(v, inf):
+                        dist[v] = nd
+                        prev[v] = u
+                        heapq.heappush(heap, (nd, v))
+        if encuentro < 0:
+            return inf, [origen]
+        #vertices de la jerarquia: s ... encuentro ... t
+        ida = []
+        v = encuentro
+        while v >= 0:
+            ida.append(v)
+            v = lados[0][2][v]
+        ida.reverse()
+        v = lados[1][2][encuentro]
+        while v >= 0:
+            ida.append(v)
+            v = lados[1][2][v]
+        #desempacar cada atajo en las aristas originales
+        camino = [s]
+        for a, b in zip(ida, ida[1:]):
+            self._desempacar(a, b, camino)
+        if self.tipo == "q":
+            mejor = int(mejor)
+        return mejor, [self.nombres[i] for i in camino]
+
+    #agrega a camino los vertices de la arista a->b sin atajos (sin repetir a)
+    def _desempacar(self, a, b, camino):
+        pila = [(a, b)]
+        while pila:
+            u, x = pila.pop()
+            m = self.medio_de.get((u, x))
+            if m is None:
+                camino.append(x)
+            else:
+                #primero la mitad u->m y despues m->x
+                pila.append((m, x))
+                pila.append((u, m))
+
+    #distancia minima entre dos vertices por nombre (inf si no hay camino)
+    def distancia(self, origen, destino):
+        return self.ruta(origen, destino)[0]
+
+
+#minutos que tiene un dia en los horarios
+MINUTOS_DIA = 24 * 60
+
+
+#convierte "HH:MM" (o minutos ya numericos) a minutos desde la medianoche
+def _minutos(hora):
+    if isinstance(hora, str):
+        horas, _, minutos = hora.partition(":")
+        return int(horas) * 60 + int(minutos or 0)
+    return hora
+
+
+#convierte minutos desde la medianoche del dia 0 a "HH:MM", con "+n" si es otro dia
+def formato_hora(minutos):
+    if minutos == float("inf"):
+        return "-"
+    dia, resto = divmod(int(minutos), MINUTOS_DIA)
+    texto = f"{resto // 60:02d}:{resto % 60:02d}"
+    return texto if dia == 0 else f"{texto} +{dia}"
+
+
+#horario de vuelos para consultas dependientes de la hora (connection scan)
+class HorarioVuelos:
+    """
+    Horario de vuelos para el algoritmo connection scan (CSA).
+    Cada conexion es un tramo sin escalas de un vuelo. Las conexiones se guardan ordenadas
+    por hora de salida en buffers paralelos, asi una consulta es un recorrido lineal sobre
+    arreglos contiguos y no hace falta un grafo expandido en el tiempo.
+    nombres: lista id -> aeropuerto; indice: dict aeropuerto -> id
+    salidas, llegadas: minutos desde la medianoche del dia 0
+    desde, hacia: aeropuerto de salida y de llegada de cada conexion
+    viajes: id del vuelo de ese dia (seguir en el mismo avion no pide tiempo de conexion)
+    etiquetas: lista id de viaje -> codigo de vuelo
+    transbordo: minutos minimos para cambiar de avion en cada aeropuerto
+    """
+    #slots para no crear un diccionario por instancia
+    __slots__ = ("nombres", "indice", "salidas", "llegadas", "desde", "hacia", "viajes",
+                 "etiquetas", "transbordo")
+
+    #constructor que recibe los buffers ya ordenados por hora de salida
+    def __init__(self, nombres, salidas, llegadas, desde, hacia, viajes, etiquetas, transbordo):
+        self.nombres = nombres
+        self.indice = {nombre: i for i, nombre in enumerate(nombres)}
+        self.salidas = salidas
+        self.llegadas = llegadas
+        self.desde = desde
+        self.hacia = hacia
+        self.viajes = viajes
+        self.etiquetas = etiquetas
+        self.transbordo = transbordo
+
+    #construye el horario desde tuplas (vuelo, origen, destino, salida, llegada) de un dia tipico
+    @classmethod
+    def desde_vuelos(cls, vuelos, dias=7, transbordo=45, transbordos=None):
+        """
+        salida y llegada son "HH:MM" o minutos; si un tramo llega antes de salir cruza la medianoche.
+        Los tramos de un mismo codigo son un solo avion con escalas (en el orden del archivo).
+        dias: cuantas veces se repite el horario diario, para poder llegar al dia siguiente.
+        transbordo: minutos minimos de conexion; transbordos: dict aeropuerto -> minutos propios.
+        """
+        nombres = []
+        indice = {}
+        tramos = []
+        #ultima llegada de cada codigo, para pasar al dia siguiente los tramos despues de medianoche
+        ultima = {}
+        for codigo, o, d, salida, llegada in vuelos:
+            for nombre in (o, d):
+                if nombre not in indice:
+                    indice[nombre] = len(nombres)
+                    nombres.append(nombre)
+            salida, llegada = _minutos(salida), _minutos(llegada)
+            while salida < ultima.get(codigo, salida):
+                salida += MINUTOS_DIA
+                llegada += MINUTOS_DIA
+            while llegada < salida:
+                llegada += MINUTOS_DIA
+            ultima[codigo] = llegada
+            tramos.append((salida, llegada, indice[o], indice[d], codigo))
+
+        #repetir el dia tipico: cada (codigo, dia) es un viaje distinto
+        viaje_de = {}
+        etiquetas = []
+        conexiones = []
+        for dia in range(dias):
+            corrimiento = dia * MINUTOS_DIA
+            for salida, llegada, o, d, codigo in tramos:
+                viaje = viaje_de.get((codigo, dia))
+                if viaje is None:
+                    viaje = viaje_de[(codigo, dia)] = len(etiquetas)
+                    etiquetas.append(codigo)
+                conexiones.append((salida + corrimiento, llegada + corrimiento, o, d, viaje))
+        #orden por salida; el sort es estable, asi las escalas de un mismo avion quedan en orden
+        conexiones.sort(key=lambda c: (c[0], c[1]))
+
+        transbordos = transbordos or {}
+        minimos = array("i", (transbordos.get(nombre, transbordo) for nombre in nombres))
+        return cls(nombres,
+                   array("i", (c[0] for c in conexiones)),
+                   array("i", (c[1] for c in conexiones)),
+                   array("i", (c[2] for c in conexiones)),
+                   array("i", (c[3] for c in conexiones)),
+                   array("i", (c[4] for c in conexiones)),
+                   etiquetas, minimos)
+
+    #numero de conexiones (tramos de vuelo) en el horario
+    def __len__(self):
+        return len(self.salidas)
+
+    #llegada mas temprana a destino saliendo de origen a partir de la hora salida
+    def llegada_mas_temprana(self, origen, destino, salida=0):
+        """
+        Devuelve (llegada, tramos): la hora de llegada en minutos (inf si no se puede llegar)
+        y la lista de tramos (vuelo, desde, hacia, salida, llegada), un tramo por avion tomado.
+        """
+        salida = _minutos(salida)
+        s, t = self.indice.get(origen), self.indice.get(destino)
+        if s is None or t is None:
+            return float("inf"), []
+        if s == t:
+            return salida, []
+        salidas, llegadas = self.salidas, self.llegadas
+        desde, hacia, viajes, transbordo = self.desde, self.hacia, self.viajes, self.transbordo
+        inf = float("inf")
+        n = len(self.nombres)
+        #llegada[v]: mejor hora de llegada; listo[v]: desde cuando se puede tomar otro vuelo en v
+        llegada = [inf] * n
+        listo = [inf] * n
+        #en el origen no hay conexion que hacer: se puede salir desde la hora pedida
+        llegada[s] = listo[s] = salida
+        #abordaje[viaje]: conexion donde se subio a ese avion (-1 si aun no)
+        abordaje = [-1] * len(self.etiquetas)
+        #tramo[v]: (conexion de subida, conexion de bajada) con que se llego a v
+        tramo = [None] * n
+        #las conexiones que salen antes de la hora pedida no sirven
+        for c in range(bisect.bisect_left(salidas, salida), len(salidas)):
+            #ninguna conexion que sale despues de la mejor llegada puede mejorarla
+            if salidas[c] >= llegada[t]:
+                break
+            viaje = viajes[c]
+            subida = abordaje[viaje]
+            if subida < 0:
+                #subir solo si ya se estaba en el aeropuerto con el tiempo de conexion cumplido
+                if listo[desde[c]] > salidas[c]:
+                    continue
+                subida = abordaje[viaje] = c
+            v = hacia[c]
+            if llegadas[c] < llegada[v]:
+                llegada[v] = llegadas[c]
+                listo[v] = llegadas[c] + transbordo[v]
+                tramo[v] = (subida, c)
+        if llegada[t] == inf:
+            return inf, []
+        #reconstruir de atras hacia adelante, un tramo por avion
+        tramos = []
+        v = t
+        while v != s:
+            subida, bajada = tramo[v]
+            tramos.append((self.etiquetas[viajes[bajada]], self.nombres[desde[subida]],
+                           self.nombres[hacia[bajada]], salidas[subida], llegadas[bajada]))
+            v = desde[subida]
+        tramos.reverse()
+        return llegada[t], tramos
+
+    #perfil: para cada hora de salida util del origen, la llegada mas temprana al destino
+    def perfil(self, origen, destino, desde=0, hasta=None):
+        """
+        Devuelve [(salida, llegada), ...] ordenado por salida con las opciones que no son
+        dominadas (salir mas tarde siempre implica llegar mas tarde) para salidas entre desde y hasta.
+        El itinerario de cada opcion se obtiene con llegada_mas_temprana(origen, destino, salida).
+        """
+        desde = _minutos(desde)
+        hasta = float("inf") if hasta is None else _minutos(hasta)
+        s, t = self.indice.get(origen), self.indice.get(destino)
+        if s is None or t is None or s == t:
+            return []
+        salidas, llegadas = self.salidas, self.llegadas
+        origenes, hacia, viajes, transbordo = self.desde, self.hacia, self.viajes, self.transbordo
+        inf = float("inf")
+        n = len(self.nombres)
+        #en_viaje[viaje]: mejor llegada al destino quedandose en ese avion
+        en_viaje = [inf] * len(self.etiquetas)
+        #perfil de cada aeropuerto: salidas negadas (crecientes) y sus llegadas al destino
+        perfil_salidas = [[] for _ in range(n)]
+        perfil_llegadas = [[] for _ in range(n)]
+        #recorrido de la ultima salida hacia atras, hasta la primera salida pedida
+        for c in range(len(salidas) - 1, bisect.bisect_left(salidas, desde) - 1, -1):
+            viaje, v = viajes[c], hacia[c]
+            #bajarse en el destino, seguir en el avion o cambiar de avion en v
+            mejor = llegadas[c] if v == t else inf
+            if en_viaje[viaje] < mejor:
+                mejor = en_viaje[viaje]
+            if v != t:
+                #la primera opcion de v que sale despues de llegar y hacer la conexion
+                k = bisect.bisect_right(perfil_salidas[v], -(llegadas[c] + transbordo[v])) - 1
+                if k >= 0 and perfil_llegadas[v][k] < mejor:
+                    mejor = perfil_llegadas[v][k]
+            if mejor == inf:
+                continue
+            en_viaje[viaje] = mejor
+            u = origenes[c]
+            #solo se guarda si mejora a todas las opciones que salen mas tarde de u
+            llegadas_u = perfil_llegadas[u]
+            if not llegadas_u or mejor < llegadas_u[-1]:
+                if llegadas_u and perfil_salidas[u][-1] == -salidas[c]:
+                    llegadas_u[-1] = mejor
+                else:
+                    perfil_salidas[u].append(-salidas[c])
+                    llegadas_u.append(mejor)
+        opciones = zip(reversed(perfil_salidas[s]), reversed(perfil_llegadas[s]))
+        return [(-negada, llegada) for negada, llegada in opciones if -negada <= hasta]
+
+
+#reconstruye el camino desde el diccionario prev retornado por los algoritmos
+def reconstruir_camino(prev, origen, destino):
+    #lista que ira guardando el camino invertido
+    camino = []
+    #empezar desde el destino y seguir prev hasta None o inicio
+    cur = destino
+    #si destino no esta en prev o no fue alcanzado, el loop terminara en None
+    while cur is not None:
+        camino.append(cur)
+        #avanzar al predecesor
+        cur = prev.get(cur, None)
+    #voltear para tener el camino en orden correcto
+    camino.reverse()
+    #validar que el primer nodo del camino sea el origen esperado
+    if len(camino) == 0 or camino[0] != origen:
+        #si no coincide, devolver lista con solo el origen para indicar ausencia de camino real
+        return [origen]  # indicar "sin camino real"
+    #devolver la lista con el camino correcto
+    return camino
+
+
+#carpeta con las redes de ejemplo (rutas y aeropuertos de cada tipo de vuelo)
+DATOS = Path(__file__).parent / "datos"
+#velocidad de crucero usada para estimar horas de vuelo a partir de la distancia
+VELOCIDAD_CRUCERO_KMH = 800
+#radio medio de la tierra en km
+RADIO_TIERRA_KM = 6371.0
+
+
+#devuelve los archivos (rutas, aeropuertos) de la red de ejemplo "nacional" o "internacional"
+def archivos_red(tipo):
+    return DATOS / f"{tipo}_rutas.csv", DATOS / f"{tipo}_aeropuertos.csv"
+
+
+#devuelve el archivo de horarios de la red de ejemplo "nacional" o "internacional"
+def archivo_horarios(tipo):
+    return DATOS / f"{tipo}_horarios.csv"
+
+
+#convierte un texto a int si se puede y si no a float
+def _numero(texto):
+    try:
+        return int(texto)
+    except ValueError:
+        return float(texto)
+
+
+#distancia en km sobre la esfera entre dos puntos (lat, lon) en grados
+def distancia_gran_circulo(lat1, lon1, lat2, lon2):
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * RADIO_TIERRA_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+#lee aristas (origen, destino, peso) de un csv con encabezado, una fila a la vez
+def leer_aristas_csv(ruta, origen="origen", destino="destino", peso="horas"):
+    with open(ruta, newline="", encoding="utf-8") as f:
+        for fila in csv.DictReader(f):
+            yield fila[origen], fila[destino], _numero(fila[peso])
+
+
+#lector de json por bloques: decodifica un valor a la vez con raw_decode
+class _LectorJson:
+    #constructor que recibe el archivo abierto y cuantos caracteres leer por bloque
+    def __init__(self, f, bloque=1 << 16):
+        self.f = f
+        self.bloque = bloque
+        self.texto = ""
+        self.pos = 0
+        self.fin = False
+        self.decodificador = json.JSONDecoder()
+
+    #lee otro bloque; descarta lo ya consumido para que el buffer no crezca con el archivo
+    def _llenar(self):
+        bloque = self.f.read(self.bloque)
+        if not bloque:
+            self.fin = True
+        self.texto = self.texto[self.pos:] + bloque
+        self.pos = 0
+        return bool(bloque)
+
+    #siguiente caracter que no es espacio, sin consumirlo ("" al final del archivo)
+    def ver(self):
+        while True:
+            while self.pos < len(self.texto) and self.texto[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.texto) or not self._llenar():
+                return self.texto[self.pos:self.pos + 1]
+
+    #consume uno de los caracteres esperados y lo devuelve
+    def tomar(self, esperados):
+        c = self.ver()
+        if not c or c not in esperados:
+            raise ValueError(f"json invalido: se esperaba uno de {esperados!r} y se encontro {c!r}")
+        self.pos += 1
+        return c
+
+    #decodifica el siguiente valor completo, leyendo mas bloques si quedo cortado
+    def valor(self):
+        self.ver()
+        while True:
+            try:
+                obj, fin = self.decodificador.raw_decode(self.texto, self.pos)
+                #un numero al final del buffer puede seguir en el proximo bloque
+                if fin < len(self.texto) or self.fin:
+                    self.pos = fin
+                    return obj
+            except json.JSONDecodeError:
+                if self.fin:
+                    raise
+            self._llenar()
+
+
+#recorre los elementos de la lista de un .json (o de {"rutas": [...]}) sin cargar el archivo completo
+def _elementos_json(f):
+    lector = _LectorJson(f)
+    if lector.ver() == "{":
+        #objeto: se saltan las claves hasta llegar a "rutas"
+        lector.tomar("{")
+        while True:
+            if lector.ver() == "}":
+                raise KeyError("rutas")
+            clave = lector.valor()
+            lector.tomar(":")
+            if clave == "rutas":
+                break
+            lector.valor()
+            if lector.tomar(",}") == "}":
+                raise KeyError("rutas")
+    lector.tomar("[")
+    if lector.ver() == "]":
+        return
+    while True:
+        yield lector.valor()
+        if lector.tomar(",]") == "]":
+            return
+
+
+#lee aristas de json: .jsonl se procesa linea por linea, .json es una lista (o {"rutas": [...]})
+#que se decodifica por bloques, un elemento a la vez
+def leer_aristas_json(ruta, origen="origen", destino="destino", peso="horas"):
+    with open(ruta, encoding="utf-8") as f:
+        if str(ruta).endswith(".jsonl"):
+            #json lines: un objeto por linea, sin cargar el archivo completo
+            for linea in f:
+                if linea.strip():
+                    obj = json.loads(linea)
+                    yield obj[origen], obj[destino], obj[peso]
+        else:
+            for obj in _elementos_json(f):
+                yield obj[origen], obj[destino], obj[peso]
+
+
+#lee (codigo, lat, lon) del airports.dat de openflights (sin encabezado)
+def leer_aeropuertos_openflights(ruta):
+    with open(ruta, newline="", encoding="utf-8") as f:
+        for fila in csv.reader(f):
+            #columnas: id, nombre, ciudad, pais, iata, icao, latitud, longitud, ...
+            codigo = fila[4] if fila[4] != "\\N" else fila[5]
+            if codigo == "\\N":
+                continue
+            yield codigo, float(fila[6]), float(fila[7])
+
+
+#lee aristas del routes.dat de openflights; el peso son horas estimadas por distancia
+def leer_rutas_openflights(ruta, coordenadas, solo_directos=True):
+    """
+    coordenadas: dict codigo -> (lat, lon), por ejemplo de leer_aeropuertos_openflights.
+    Las rutas con aeropuertos sin coordenadas se ignoran.
+    """
+    with open(ruta, newline="", encoding="utf-8") as f:
+        for fila in csv.reader(f):
+            #columnas: aerolinea, id, origen, id origen, destino, id destino, codigo compartido, escalas, equipo
+            o, d = fila[2], fila[4]
+            if solo_directos and fila[7] != "0":
+                continue
+            if o not in coordenadas or d not in coordenadas:
+                continue
+            km = distancia_gran_circulo(*coordenadas[o], *coordenadas[d])
+            yield o, d, round(km / VELOCIDAD_CRUCERO_KMH, 2)
+
+
+#elige el lector de aristas segun la extension del archivo
+def leer_aristas(ruta):
+    if str(ruta).endswith((".json", ".jsonl")):
+        return leer_aristas_json(ruta)
+    return leer_aristas_csv(ruta)
+
+
+#lee posiciones de aeropuertos (nombre, x, y) de un csv con encabezado nombre,x,y
+def leer_aeropuertos_csv(ruta):
+    with open(ruta, newline="", encoding="utf-8") as f:
+        for fila in csv.DictReader(f):
+            yield fila["nombre"], _numero(fila["x"]), _numero(fila["y"])
+
+
+#lee coordenadas reales (nombre, lat, lon) de un csv con columnas nombre,lat,lon (omite las vacias)
+def leer_coordenadas_csv(ruta):
+    with open(ruta, newline="", encoding="utf-8") as f:
+        for fila in csv.DictReader(f):
+            if fila.get("lat") and fila.get("lon"):
+                yield fila["nombre"], float(fila["lat"]), float(fila["lon"])
+
+
+#lee ((origen, destino), tarifa) de un csv de rutas con columna tarifa (omite las vacias)
+def leer_tarifas_csv(ruta, origen="origen", destino="destino", tarifa="tarifa"):
+    with open(ruta, newline="", encoding="utf-8") as f:
+        for fila in csv.DictReader(f):
+            if fila.get(tarifa):
+                yield (fila[origen], fila[destino]), _numero(fila[tarifa])
+
+
+#lee tramos (vuelo, origen, destino, salida, llegada) de un csv con horas "HH:MM"
+def leer_horarios_csv(ruta):
+    with open(ruta, newline="", encoding="utf-8") as f:
+        for fila in csv.DictReader(f):
+            yield fila["vuelo"], fila["origen"], fila["destino"], fila["salida"], fila["llegada"]
+
+
+#carga un horario de vuelos para consultas de llegada mas temprana y de perfil
+def cargar_horario(ruta, dias=7, transbordo=45, transbordos=None):
+    return HorarioVuelos.desde_vuelos(leer_horarios_csv(ruta), dias, transbordo, transbordos)
+
+
+#carga un archivo de rutas en un Grafo arista por arista
+def cargar_grafo(ruta, grafo=None):
+    grafo = Grafo() if grafo is None else grafo
+    for o, d, w in leer_aristas(ruta):
+        grafo.agregar_arista(o, d, w)
+    return grafo
+
+
+#carga un GrafoCSR: los .gcsr se mapean en memoria, el resto se lee en streaming
+def cargar_csr(ruta):
+    if str(ruta).endswith(".gcsr"):
+        return cargar_snapshot(ruta)
+    return GrafoCSR.desde_aristas(leer_aristas(ruta))
+
+
+#encabezado del snapshot: marca, version, vertices, aristas, tipo de pesos y bytes de nombres
+_SNAPSHOT_MARCA = b"GCSR"
+_SNAPSHOT_ENCABEZADO = struct.Struct("<4sIQQcxxxxxxxQ")
+#marca de los archivos de jerarquia de contraccion (usan el mismo encabezado)
+_JERARQUIA_MARCA = b"GCHR"
+
+
+#guarda un GrafoCSR en un archivo binario que se puede mapear en memoria
+def guardar_snapshot(csr, ruta):
+    """
+    Formato (enteros en el orden de bytes de la maquina, cada bloque alineado a 8 bytes):
+    encabezado | offsets int64[V+1] | destinos int32[E] (+relleno) | pesos int64/float64[E] | nombres utf-8
+    Los nombres se guardan como texto separado por el caracter nulo.
+    """
+    with open(ruta, "wb") as f:
+        for bloque in _bloques_snapshot(csr):
+            f.write(bloque)
+
+
+#bloques de bytes del snapshot en orden (los usan el archivo y la memoria compartida)
+def _bloques_snapshot(csr):
+    nombres = "\0".join(str(n) for n in csr.nombres).encode("utf-8")
+    n, m = csr.num_vertices(), csr.num_aristas()
+    yield _SNAPSHOT_ENCABEZADO.pack(_SNAPSHOT_MARCA, 1, n, m, csr.tipo_pesos().encode(), len(nombres))
+    yield memoryview(csr.offsets).cast("B")
+    destinos = memoryview(csr.destinos).cast("B")
+    yield destinos
+    #relleno para que los pesos queden alineados a 8 bytes
+    yield bytes(-len(destinos) % 8)
+    yield memoryview(csr.pesos).cast("B")
+    yield nombres
+
+
+#arma un GrafoCSR cuyos buffers son vistas de un snapshot ya cargado en memoria (mmap o compartida)
+def _csr_desde_buffer(buffer, origen="buffer"):
+    marca, version, n, m, tipo, largo_nombres = _SNAPSHOT_ENCABEZADO.unpack_from(buffer, 0)
+    if marca != _SNAPSHOT_MARCA or version != 1:
+        raise ValueError(f"{origen} no es un snapshot de GrafoCSR")
+    vista = memoryview(buffer)
+    pos = _SNAPSHOT_ENCABEZADO.size
+    offsets = vista[pos:pos + 8 * (n + 1)].cast("q")
+    pos += 8 * (n + 1)
+    destinos = vista[pos:pos + 4 * m].cast("i")
+    pos += 4 * m + (-4 * m) % 8
+    pesos = vista[pos:pos + 8 * m].cast(tipo.decode())
+    pos += 8 * m
+    #los nombres si se decodifican: se necesitan como claves del indice
+    nombres = bytes(vista[pos:pos + largo_nombres]).decode("utf-8").split("\0") if n else []
+    return GrafoCSR(nombres, offsets, destinos, pesos)
+
+
+#carga un snapshot sin copiar los buffers: offsets, destinos y pesos son vistas del mmap
+def cargar_snapshot(ruta):
+    #esta linea importa mmap para mapear el archivo sin leerlo
+    import mmap
+    with open(ruta, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return _csr_desde_buffer(mm, ruta)
+
+
+#copia el snapshot de un GrafoCSR a un bloque de memoria compartida nuevo (quien lo crea lo libera)
+def snapshot_compartido(csr):
+    #esta linea importa la memoria compartida solo para los lotes con procesos
+    from multiprocessing import shared_memory
+    bloques = list(_bloques_snapshot(csr))
+    total = sum(len(b) for b in bloques)
+    memoria = shared_memory.SharedMemory(create=True, size=max(1, total))
+    pos = 0
+    for bloque in bloques:
+        memoria.buf[pos:pos + len(bloque)] = bloque
+        pos += len(bloque)
+    return memoria
+
+
+#grafo del proceso trabajador: (memoria compartida, GrafoCSR con vistas sobre ella)
+_GRAFO_TRABAJADOR = None
+
+
+#inicializador de cada proceso del pool: se conecta a la memoria compartida una sola vez
+def _iniciar_trabajador(nombre_memoria):
+    global _GRAFO_TRABAJADOR
+    from multiprocessing import shared_memory
+    #los procesos del pool comparten el rastreador de recursos del padre, asi que conectarse
+    #no cambia quien libera el bloque: lo hace rutas_multiorigen con unlink al terminar
+    memoria = shared_memory.SharedMemory(name=nombre_memoria)
+    _GRAFO_TRABAJADOR = (memoria, _csr_desde_buffer(memoria.buf, nombre_memoria))
+
+
+#tarea del trabajador: rutas desde un origen sobre el grafo compartido
+def _rutas_en_trabajador(origen, algoritmo):
+    csr = _GRAFO_TRABAJADOR[1]
+    dist, prev = getattr(csr, GrafoCSR.ALGORITMOS[algoritmo])(origen)
+    return origen, dist, prev
+
+
+#caminos minimos desde muchos origenes repartidos en varios procesos
+def rutas_multiorigen(grafo, origenes=None, algoritmo="dijkstra", procesos=None, en_vuelo=None):
+    """
+    Generador que devuelve (origen, dist, prev) conforme cada origen termina (no en el
+    orden de entrada). dist y prev son None si hay ciclo negativo alcanzable.
+    grafo puede ser Grafo o GrafoCSR; se copia una vez a memoria compartida y los
+    procesos lo leen de ahi sin recibirlo en cada tarea. Como mucho en_vuelo origenes
+    (default 2 por proceso) estan pendientes a la vez, asi la matriz completa nunca
+    se junta en memoria: quien consume decide que guardar de cada fila.
+    """
+    #estas lineas importan el pool de procesos solo cuando se reparten origenes
+    from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+    if algoritmo not in GrafoCSR.ALGORITMOS:
+        raise ValueError(f"algoritmo desconocido: {algoritmo}")
+    csr = grafo.a_csr() if isinstance(grafo, Grafo) else grafo
+    origenes = iter(csr.nombres if origenes is None else origenes)
+    procesos = procesos or os.cpu_count() or 1
+    en_vuelo = en_vuelo or 2 * procesos
+    memoria = snapshot_compartido(csr)
+    try:
+        with ProcessPoolExecutor(procesos, initializer=_iniciar_trabajador,
+                                 initargs=(memoria.name,)) as pool:
+            pendientes = set()
+            #llenar la ventana de tareas y devolver cada resultado en cuanto llega
+            for origen in origenes:
+                pendientes.add(pool.submit(_rutas_en_trabajador, origen, algoritmo))
+                if len(pendientes) >= en_vuelo:
+                    listos, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+                    for futuro in listos:
+                        yield futuro.result()
+            for futuro in as_completed(pendientes):
+                yield futuro.result()
+    finally:
+        memoria.close()
+        memoria.unlink()
+
+
+#rutas desde varios origenes sobre un GrafoCSR: [(origen, dist, prev), ...]
+def _lote_de_rutas(csr, origenes, algoritmo):
+    metodo = getattr(csr, GrafoCSR.ALGORITMOS[algoritmo])
+    return [(origen, *metodo(origen)) for origen in origenes]
+
+
+#tarea del trabajador: un lote de origenes sobre el grafo compartido
+def _lote_en_trabajador(origenes, algoritmo):
+    return _lote_de_rutas(_GRAFO_TRABAJADOR[1], origenes, algoritmo)
+
+
+#pool de procesos que se queda abierto y recibe lotes de origenes (para servicios de larga vida)
+class PoolRutas:
+    """
+    El grafo se copia una vez a memoria compartida como en rutas_multiorigen, pero el pool
+    no se cierra al terminar un lote. enviar(origenes, algoritmo) devuelve un Future de
+    concurrent.futures con [(origen, dist, prev), ...]. Con procesos=0 los lotes corren en
+    un hilo del proceso actual (redes chicas o pruebas).
+    """
+    #constructor que recibe un Grafo o GrafoCSR y el numero de procesos (None = todos los nucleos)
+    def __init__(self, grafo, procesos=None):
+        self.csr = grafo.a_csr() if isinstance(grafo, Grafo) else grafo
+        self.memoria = None
+        if procesos == 0:
+            self.procesos = 1
+            self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rutas-lote")
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            self.procesos = procesos or os.cpu_count() or 1
+            self.memoria = snapshot_compartido(self.csr)
+            self.pool = ProcessPoolExecutor(self.procesos, initializer=_iniciar_trabajador,
+                                            initargs=(self.memoria.name,))
+
+    #manda un lote de origenes a un trabajador
+    def enviar(self, origenes, algoritmo="dijkstra"):
+        if algoritmo not in GrafoCSR.ALGORITMOS:
+            raise ValueError(f"algoritmo desconocido: {algoritmo}")
+        if self.memoria is None:
+            return self.pool.submit(_lote_de_rutas, self.csr, list(origenes), algoritmo)
+        return self.pool.submit(_lote_en_trabajador, list(origenes), algoritmo)
+
+    #espera lo que ya corre, cierra el pool y libera la memoria compartida
+    def cerrar(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        if self.memoria is not None:
+            self.memoria.close()
+            self.memoria.unlink()
+            self.memoria = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *error):
+        self.cerrar()
+
+
+#percentil por rango mas cercano de una lista ya ordenada (p entre 0 y 100), None si esta vacia
+#(la usan tambien benchmark.py y servicio.py)
+def percentil(ordenados, p):
+    if not ordenados:
+        return None
+    return ordenados[max(0, math.ceil(p / 100 * len(ordenados)) - 1)]
+
+
+#simula k escenarios de pesos y resume el tiempo de ruta y que caminos se eligen
+def resumen_escenarios(grafo, origen, destino, k=1000, variacion=(-2, 2), semilla=None, minimo=None,
+                       percentiles=(5, 25, 50, 75, 95), lote=256):
+    """
+    grafo puede ser Grafo o GrafoCSR. Los escenarios se generan y resuelven en lotes de
+    hasta lote filas para acotar la memoria (k x E pesos y k x V distancias por lote).
+    Devuelve un diccionario listo para json:
+    tiempo: media, minimo, maximo y percentiles de los escenarios con ruta
+    rutas: caminos elegidos con cuantas veces y en que fraccion de los k escenarios
+    """
+    csr = grafo.a_csr() if isinstance(grafo, Grafo) else grafo
+    t = csr.indice.get(destino)
+    #un solo generador para todos los lotes: la semilla fija la secuencia completa
+    rng = np.random.default_rng(semilla) if cargar_numpy() is not None else random.Random(semilla)
+    tiempos = []
+    veces = {}
+    ciclos = sin_ruta = 0
+    hechos = 0
+    while hechos < k:
+        tam = min(lote, k - hechos)
+        dist, prev, ciclo = csr.rutas_por_escenario(origen, csr.escenarios_pesos(tam, variacion, rng, minimo))
+        for i in range(tam):
+            if ciclo[i]:
+                ciclos += 1
+                continue
+            d = float("inf") if t is None else float(dist[i][t])
+            if d == float("inf"):
+                sin_ruta += 1
+                continue
+            tiempos.append(d)
+            #camino del escenario siguiendo prev desde el destino
+            camino = [t]
+            fila = prev[i]
+            while camino[-1] != csr.indice[origen]:
+                camino.append(int(fila[camino[-1]]))
+            clave = tuple(reversed(camino))
+            veces[clave] = veces.get(clave, 0) + 1
+        hechos += tam
+
+    tiempos.sort()
+    resumen_tiempo = None
+    if tiempos:
+        resumen_tiempo = {
+            "media": sum(tiempos) / len(tiempos),
+            "minimo": tiempos[0],
+            "maximo": tiempos[-1],
+        }
+        for p in percentiles:
+            resumen_tiempo[f"p{p}"] = percentil(tiempos, p)
+    rutas = [
+        {"camino": [csr.nombres[v] for v in clave], "veces": n, "fraccion": n / k}
+        for clave, n in sorted(veces.items(), key=lambda par: -par[1])
+    ]
+    return {
+        "origen": origen,
+        "destino": destino,
+        "escenarios": k,
+        "semilla": semilla,
+        "variacion": list(variacion),
+        "ciclos_negativos": ciclos,
+        "sin_ruta": sin_ruta,
+        "tiempo": resumen_tiempo,
+        "rutas": rutas,
+    }
+
+
+#guarda una JerarquiaContraccion para recargarla al arrancar sin volver a contraer
+def guardar_jerarquia(jerarquia, ruta):
+    """
+    Mismo encabezado que el snapshot con marca GCHR, despues:
+    rango int32[V] (+relleno) | origenes, destinos, medios int32[E] (+relleno) | pesos int64/float64[E] | nombres utf-8
+    """
+    nombres = "\0".join(str(n) for n in jerarquia.nombres).encode("utf-8")
+    n, m = len(jerarquia.nombres), len(jerarquia.origenes)
+    with open(ruta, "wb") as f:
+        f.write(_SNAPSHOT_ENCABEZADO.pack(_JERARQUIA_MARCA, 1, n, m, jerarquia.tipo.encode(), len(nombres)))
+        f.write(bytes(jerarquia.rango))
+        f.write(bytes(-4 * n % 8))
+        for buffer in (jerarquia.origenes, jerarquia.destinos, jerarquia.medios):
+            f.write(bytes(buffer))
+        f.write(bytes(-12 * m % 8))
+        f.write(bytes(jerarquia.pesos))
+        f.write(nombres)
+
+
+#carga una jerarquia guardada con guardar_jerarquia
+def cargar_jerarquia(ruta):
+    datos = Path(ruta).read_bytes()
+    marca, version, n, m, tipo, largo_nombres = _SNAPSHOT_ENCABEZADO.unpack_from(datos, 0)
+    if marca != _JERARQUIA_MARCA or version != 1:
+        raise ValueError(f"{ruta} no es una jerarquia de contraccion")
+    pos = _SNAPSHOT_ENCABEZADO.size
+
+    #lee el siguiente bloque de cuantos elementos del tipo indicado
+    def bloque(codigo, cuantos):
+        nonlocal pos
+        buffer = array(codigo)
+        buffer.frombytes(datos[pos:pos + buffer.itemsize * cuantos])
+        pos += buffer.itemsize * cuantos
+        return buffer
+
+    rango = bloque("i", n)
+    pos += -4 * n % 8
+    origenes, destinos, medios = bloque("i", m), bloque("i", m), bloque("i", m)
+    pos += -12 * m % 8
+    tipo = tipo.decode()
+    pesos = bloque(tipo, m)
+    nombres = datos[pos:pos + largo_nombres].decode("utf-8").split("\0") if n else []
+    return JerarquiaContraccion(nombres, rango, origenes, destinos, pesos, medios, tipo)
+
+
+#motor de animacion que mueve varios aviones a la vez sin bloquear el bucle de eventos
+class MotorAnimacion:
+    """
+    Programa cuadros con after() a una tasa objetivo (fps). La posicion de cada avion se
+    calcula con el tiempo transcurrido, asi la velocidad no depende de cuantos cuadros
+    alcancen a dibujarse. detener() cancela todo (se llama al cerrar la ventana).
+    """
+    #constructor que recibe el widget que programa los after y los cuadros por segundo
+    def __init__(self, widget, fps=60):
+        self.widget = widget
+        #milisegundos entre cuadros
+        self.intervalo = max(1, int(1000 / fps))
+        #vuelos activos: id -> diccionario con canvas, item, tramos y hora de inicio
+        self.vuelos = {}
+        self._siguiente_id = 0
+        #id del after pendiente (None si el motor esta parado)
+        self._id_after = None
+
+    #agrega un vuelo que recorre la lista de puntos (x,y), tarda duracion_tramo segundos por tramo
+    #transformar(x, y) pasa cada posicion a coordenadas del canvas en cada cuadro (zoom y desplazamiento)
+    def agregar_vuelo(self, canvas, item, puntos, duracion_tramo=1.2, radio=6, al_terminar=None,
+                      transformar=None):
+        vuelo_id = self._siguiente_id
+        self._siguiente_id += 1
+        self.vuelos[vuelo_id] = {
+            "canvas": canvas,
+            "item": item,
+            "puntos": list(puntos),
+            "duracion_tramo": duracion_tramo,
+            "radio": radio,
+            "al_terminar": al_terminar,
+            "transformar": transformar,
+            "inicio": time.perf_counter(),
+        }
+        #arrancar el ciclo de cuadros si estaba parado
+        if self._id_after is None:
+            self._id_after = self.widget.after(0, self._cuadro)
+        return vuelo_id
+
+    #quita un vuelo sin llamar a su al_terminar
+    def cancelar(self, vuelo_id):
+        self.vuelos.pop(vuelo_id, None)
+
+    #cancela todos los vuelos y el after pendiente
+    def detener(self):
+        self.vuelos.clear()
+        if self._id_after is not None:
+            try:
+                self.widget.after_cancel(self._id_after)
+            except Exception:
+                #el widget ya pudo haberse destruido
+                pass
+            self._id_after = None
+
+    #dibuja un cuadro de todos los vuelos y programa el siguiente si quedan vuelos
+    def _cuadro(self):
+        self._id_after = None
+        ahora = time.perf_counter()
+        for vuelo_id, vuelo in list(self.vuelos.items()):
+            puntos = vuelo["puntos"]
+            tramos = len(puntos) - 1
+            #tramo actual y fraccion recorrida segun el tiempo transcurrido
+            avance = (ahora - vuelo["inicio"]) / vuelo["duracion_tramo"] if tramos > 0 else 1
+            terminado = avance >= tramos
+            if terminado:
+                x, y = puntos[-1]
+            else:
+                i = int(avance)
+                t = avance - i
+                (x1, y1), (x2, y2) = puntos[i], puntos[i + 1]
+                x = x1 + (x2 - x1) * t
+                y = y1 + (y2 - y1) * t
+            if vuelo["transformar"] is not None:
+                x, y = vuelo["transformar"](x, y)
+            r = vuelo["radio"]
+            #mover el oval a la nueva posicion calculada
+            vuelo["canvas"].coords(vuelo["item"], x - r, y - r, x + r, y + r)
+            if terminado:
+                del self.vuelos[vuelo_id]
+                if vuelo["al_terminar"] is not None:
+                    vuelo["al_terminar"]()
+        #seguir solo mientras haya vuelos
+        if self.vuelos and self._id_after is None:
+            self._id_after = self.widget.after(self.intervalo, self._cuadro)
 
-        #distancia al inicio es cero
-        dist[inicio] = 0
 
-        #relajar las aristas V-1 veces para propagar distancias
-        for _ in range(len(vertices) - 1):
-            #bandera para detectar si hubo algun cambio en una iteracion
-            cambio = False
-            #recorrer cada nodo que tiene lista de adyacencia
-            for u in self.adyacencia:
-                #si la distancia a u es infinita no se puede relajar sus aristas
-                if dist[u] == float("inf"):
-                    continue
-                #para cada arista u->v con peso, intentar relajar
-                for v, peso in self.adyacencia[u]:
-                    #si pasando por u llegamos a v con menor costo, actualizar
-                    if dist[u] + peso < dist[v]:
-                        dist[v] = dist[u] + peso
-                        prev[v] = u
-                        cambio = True
-            #si en una pasada no hubo cambios, ya convergio y podemos salir
-            if not cambio:
-                break
+#trabajo enviado al ServicioCalculo: permite reportar avance y saber si fue cancelado
+class Trabajo:
+    #constructor con la cola donde se dejan los avances para el hilo de tkinter
+    def __init__(self, cola_avances):
+        self._cola = cola_avances
+        self._cancelado = threading.Event()
+        #future del pool, se asigna al enviarlo
+        self.future = None
 
-        #una iteracion extra para detectar ciclo negativo: si se puede relajar, hay ciclo negativo
-        for u in self.adyacencia:
-            #si u no fue alcanzable, ignorarlo
-            if dist[u] == float("inf"):
-                continue
-            for v, peso in self.adyacencia[u]:
-                if dist[u] + peso < dist[v]:
-                    #retornar None para indicar deteccion de ciclo negativo
-                    return None, None  # ciclo negativo
+    #llamado desde el hilo de calculo: fraccion entre 0 y 1 y un texto corto
+    def reportar(self, fraccion, texto=""):
+        if not self._cancelado.is_set():
+            self._cola.put((self, fraccion, texto))
 
-        #devolver distancias y predecesores
-        return dist, prev
+    #true si se pidio cancelar (las funciones largas pueden revisarlo entre pasos)
+    def cancelado(self):
+        return self._cancelado.is_set()
 
-    #metodo dijkstra que devuelve dist y prev (no valido si hay pesos negativos)
-    def dijkstra_con_prev(self, inicio):
-        """
-        Ejecuta Dijkstra (solo válido si no hay aristas con peso negativo).
-        devuelve (dist, prev).
-        """
-        #obtener vertices y preparar diccionarios
-        vertices = self.obtener_vertices()
-        dist = {v: float("inf") for v in vertices}
-        prev = {v: None for v in vertices}
-        #si inicio no esta en el grafo devolver diccionarios vacios
-        if inicio not in dist:
-            return {}, {}
+    #marca el trabajo como cancelado; devuelve True si ni siquiera habia empezado
+    def cancelar(self):
+        self._cancelado.set()
+        return self.future.cancel()
 
-        #distancia al inicio es cero
-        dist[inicio] = 0
-        #crear heap de prioridad con la tupla (dist,nodo)
-        heap = [(0, inicio)]
-        #conjunto para marcar nodos ya procesados
-        visited = set()
 
-        #mientras queden nodos en la cola
-        while heap:
-            #sacar el nodo con menor distancia conocida
-            d_u, u = heapq.heappop(heap)
-            #si ya fue procesado, saltarlo
-            if u in visited:
-                continue
-            #marcar como procesado
-            visited.add(u)
-            #si el valor obtenido es mayor que el guardado, ignorar
-            if d_u > dist[u]:
+#servicio que corre calculos de rutas en un pool de hilos y entrega los resultados con after
+class ServicioCalculo:
+    """
+    Cada trabajo recibe su objeto Trabajo como primer argumento y devuelve un resultado.
+    Los callbacks (al_terminar, al_error, al_progreso) se llaman siempre en el hilo de
+    tkinter: el servicio revisa los futures con after() cada intervalo_ms milisegundos.
+    Los trabajos cancelados no llaman a ningun callback.
+    """
+    #constructor que recibe el widget que programa los after
+    def __init__(self, widget, hilos=1, intervalo_ms=30):
+        self.widget = widget
+        self.intervalo_ms = intervalo_ms
+        self.pool = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="calculo-rutas")
+        #avances reportados desde los hilos (cola segura entre hilos)
+        self._avances = queue.SimpleQueue()
+        #trabajos pendientes: (trabajo, al_terminar, al_error, al_progreso)
+        self._pendientes = []
+        self._id_after = None
+
+    #envia funcion(trabajo, *args) al pool y devuelve el Trabajo
+    def enviar(self, funcion, *args, al_terminar=None, al_error=None, al_progreso=None):
+        trabajo = Trabajo(self._avances)
+        trabajo.future = self.pool.submit(funcion, trabajo, *args)
+        self._pendientes.append((trabajo, al_terminar, al_error, al_progreso))
+        if self._id_after is None:
+            self._id_after = self.widget.after(self.intervalo_ms, self._revisar)
+        return trabajo
+
+    #entrega avances y resultados en el hilo de tkinter
+    def _revisar(self):
+        self._id_after = None
+        #avances: solo el ultimo de cada trabajo importa pero se entregan en orden
+        callbacks = {id(t): cb for t, _, _, cb in self._pendientes}
+        while True:
+            try:
+                trabajo, fraccion, texto = self._avances.get_nowait()
+            except queue.Empty:
+                break
+            cb = callbacks.get(id(trabajo))
+            if cb is not None and not trabajo.cancelado():
+                cb(fraccion, texto)
+        #resultados de los trabajos terminados
+        quedan = []
+        for pendiente in self._pendientes:
+            trabajo, al_terminar, al_error, _ = pendiente
+            if not trabajo.future.done():
+                quedan.append(pendiente)
                 continue
-            #si u no tiene vecinos seguir con la siguiente iteracion
-            if u not in self.adyacencia:
+            if trabajo.cancelado():
                 continue
-            #recorrer vecinos de u
-            for v, peso in self.adyacencia[u]:
-                #nota: si peso es negativo dijkstra puede fallar, aqui se usa solo para comparar
-                nd = dist[u] + peso
-                #si al pasar por u se mejora la distancia a v, actualizar y encolar
-                if nd < dist[v]:
-                    dist[v] = nd
-                    prev[v] = u
-                    heapq.heappush(heap, (nd, v))
+            error = trabajo.future.exception()
+            if error is not None:
+                if al_error is not None:
+                    al_error(error)
+            elif al_terminar is not None:
+                al_terminar(trabajo.future.result())
+        self._pendientes = quedan
+        if self._pendientes and self.pool is not None:
+            self._id_after = self.widget.after(self.intervalo_ms, self._revisar)
 
-        #devolver distancias y predecesores
-        return dist, prev
+    #cancela lo pendiente y libera los hilos (no espera a que termine lo que ya corre)
+    def cerrar(self):
+        for trabajo, _, _, _ in self._pendientes:
+            trabajo.cancelar()
+        self._pendientes = []
+        if self._id_after is not None:
+            try:
+                self.widget.after_cancel(self._id_after)
+            except Exception:
+                pass
+            self._id_after = None
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
 
 
 #ventana inicial que pregunta tipo de mapa (nacional o internacional)
 class VentanaInicio:
     #constructor que recibe la ventana raiz de tkinter
     def __init__(self, root):
+        #asegurar que tkinter y PIL ya esten importados
+        cargar_gui()
         #guardar referencia a la ventana raiz
         self.root = root
         #poner titulo en la ventana principal
@@ -188,6 +3310,7 @@ class VentanaInicio:
 class VentanaOrigenDestino:
     #constructor que recibe el tipo ("nacional" o "internacional")
     def __init__(self, tipo):
+        cargar_gui()
         #guardar tipo en la instancia
         self.tipo = tipo
         #crear una ventana secundaria (toplevel)
@@ -195,7 +3318,7 @@ class VentanaOrigenDestino:
         #poner titulo que incluye el tipo seleccionado
         self.win.title(f"Origen y Destino ({tipo.capitalize()})")
         #centrar la ventana secundaria
-        centrar_ventana(self.win, 420, 260)
+        centrar_ventana(self.win, 420, 300)
         #self.win.geometry("420x260")
         #fondo de la ventana secundaria
         self.win.configure(bg="#f8f8f8")
@@ -204,12 +3327,8 @@ class VentanaOrigenDestino:
         tk.Label(self.win, text=f"Selecciona origen y destino ({tipo})",
                  font=("Arial", 12, "bold"), bg="#f8f8f8").pack(pady=12)
 
-        #segun el tipo, crear la lista de lugares disponibles
-        if tipo == "nacional":
-            lugares = ["CDMX", "Guadalajara", "Monterrey", "Cancún", "Tijuana",
-                       "Los Cabos", "Guanajuato", "Culiacan", "Puerto Vallarta", "Merida"]
-        else:
-            lugares = ["México", "USA", "Inglaterra", "Francia", "Japón", "Dubai", "Colombia", "Chile"]
+        #la lista de lugares disponibles sale del archivo de aeropuertos del tipo elegido
+        lugares = [nombre for nombre, _, _ in leer_aeropuertos_csv(archivos_red(tipo)[1])]
 
         #crear un frame para organizar los widgets dentro de la ventana
         frame = tk.Frame(self.win, bg="#f8f8f8")
@@ -229,6 +3348,13 @@ class VentanaOrigenDestino:
         #crear el optionmenu para destino y colocarlo en la grilla
         tk.OptionMenu(frame, self.var_destino, *lugares).grid(row=1, column=1, padx=6, pady=6)
 
+        #etiqueta y menu desplegable para el algoritmo exacto (admite pesos negativos)
+        tk.Label(frame, text="Algoritmo:", bg="#f8f8f8").grid(row=2, column=0, padx=6, pady=6, sticky="e")
+        #variable que guarda el algoritmo elegido (se muestra su nombre largo)
+        self.var_algoritmo = tk.StringVar(value=Grafo.NOMBRES_ALGORITMOS["bellman"])
+        opciones = [Grafo.NOMBRES_ALGORITMOS[a] for a in ("bellman", "spfa", "astar")]
+        tk.OptionMenu(frame, self.var_algoritmo, *opciones).grid(row=2, column=1, padx=6, pady=6)
+
         #boton que al presionarlo abre la ventana del grafo con origen y destino elegidos
         tk.Button(self.win, text="Visualizar", bg="#4CAF50", fg="white", width=14,
                   command=self.abrir_grafo).pack(pady=18)
@@ -238,18 +3364,244 @@ class VentanaOrigenDestino:
         #obtener valores seleccionados en los optionmenu
         origen = self.var_origen.get()
         destino = self.var_destino.get()
+        #traducir el nombre mostrado al nombre corto del algoritmo
+        algoritmo = next(a for a, nombre in Grafo.NOMBRES_ALGORITMOS.items()
+                         if nombre == self.var_algoritmo.get())
         #crear la ventana que mostrara el grafo y la animacion
-        VentanaGrafo(origen, destino, self.tipo)
+        VentanaGrafo(origen, destino, self.tipo, algoritmo)
+
+
+#indice espacial de rejilla uniforme sobre puntos y segmentos del mapa
+class RejillaEspacial:
+    """
+    Cada punto o segmento se anota en las celdas que cruza; buscar solo revisa las
+    celdas del rectangulo pedido, asi el costo depende de lo visible y no del total.
+    Los resultados salen en el orden en que se agregaron los elementos.
+    """
+    #constructor que recibe el lado de cada celda en unidades del mapa
+    def __init__(self, celda=32):
+        self.celda = celda
+        #celda (i, j) -> ids de los elementos que la tocan
+        self.celdas = {}
+        #elementos y sus rectangulos (x0, y0, x1, y1), por id
+        self.elementos = []
+        self.rectangulos = []
+
+    #celdas que cubren el rectangulo
+    def _rango(self, x0, y0, x1, y1):
+        c = self.celda
+        for i in range(int(x0 // c), int(x1 // c) + 1):
+            for j in range(int(y0 // c), int(y1 // c) + 1):
+                yield i, j
+
+    #celdas que cruza el segmento (x0, y0)-(x1, y1): por cada columna solo las filas que toca
+    #(una arista larga en diagonal no se anota en todo su rectangulo)
+    def _celdas_segmento(self, x0, y0, x1, y1):
+        c = self.celda
+        if x0 > x1:
+            x0, y0, x1, y1 = x1, y1, x0, y0
+        pendiente = (y1 - y0) / (x1 - x0) if x1 != x0 else None
+        for i in range(int(x0 // c), int(x1 // c) + 1):
+            if pendiente is None:
+                ya, yb = y0, y1
+            else:
+                #tramo del segmento dentro de la columna i
+                xa, xb = max(x0, i * c), min(x1, (i + 1) * c)
+                ya, yb = y0 + (xa - x0) * pendiente, y0 + (xb - x0) * pendiente
+            for j in range(int(min(ya, yb) // c), int(max(ya, yb) // c) + 1):
+                yield i, j
+
+    #agrega un punto (x0, y0) o un segmento hasta (x1, y1)
+    def agregar(self, elemento, x0, y0, x1=None, y1=None):
+        x1 = x0 if x1 is None else x1
+        y1 = y0 if y1 is None else y1
+        k = len(self.elementos)
+        self.elementos.append(elemento)
+        self.rectangulos.append((min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)))
+        for celda in self._celdas_segmento(x0, y0, x1, y1):
+            self.celdas.setdefault(celda, []).append(k)
+
+    #elementos cuyo rectangulo cruza el rectangulo dado
+    def buscar(self, x0, y0, x1, y1):
+        vistos = set()
+        for celda in self._rango(x0, y0, x1, y1):
+            vistos.update(self.celdas.get(celda, ()))
+        encontrados = []
+        for k in sorted(vistos):
+            a0, b0, a1, b1 = self.rectangulos[k]
+            if a0 <= x1 and a1 >= x0 and b0 <= y1 and b1 >= y0:
+                encontrados.append(self.elementos[k])
+        return encontrados
+
+    #el punto mas cercano a (x, y) a lo mas a radio de distancia, None si no hay
+    def cercano(self, x, y, radio):
+        mejor, mejor_d = None, radio
+        for celda in self._rango(x - radio, y - radio, x + radio, y + radio):
+            for k in self.celdas.get(celda, ()):
+                a0, b0, _, _ = self.rectangulos[k]
+                d = math.hypot(a0 - x, b0 - y)
+                if d <= mejor_d:
+                    mejor, mejor_d = self.elementos[k], d
+        return mejor
+
+
+#parte del mapa que se ve en el canvas: zoom y esquina superior izquierda en coordenadas del mapa
+class Vista:
+    """
+    Las posiciones de los aeropuertos estan en coordenadas del mapa (el canvas sin zoom).
+    pantalla = (mapa - esquina) * zoom. Las vistas no se modifican: acercar y mover
+    devuelven una nueva, siempre dentro del mapa.
+    """
+    __slots__ = ("zoom", "x", "y", "ancho", "alto")
+
+    #constructor; ancho y alto son los del mapa y del canvas
+    def __init__(self, ancho, alto, zoom=1.0, x=0.0, y=0.0):
+        self.ancho = ancho
+        self.alto = alto
+        self.zoom = zoom
+        #la esquina no puede dejar ver fuera del mapa
+        self.x = min(max(0.0, x), ancho - ancho / zoom)
+        self.y = min(max(0.0, y), alto - alto / zoom)
+
+    #coordenadas del mapa -> canvas
+    def a_pantalla(self, x, y):
+        return (x - self.x) * self.zoom, (y - self.y) * self.zoom
+
+    #coordenadas del canvas -> mapa
+    def a_mundo(self, sx, sy):
+        return self.x + sx / self.zoom, self.y + sy / self.zoom
+
+    #rectangulo visible en coordenadas del mapa, con margen en pixeles del canvas
+    def rectangulo(self, margen=0):
+        m = margen / self.zoom
+        return (self.x - m, self.y - m,
+                self.x + self.ancho / self.zoom + m, self.y + self.alto / self.zoom + m)
+
+    #vista con el zoom multiplicado por factor dejando fijo el punto del canvas (sx, sy)
+    def acercar(self, sx, sy, factor, zoom_maximo=8.0):
+        zoom = min(max(1.0, self.zoom * factor), zoom_maximo)
+        x, y = self.a_mundo(sx, sy)
+        return Vista(self.ancho, self.alto, zoom, x - sx / zoom, y - sy / zoom)
+
+    #vista desplazada: el mapa se mueve dx, dy pixeles del canvas
+    def mover(self, dx, dy):
+        return Vista(self.ancho, self.alto, self.zoom, self.x - dx / self.zoom, self.y - dy / self.zoom)
+
+    #clave para el cache de capas (redondeada para no guardar casi-iguales)
+    def clave(self):
+        return round(self.zoom, 4), round(self.x, 1), round(self.y, 1)
+
+
+#cache de imagenes compartida por todas las ventanas del proceso
+#los mapas se guardan por (ruta, tamaño) y las capas estaticas por (ruta, tamaño, firma del grafo)
+class CacheImagenes:
+    def __init__(self, max_capas=16):
+        #imagenes de mapa ya abiertas y redimensionadas (son solo dos archivos, no hace falta expulsar)
+        self.mapas = {}
+        #capas compuestas en orden de uso; se expulsa la menos reciente al pasar de max_capas
+        self.capas = OrderedDict()
+        self.max_capas = max_capas
+        #fuente de las etiquetas, se carga una sola vez
+        self._fuente = None
+        #las capas se componen en el hilo de calculo, por eso los diccionarios van con candado
+        self._candado = threading.Lock()
+
+    #devuelve el mapa de ruta redimensionado a tamano, o del tamano original con tamano=None
+    #(lo abre de disco solo la primera vez)
+    def mapa(self, ruta, tamano=None):
+        clave = (str(ruta), None if tamano is None else tuple(tamano))
+        with self._candado:
+            imagen = self.mapas.get(clave)
+        if imagen is None:
+            #rgba para poder dibujar encima con colores aunque el png sea de paleta
+            imagen = Image.open(ruta).convert("RGBA")
+            if tamano is not None:
+                imagen = imagen.resize(tuple(tamano))
+            with self._candado:
+                imagen = self.mapas.setdefault(clave, imagen)
+        return imagen
+
+    #devuelve la capa guardada con esa clave o la compone con componer() y la guarda
+    def capa(self, clave, componer):
+        with self._candado:
+            imagen = self.capas.get(clave)
+            if imagen is not None:
+                self.capas.move_to_end(clave)
+                return imagen
+        #componer fuera del candado: dos ventanas pueden dibujar a la vez sin esperarse
+        imagen = componer()
+        with self._candado:
+            self.capas[clave] = imagen
+            self.capas.move_to_end(clave)
+            while len(self.capas) > self.max_capas:
+                self.capas.popitem(last=False)
+        return imagen
+
+    #fuente en negritas para los pesos y nombres (la de PIL si no hay ninguna truetype)
+    def fuente(self):
+        if self._fuente is None:
+            for nombre in ("arialbd.ttf", "DejaVuSans-Bold.ttf"):
+                try:
+                    self._fuente = ImageFont.truetype(nombre, 12)
+                    break
+                except OSError:
+                    continue
+            else:
+                self._fuente = ImageFont.load_default()
+        return self._fuente
+
+
+#unica cache del proceso: abrir otra ventana no vuelve a leer ni a redimensionar el png
+IMAGENES = CacheImagenes()
+
+
+#dibuja con PIL una linea con punta de flecha en el extremo final (como arrow=tk.LAST)
+def dibujar_flecha(dibujo, x1, y1, x2, y2, color, ancho, largo=9, abertura=4.5):
+    dibujo.line((x1, y1, x2, y2), fill=color, width=max(1, round(ancho)))
+    distancia = math.hypot(x2 - x1, y2 - y1)
+    if distancia == 0:
+        return
+    #vector unitario de la arista y su perpendicular
+    ux, uy = (x2 - x1) / distancia, (y2 - y1) / distancia
+    bx, by = x2 - ux * largo, y2 - uy * largo
+    dibujo.polygon([(x2, y2), (bx - uy * abertura, by + ux * abertura),
+                    (bx + uy * abertura, by - ux * abertura)], fill=color)
+
+
+#escribe texto centrado en (x, y) sin depender de que la fuente admita anclas
+def dibujar_texto_centrado(dibujo, x, y, texto, fuente, color="black"):
+    izquierda, arriba, derecha, abajo = dibujo.textbbox((0, 0), texto, font=fuente)
+    dibujo.text((x - (izquierda + derecha) / 2, y - (arriba + abajo) / 2), texto, font=fuente, fill=color)
 
 
 #ventana que muestra el mapa, el grafo y la ruta mas corta encontrada
 class VentanaGrafo:
-    #constructor que recibe origen, destino y tipo de mapa
-    def __init__(self, origen, destino, tipo):
+    #tamaño del canvas y del mapa de fondo
+    TAMANO_MAPA = (780, 450)
+    #zoom maximo y factor por cada paso de la rueda del raton
+    ZOOM_MAXIMO = 16.0
+    PASO_ZOOM = 1.25
+    #nivel de detalle: con mas elementos visibles que estos se simplifica el dibujo
+    MAX_ETIQUETAS_PESO = 80
+    MAX_ARISTAS_DETALLE = 1500
+    MAX_NOMBRES = 60
+    #lado en pixeles de las celdas en que se agrupan las aristas menores
+    CELDA_HAZ = 40
+    #milisegundos entre redibujos mientras se arrastra o se gira la rueda
+    ESPERA_REDIBUJO = 15
+    #milisegundos sin cambios de vista antes de componer la capa nitida en el hilo de calculo
+    ESPERA_CAPA = 120
+
+    #constructor que recibe origen, destino, tipo de mapa y algoritmo exacto a usar
+    def __init__(self, origen, destino, tipo, algoritmo="bellman"):
+        cargar_gui()
         #guardar parametros en la instancia
         self.origen = origen
         self.destino = destino
         self.tipo = tipo
+        self.algoritmo = algoritmo
+        #algoritmo de una fuente que se compara contra dijkstra al cerrar (a* se compara con bellman-ford)
+        self.algoritmo_exacto = algoritmo if algoritmo in Grafo.ALGORITMOS else "bellman"
 
         #crear la ventana toplevel para la visualizacion
         self.win = tk.Toplevel()
@@ -266,8 +3618,13 @@ class VentanaGrafo:
                  font=("Arial", 12, "bold"), bg="#ffffff").pack(pady=8)
 
         #canvas donde se dibuja el mapa y el grafo encima
-        self.canvas = tk.Canvas(self.win, width=780, height=450, bg="white", highlightthickness=0)
+        self.canvas = tk.Canvas(self.win, width=self.TAMANO_MAPA[0], height=self.TAMANO_MAPA[1],
+                                bg="white", highlightthickness=0)
         self.canvas.pack(pady=6)
+        #motor de animacion con after(); se detiene al cerrar la ventana
+        self.animaciones = MotorAnimacion(self.win)
+        #id del after que arranca la animacion (se cancela si la ventana se cierra antes)
+        self._id_inicio_animacion = None
 
         #determinar la ruta del archivo de imagen relativo al script actual
         base = Path(__file__).parent
@@ -276,15 +3633,18 @@ class VentanaGrafo:
             ruta = base / "mapa_mexicoo.png"
         else:
             ruta = base / "mapa_mundo.png"
+        self.ruta_mapa = ruta
+        #item del canvas con el fondo; al terminar el calculo se cambia por la capa estatica
+        self._id_fondo = None
 
         #intentar abrir y mostrar la imagen del mapa en el canvas
         try:
-            #abrir la imagen y redimensionarla al tamano del canvas
-            mapa = Image.open(ruta).resize((780, 450))
+            #la cache del proceso abre y redimensiona el png solo la primera vez
+            mapa = IMAGENES.mapa(ruta, self.TAMANO_MAPA)
             #convertir a objeto compatible con tkinter
             self.bg_img = ImageTk.PhotoImage(mapa)
             #dibujar la imagen en la esquina superior izquierda del canvas
-            self.canvas.create_image(0, 0, anchor="nw", image=self.bg_img)
+            self._id_fondo = self.canvas.create_image(0, 0, anchor="nw", image=self.bg_img)
             #mantener referencia: self.bg_img
         except Exception as e:
             #si ocurre un error al cargar la imagen, mostrar un mensaje de error
@@ -295,25 +3655,106 @@ class VentanaGrafo:
         self.grafo = Grafo()
         #diccionario que guarda coordenadas (x,y) para cada nodo
         self.posiciones = {}
+        #indices espaciales de aeropuertos y aristas, grado de cada aeropuerto y los principales
+        self.indice_nodos = RejillaEspacial()
+        self.indice_aristas = RejillaEspacial()
+        self.grado = {}
+        self.principales = set()
+        #parte del mapa que se ve; zoom y arrastre la reemplazan por otra
+        self.vista = Vista(*self.TAMANO_MAPA)
+        #firma del grafo para la cache de capas, calculada una vez por revision
+        self._firma = None
+        #lineas rojas de la ruta con sus coordenadas del mapa y avion (item, x, y) ya aterrizado
+        self._resaltados = []
+        self._avion_final = None
+        #zoom y arrastre solo se activan cuando ya hay capa dibujada
+        self._listo = False
+        self._id_redibujo = None
+        self._arrastre = None
+        #ultima capa nitida y la vista para la que se compuso; mientras llega la siguiente se
+        #muestra esta desplazada y escalada
+        self._capa = None
+        self._vista_capa = None
+        #after que espera a que la vista deje de cambiar y trabajo que compone la capa
+        self._id_capa = None
+        self._trabajo_capa = None
+
+        #etiqueta de estado mientras se calcula en segundo plano
+        self.estado = tk.Label(self.win, text="Calculando ruta...", font=("Arial", 10), bg="#ffffff")
+        self.estado.pack()
+        #bandera para no comparar dos veces si se presiona cerrar varias veces
+        self._cerrando = False
+        #servicio con un solo hilo: cargar la red, variar pesos y calcular rutas sin congelar la ventana
+        self.calculos = ServicioCalculo(self.win, hilos=1)
+        self._trabajo_ruta = self.calculos.enviar(self._calcular_ruta,
+                                                  al_terminar=self._mostrar_ruta,
+                                                  al_error=self._error_ruta,
+                                                  al_progreso=self._mostrar_progreso)
+
+        #rueda del raton (windows/mac con delta, linux con botones 4 y 5) acerca o aleja donde esta el cursor
+        self.canvas.bind("<MouseWheel>", lambda e: self.acercar(e.x, e.y, e.delta > 0))
+        self.canvas.bind("<Button-4>", lambda e: self.acercar(e.x, e.y, True))
+        self.canvas.bind("<Button-5>", lambda e: self.acercar(e.x, e.y, False))
+        #arrastrar con el boton izquierdo mueve el mapa, doble clic regresa a la vista completa
+        self.canvas.bind("<ButtonPress-1>", self._empezar_arrastre)
+        self.canvas.bind("<B1-Motion>", self._arrastrar)
+        self.canvas.bind("<Double-Button-1>", lambda e: self.cambiar_vista(Vista(*self.TAMANO_MAPA)))
+        #al pasar el cursor sobre un aeropuerto mostrar su nombre y cuantos vuelos salen de el
+        self.canvas.bind("<Motion>", self._senalar)
+
+        #cuando el usuario cierre la ventana, ejecutar el metodo on_close para comparar algoritmos
+        self.win.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    #carga la red, aplica la variacion y calcula las rutas (corre en el hilo de calculo)
+    def _calcular_ruta(self, trabajo):
         #llamar al metodo que agrega las aristas base y asigna posiciones
+        trabajo.reportar(0.1, "Cargando red...")
         self.crear_grafo_y_posiciones()
 
         #aplicar una variacion aleatoria a los pesos para simular cambios en tiempos
         self.aplicar_variacion_aleatoria()
 
-        #ejecutar bellman-ford para calcular rutas iniciales y poder animar el camino
-        dist, prev = self.grafo.bellman_ford_con_prev(self.origen)
-        #si bellman devolvio None significa que detecto ciclo negativo
+        #ejecutar el algoritmo elegido (bellman-ford, spfa o a*) para calcular rutas y poder animar el camino
+        trabajo.reportar(0.4, "Calculando ruta...")
+        if self.algoritmo in Grafo.PUNTO_A_PUNTO:
+            #a* solo explora hacia el destino; el camino se pasa a dist/prev para dibujarlo igual
+            distancia, camino = self.grafo.ruta_entre(self.origen, self.destino, self.algoritmo)
+            dist = prev = None
+            if distancia is not None:
+                dist = {self.destino: distancia}
+                prev = {b: a for a, b in zip(camino, camino[1:])}
+        else:
+            dist, prev = self.grafo.rutas_desde(self.origen, self.algoritmo)
+        #si el algoritmo devolvio None significa que detecto ciclo negativo
+        ciclo = None
+        if dist is None:
+            #obtener los vertices que forman el ciclo para poder mostrarlos
+            ciclo = self.grafo.bellman_ford_vectorizado(self.origen)[2]
+            return dist, prev, ciclo, None, []
+        #rutas alternativas para reprogramar el viaje (la primera suele ser la misma ruta)
+        alternativas = self.grafo.k_rutas_mas_cortas(self.origen, self.destino, 3) or []
+        #componer aqui mapa + aristas + nombres para que el hilo de tkinter solo pegue una imagen
+        trabajo.reportar(0.8, "Dibujando mapa...")
+        return dist, prev, ciclo, self.componer_capa_estatica(self.vista), alternativas
+
+    #muestra el resultado del calculo de la ruta (corre en el hilo de tkinter)
+    def _mostrar_ruta(self, resultado):
+        dist, prev, ciclo, capa, alternativas = resultado
+        self.estado.config(text="")
+        #si el algoritmo devolvio None significa que detecto ciclo negativo
         if dist is None:
+            texto = "Se detectó un ciclo negativo. No es posible calcular ruta."
+            if ciclo:
+                texto += f"\n\nRutas que forman el ciclo:\n{' → '.join(ciclo)}"
             #mostrar error de ciclo negativo y permitir que el usuario cierre la ventana
-            messagebox.showerror("Error", "Se detectó un ciclo negativo. No es posible calcular ruta.")
+            messagebox.showerror("Error", texto)
             #aun asi permitimos cerrar la ventana para ver la comparacion en on_close
         else:
-            #dibujar todas las aristas en gris con sus pesos
-            self.dibujar_aristas_con_pesos()
-            #dibujar los nodos encima del mapa
-            self.dibujar_nodos()
-            #reconstruir el camino desde el diccionario prev devuelto por bellman-ford
+            #poner de fondo la capa con las aristas en gris, sus pesos y los nodos ya dibujados
+            self.mostrar_capa_estatica(capa)
+            #desde aqui se puede acercar, mover y señalar aeropuertos
+            self._listo = True
+            #reconstruir el camino desde el diccionario prev devuelto por el algoritmo
             camino = self.reconstruir_camino(prev, self.origen, self.destino)
             #si la lista camino tiene longitud menor o igual a 1 significa que no hay ruta valida
             if len(camino) <= 1:
@@ -323,7 +3764,7 @@ class VentanaGrafo:
                 #calcular el tiempo total sumando pesos entre nodos consecutivos del camino
                 total_horas = sum(self.obtener_peso_entre(camino[i], camino[i+1]) for i in range(len(camino)-1))
                 #iniciar la animacion del avion despues de 100 ms para que todo ya este dibujado
-                self.win.after(100, lambda: self.animar_camino(camino))
+                self._id_inicio_animacion = self.win.after(100, lambda: self.animar_camino(camino))
                 #crear un pequeño panel informativo que muestra la ruta y el tiempo total
                 info_frame = tk.Frame(self.win, bg="#e0f7fa", bd=2, relief="groove")
                 info_frame.pack(pady=10)
@@ -333,155 +3774,303 @@ class VentanaGrafo:
                 tk.Label(info_frame, text=f"{' → '.join(camino)}", font=("Arial", 10), bg="#e0f7fa").pack()
                 #etiqueta que muestra el tiempo total calculado
                 tk.Label(info_frame, text=f"Tiempo total: {total_horas} h", font=("Arial", 10, "bold"), bg="#e0f7fa").pack()
+                #otras rutas sin ciclos, de la mas corta a la mas larga, por si hay que reprogramar
+                otras = [(horas, ruta) for horas, ruta in alternativas if ruta != camino][:2]
+                if otras:
+                    texto = "\n".join(f"{' → '.join(ruta)} ({horas} h)" for horas, ruta in otras)
+                    tk.Label(info_frame, text=f"Alternativas:\n{texto}", font=("Arial", 9), bg="#e0f7fa").pack()
 
-        #cuando el usuario cierre la ventana, ejecutar el metodo on_close para comparar algoritmos
-        self.win.protocol("WM_DELETE_WINDOW", self.on_close)
+    #si el calculo falla mostrar el error en la ventana
+    def _error_ruta(self, e):
+        self.estado.config(text="")
+        messagebox.showerror("Error", f"Ocurrió un error al calcular la ruta:\n{e}")
+
+    #muestra el avance reportado por el hilo de calculo
+    def _mostrar_progreso(self, fraccion, texto):
+        self.estado.config(text=f"{texto} ({fraccion:.0%})")
 
     #metodo que agrega las aristas base y asigna posiciones en el canvas
     def crear_grafo_y_posiciones(self):
-        #aqui se definen las aristas base (tiempos en horas) y las posiciones de cada nodo
-        #ajusta coordenadas si necesitas mover puntos en el mapa
-        if self.tipo == "nacional":
-            #aristas base (orientadas): cada una indica origen, destino y tiempo estimado
-            self.grafo.agregar_arista("Tijuana", "Los Cabos", 2)
-            self.grafo.agregar_arista("Tijuana", "Monterrey", 6)
-            self.grafo.agregar_arista("Los Cabos", "Culiacan", 1)
-            self.grafo.agregar_arista("Culiacan", "Puerto Vallarta", 2)
-            self.grafo.agregar_arista("Puerto Vallarta", "Los Cabos", 6)
-            self.grafo.agregar_arista("Culiacan", "Monterrey", 2)
-            self.grafo.agregar_arista("Culiacan", "Tijuana", 3)
-            self.grafo.agregar_arista("Monterrey", "CDMX", 4)
-            self.grafo.agregar_arista("Monterrey", "Guadalajara", 3)
-            self.grafo.agregar_arista("Guadalajara", "CDMX", 1)
-            self.grafo.agregar_arista("Guadalajara", "Puerto Vallarta", 2)
-            self.grafo.agregar_arista("CDMX", "Cancún", 3)
-            self.grafo.agregar_arista("Merida", "Guanajuato", 3)
-            self.grafo.agregar_arista("Merida", "CDMX", 4)
-            self.grafo.agregar_arista("Cancún", "Merida", 1)
-            self.grafo.agregar_arista("Guanajuato", "Monterrey", 2)
-
-            #asignar coordenadas x,y para cada ciudad en el canvas
-            self.posiciones = {
-                "Tijuana": (95, 95),
-                "Monterrey": (440, 180),
-                "CDMX": (470, 325),
-                "Guadalajara": (390, 295),
-                "Cancún": (735, 280),
-                "Culiacan": (270, 205),
-                "Los Cabos": (215, 230),
-                "Guanajuato": (430, 280),
-                "Merida": (690, 285),
-                "Puerto Vallarta": (330, 270)
-            }
-        else:
-            #version internacional: agregar aristas entre paises y asignar posiciones aproximadas
-            self.grafo.agregar_arista("Chile", "México", 10)
-            self.grafo.agregar_arista("Colombia", "Chile", 6)
-            self.grafo.agregar_arista("Colombia", "México", 8)
-            self.grafo.agregar_arista("México", "USA", 5)
-            self.grafo.agregar_arista("México", "Colombia", 8)
-            self.grafo.agregar_arista("México", "Chile", 10)
-            self.grafo.agregar_arista("USA", "México", 5)
-            self.grafo.agregar_arista("USA", "Inglaterra", 9)
-            self.grafo.agregar_arista("Inglaterra", "Francia", 2)
-            self.grafo.agregar_arista("Inglaterra", "Japón", 12)
-            self.grafo.agregar_arista("Francia", "Japón", 12)
-            self.grafo.agregar_arista("Francia", "USA", 9)
-            self.grafo.agregar_arista("Japón", "Dubai", 10)
-            self.grafo.agregar_arista("Dubai", "Francia", 10)
-
-            #posiciones aproximadas para cada pais/region en el canvas
-            self.posiciones = {
-                "USA": (150, 115),     #este de ee.uu
-                "Inglaterra": (309, 78),        #reino unido
-                "Francia": (317, 95),          #francia
-                "Japón": (605, 127),           #japon
-                "Dubai": (430, 165),           #dubai
-                "Chile": (158, 330),           #chile
-                "Colombia": (145, 215),        #colombia
-                "México": (85, 170)           #mexico
-            }
+        #las aristas base (tiempos en horas) y las posiciones de cada nodo estan en datos/
+        #ajusta las coordenadas en <tipo>_aeropuertos.csv si necesitas mover puntos en el mapa
+        ruta_rutas, ruta_aeropuertos = archivos_red(self.tipo)
+        #aristas base (orientadas): cada fila indica origen, destino y tiempo estimado
+        cargar_grafo(ruta_rutas, self.grafo)
+        #asignar coordenadas x,y para cada ciudad en el canvas
+        self.posiciones = {nombre: (x, y) for nombre, x, y in leer_aeropuertos_csv(ruta_aeropuertos)}
+        #coordenadas reales para la cota de a*
+        self.grafo.fijar_coordenadas((nombre, (lat, lon)) for nombre, lat, lon in leer_coordenadas_csv(ruta_aeropuertos))
+        #indices espaciales para dibujar solo lo visible y encontrar el aeropuerto bajo el cursor
+        self.indexar()
+
+    #arma los indices espaciales de aeropuertos y aristas (una entrada por par origen->destino)
+    def indexar(self):
+        self.indice_nodos = RejillaEspacial()
+        self.indice_aristas = RejillaEspacial()
+        grado = dict.fromkeys(self.posiciones, 0)
+        pares = set()
+        for u, aristas in self.grafo.adyacencia.items():
+            for v, _ in aristas:
+                if u not in self.posiciones or v not in self.posiciones or (u, v) in pares:
+                    continue
+                pares.add((u, v))
+                grado[u] += 1
+                grado[v] += 1
+                #la arista se anota en las celdas de su rectangulo, asi aparece si cruza la vista
+                (x1, y1), (x2, y2) = self.posiciones[u], self.posiciones[v]
+                self.indice_aristas.agregar((u, v), x1, y1, x2, y2)
+        #los nodos se agregan de mayor a menor grado: al buscar, los importantes salen primero
+        for ciudad in sorted(self.posiciones, key=lambda c: -grado[c]):
+            self.indice_nodos.agregar(ciudad, *self.posiciones[ciudad])
+        self.grado = grado
+        #aeropuertos con mas conexiones; sus aristas nunca se agrupan y sus nombres se ven siempre
+        self.principales = set(self.indice_nodos.elementos[:self.MAX_NOMBRES])
 
     #aplica una variacion aleatoria a cada peso para simular cambios en tiempos
     def aplicar_variacion_aleatoria(self):
-        #recorrer cada origen en la adyacencia (usar list para evitar modificar mientras iteras)
-        for u in list(self.grafo.adyacencia.keys()):
-            #lista temporal que guardara nuevas tuplas (destino,nuevo_peso)
-            nuevas = []
-            for v, w in self.grafo.adyacencia[u]:
-                #generar un delta aleatorio entre -2 y 2 horas
-                delta = random.randint(-2, 2)
-                #calcular el nuevo peso sumando delta
-                nuevo = w + delta
-                #si prefieres evitar tiempos negativos descomenta la siguiente linea en tu codigo original
-                #nuevo = max(1, nuevo)
-                #agregar la nueva tupla a la lista temporal
-                nuevas.append((v, nuevo))
+        #un escenario del generador de escenarios: a cada peso se le suma un entero entre -2 y 2 horas
+        #si prefieres evitar tiempos negativos pasa minimo=1 a escenarios_pesos
+        csr = self.grafo.a_csr()
+        pesos = csr.escenarios_pesos(1, (-2, 2))[0].tolist()
+        #recorrer cada origen del csr (sus aristas estan en el mismo orden que en la adyacencia)
+        for u in range(csr.num_vertices()):
+            inicio, fin = csr.offsets[u], csr.offsets[u + 1]
+            if inicio == fin:
+                continue
+            nuevas = [(csr.nombres[csr.destinos[k]], pesos[k]) for k in range(inicio, fin)]
             #reemplazar la lista original por la lista con variacion
-            self.grafo.adyacencia[u] = nuevas
+            self.grafo.reemplazar_aristas(csr.nombres[u], nuevas)
+
+    #devuelve la imagen con el mapa, las aristas y los nodos vistos desde vista
+    #(compuesta una vez por version del grafo y vista)
+    def componer_capa_estatica(self, vista=None):
+        vista = vista or Vista(*self.TAMANO_MAPA)
+
+        def componer():
+            capa = self.mapa_en_vista(vista)
+            dibujo = ImageDraw.Draw(capa)
+            #dibujar las aristas visibles en gris con sus pesos
+            self.dibujar_aristas_con_pesos(dibujo, vista)
+            #dibujar los nodos visibles encima del mapa
+            self.dibujar_nodos(dibujo, vista)
+            return capa
+
+        #solo la vista completa va al cache del proceso: las de zoom y arrastre casi nunca se
+        #repiten y llenarian sus 16 entradas sacando a la vista completa
+        if vista.clave() != Vista(*self.TAMANO_MAPA).clave():
+            return componer()
+        #la firma cambia si cambia cualquier peso o posicion, asi una capa vieja nunca se reutiliza
+        #se guarda su hash por revision: con redes grandes recorrer todas las aristas es caro
+        if self._firma is None or self._firma[0] != self.grafo.revision:
+            firma = (tuple((u, tuple(aristas)) for u, aristas in self.grafo.adyacencia.items()),
+                     tuple(self.posiciones.items()))
+            self._firma = (self.grafo.revision, len(firma[0]), hash(firma))
+        clave = (str(self.ruta_mapa), self.TAMANO_MAPA, self._firma[1:])
+        return IMAGENES.capa(clave, componer)
+
+    #recorte del mapa que cubre la vista, escalado al tamaño del canvas (imagen nueva, se puede pintar)
+    def mapa_en_vista(self, vista):
+        try:
+            if vista.zoom == 1.0:
+                #copia: la imagen de la cache se comparte entre ventanas y no se pinta encima
+                return IMAGENES.mapa(self.ruta_mapa, self.TAMANO_MAPA).copy()
+            #con zoom se recorta el png original para no ampliar pixeles ya reducidos
+            original = IMAGENES.mapa(self.ruta_mapa)
+            ex = original.width / self.TAMANO_MAPA[0]
+            ey = original.height / self.TAMANO_MAPA[1]
+            x0, y0, x1, y1 = vista.rectangulo()
+            return original.resize(self.TAMANO_MAPA, box=(x0 * ex, y0 * ey, x1 * ex, y1 * ey))
+        except Exception:
+            #sin archivo de mapa se dibuja sobre fondo blanco, como el canvas
+            return Image.new("RGBA", self.TAMANO_MAPA, "white")
+
+    #reemplaza el fondo del canvas por la capa estatica (un solo item en vez de uno por arista y texto)
+    #vista: para la que se compuso la capa (None = vista completa)
+    def mostrar_capa_estatica(self, capa, vista=None):
+        self._capa = capa
+        self._vista_capa = vista or Vista(*self.TAMANO_MAPA)
+        self._mostrar_fondo(capa)
+
+    #pone la imagen de fondo del canvas
+    def _mostrar_fondo(self, imagen):
+        #mantener referencia: tkinter no guarda la PhotoImage y sin ella el fondo se borra
+        self.capa_img = ImageTk.PhotoImage(imagen)
+        if self._id_fondo is None:
+            self._id_fondo = self.canvas.create_image(0, 0, anchor="nw", image=self.capa_img)
+        else:
+            self.canvas.itemconfig(self._id_fondo, image=self.capa_img)
 
-    #dibuja todas las aristas en gris y muestra su peso en horas
-    def dibujar_aristas_con_pesos(self):
-        #recorrer cada origen en la adyacencia
-        for u in self.grafo.adyacencia:
-            #si no existe posicion para el origen saltarla
-            if u not in self.posiciones:
+    #dibuja las aristas visibles en gris y muestra su peso en horas
+    #con muchas aristas en pantalla se quitan los pesos, las menores se agrupan en haces
+    #y las que solo atraviesan la vista se ocultan
+    def dibujar_aristas_con_pesos(self, dibujo, vista):
+        fuente = IMAGENES.fuente()
+        #solo las aristas que cruzan la vista (el margen deja ver las flechas que entran por el borde)
+        visibles = self.indice_aristas.buscar(*vista.rectangulo(20))
+        detalle = len(visibles) <= self.MAX_ARISTAS_DETALLE
+        con_pesos = len(visibles) <= self.MAX_ETIQUETAS_PESO
+        #haces de aristas menores: (celda de origen, celda de destino) -> cuantas aristas agrupa
+        haces = {}
+        lado = self.CELDA_HAZ
+        ancho, alto = self.TAMANO_MAPA
+        lineas = []
+        for u, v in visibles:
+            #coordenadas en el canvas de origen y destino
+            x1, y1 = vista.a_pantalla(*self.posiciones[u])
+            x2, y2 = vista.a_pantalla(*self.posiciones[v])
+            if detalle or (u in self.principales and v in self.principales):
+                lineas.append((u, v, x1, y1, x2, y2))
                 continue
-            #obtener coordenadas del origen
-            x1, y1 = self.posiciones[u]
-            #recorrer cada destino y peso desde u
-            for v, peso in self.grafo.adyacencia[u]:
-                #si no existe posicion para el destino saltarlo
-                if v not in self.posiciones:
-                    continue
-                #coordenadas del destino
-                x2, y2 = self.posiciones[v]
-                #dibujar linea con flecha que representa la arista
-                self.canvas.create_line(x1, y1, x2, y2, arrow=tk.LAST, fill="#777777", width=1.5)
-                #calcular punto medio para colocar el texto del peso
-                mx, my = (x1 + x2) / 2, (y1 + y2) / 2
-                #desplazar un poco el texto para que no coincida con la flecha
-                self.canvas.create_text(mx, my - 12, text=f"{peso} h", font=("Arial", 9, "bold"), fill="black")
-
-    #dibuja los nodos (ciudades) encima del mapa
-    def dibujar_nodos(self):
-        #recorrer el diccionario de posiciones
-        for ciudad, (x, y) in self.posiciones.items():
+            #una arista menor que solo cruza la vista (ningun extremo adentro) se oculta
+            if not (0 <= x1 <= ancho and 0 <= y1 <= alto) and not (0 <= x2 <= ancho and 0 <= y2 <= alto):
+                continue
+            celdas = (int(x1 // lado), int(y1 // lado), int(x2 // lado), int(y2 // lado))
+            haces[celdas] = haces.get(celdas, 0) + 1
+        #los haces van debajo, como una linea entre centros de celda mas gruesa cuantas mas aristas lleva
+        for (i1, j1, i2, j2), n in haces.items():
+            if (i1, j1) == (i2, j2):
+                continue
+            dibujo.line(((i1 + 0.5) * lado, (j1 + 0.5) * lado, (i2 + 0.5) * lado, (j2 + 0.5) * lado),
+                        fill="#aaaaaa", width=max(1, round(1 + math.log2(n))))
+        for u, v, x1, y1, x2, y2 in lineas:
+            #dibujar linea con flecha que representa la arista
+            dibujar_flecha(dibujo, x1, y1, x2, y2, "#777777", 1.5)
+            if not con_pesos:
+                continue
+            #con vuelos paralelos se muestran todos sus pesos en la misma etiqueta
+            pesos = "/".join(str(peso) for peso in self.grafo.pesos_paralelos(u, v))
+            #calcular punto medio para colocar el texto del peso
+            mx, my = (x1 + x2) / 2, (y1 + y2) / 2
+            #desplazar un poco el texto para que no coincida con la flecha
+            dibujar_texto_centrado(dibujo, mx, my - 12, f"{pesos} h", fuente)
+
+    #dibuja los nodos (ciudades) visibles encima del mapa
+    #con muchos en pantalla se achican y solo se nombran los de mas conexiones
+    def dibujar_nodos(self, dibujo, vista):
+        fuente = IMAGENES.fuente()
+        #el indice los devuelve de mayor a menor grado
+        visibles = self.indice_nodos.buscar(*vista.rectangulo(20))
+        radio = 6 if len(visibles) <= 300 else 4 if len(visibles) <= 2000 else 2
+        nombrados = set(visibles[:self.MAX_NOMBRES])
+        for ciudad in visibles:
+            x, y = vista.a_pantalla(*self.posiciones[ciudad])
             #dibujar un pequeño oval rojo para representar el nodo
-            self.canvas.create_oval(x-6, y-6, x+6, y+6, fill="#ff4d4d", outline="black")
+            dibujo.ellipse((x-radio, y-radio, x+radio, y+radio), fill="#ff4d4d", outline="black")
             #dibujar el nombre de la ciudad encima del nodo
-            self.canvas.create_text(x, y-14, text=ciudad, font=("Arial", 9, "bold"), fill="black")
+            if ciudad in nombrados:
+                dibujar_texto_centrado(dibujo, x, y-radio-8, ciudad, fuente)
+
+    #aeropuerto bajo el punto (sx, sy) del canvas o None, buscado en el indice espacial
+    def aeropuerto_en(self, sx, sy, tolerancia=8):
+        x, y = self.vista.a_mundo(sx, sy)
+        return self.indice_nodos.cercano(x, y, tolerancia / self.vista.zoom)
+
+    #acerca (o aleja) un paso de la rueda dejando fijo el punto bajo el cursor
+    def acercar(self, sx, sy, hacia_adentro):
+        factor = self.PASO_ZOOM if hacia_adentro else 1 / self.PASO_ZOOM
+        self.cambiar_vista(self.vista.acercar(sx, sy, factor, self.ZOOM_MAXIMO))
+
+    #guarda donde empezo el arrastre
+    def _empezar_arrastre(self, evento):
+        self._arrastre = (evento.x, evento.y)
+
+    #mueve el mapa lo que se movio el cursor desde el ultimo evento
+    def _arrastrar(self, evento):
+        if self._arrastre is None:
+            return
+        x, y = self._arrastre
+        self._arrastre = (evento.x, evento.y)
+        self.cambiar_vista(self.vista.mover(evento.x - x, evento.y - y))
+
+    #muestra en la etiqueta de estado el aeropuerto bajo el cursor
+    def _senalar(self, evento):
+        if not self._listo:
+            return
+        ciudad = self.aeropuerto_en(evento.x, evento.y)
+        texto = ""
+        if ciudad is not None:
+            texto = f"{ciudad}: {len(self.grafo.adyacencia.get(ciudad, ()))} vuelos de salida"
+        self.estado.config(text=texto)
+
+    #cambia la vista y programa el redibujo (varios eventos seguidos se juntan en uno solo)
+    def cambiar_vista(self, vista):
+        if not self._listo or vista.clave() == self.vista.clave():
+            return
+        self.vista = vista
+        if self._id_redibujo is None:
+            self._id_redibujo = self.win.after(self.ESPERA_REDIBUJO, self._redibujar)
+
+    #ultima capa nitida desplazada y escalada a la vista actual (lo que no cubre queda en blanco)
+    #cuesta lo mismo con cualquier red: es una transformacion afin de una imagen del tamaño del canvas
+    #(vecino mas cercano, ~1 ms; la capa nitida la reemplaza en cuanto la vista se queda quieta)
+    def _vista_previa(self):
+        anterior = self._vista_capa
+        escala = self.vista.zoom / anterior.zoom
+        #esquina de la capa anterior en pixeles de la vista actual
+        ox, oy = self.vista.a_pantalla(anterior.x, anterior.y)
+        return self._capa.transform(self.TAMANO_MAPA, Image.AFFINE,
+                                    (1 / escala, 0, -ox / escala, 0, 1 / escala, -oy / escala),
+                                    resample=Image.NEAREST, fillcolor="white")
+
+    #muestra la vista previa, mueve la ruta y el avion, y programa la capa nitida
+    def _redibujar(self):
+        self._id_redibujo = None
+        if self._capa is not None:
+            self._mostrar_fondo(self._vista_previa())
+        #la capa nitida se compone en el hilo de calculo cuando la vista deja de cambiar
+        if self._id_capa is not None:
+            self.win.after_cancel(self._id_capa)
+        self._id_capa = self.win.after(self.ESPERA_CAPA, self._pedir_capa)
+        for item, x1, y1, x2, y2 in self._resaltados:
+            self.canvas.coords(item, *self.vista.a_pantalla(x1, y1), *self.vista.a_pantalla(x2, y2))
+        #mientras vuela el motor ya lo transforma en cada cuadro; aterrizado hay que moverlo aqui
+        if self._avion_final is not None:
+            item, x, y = self._avion_final
+            sx, sy = self.vista.a_pantalla(x, y)
+            self.canvas.coords(item, sx-5, sy-5, sx+5, sy+5)
+
+    #envia la composicion de la capa de la vista actual al hilo de calculo (una a la vez)
+    def _pedir_capa(self):
+        self._id_capa = None
+        #si ya hay una en curso, al terminar se pide la de la vista que este vigente
+        if self._trabajo_capa is not None:
+            return
+        self._trabajo_capa = self.calculos.enviar(self._componer_vista, self.vista,
+                                                  al_terminar=self._capa_lista,
+                                                  al_error=self._error_capa)
+
+    #compone la capa de vista (corre en el hilo de calculo)
+    def _componer_vista(self, trabajo, vista):
+        return vista, self.componer_capa_estatica(vista)
+
+    #pone la capa nitida si la vista no cambio mientras se componia (corre en el hilo de tkinter)
+    def _capa_lista(self, resultado):
+        vista, capa = resultado
+        self._trabajo_capa = None
+        if self._cerrando:
+            return
+        self._capa, self._vista_capa = capa, vista
+        if vista.clave() == self.vista.clave():
+            self._mostrar_fondo(capa)
+            return
+        #la vista se movio: la capa nueva sirve de base para la vista previa y se pide otra
+        self._mostrar_fondo(self._vista_previa())
+        if self._id_capa is None:
+            self._pedir_capa()
+
+    #si falla la composicion se queda la vista previa y se avisa en la etiqueta de estado
+    def _error_capa(self, e):
+        self._trabajo_capa = None
+        self.estado.config(text=f"No se pudo dibujar el mapa: {e}")
 
     #devuelve el peso de la arista u->v si existe, sino None
     def obtener_peso_entre(self, u, v):
-        #si u no esta en adyacencia no hay aristas desde u
-        if u not in self.grafo.adyacencia:
-            return None
-        #buscar entre las tuplas (destino,peso)
-        for dest, peso in self.grafo.adyacencia[u]:
-            if dest == v:
-                return peso
-        #si no se encontro la arista devolver None
-        return None
+        #consulta O(1) al indice del grafo (con vuelos paralelos devuelve el de menor peso)
+        return self.grafo.peso(u, v)
 
     #reconstruye el camino desde el diccionario prev retornado por los algoritmos
     def reconstruir_camino(self, prev, origen, destino):
-        #lista que ira guardando el camino invertido
-        camino = []
-        #empezar desde el destino y seguir prev hasta None o inicio
-        cur = destino
-        #si destino no esta en prev o no fue alcanzado, el loop terminara en None
-        while cur is not None:
-            #insertar al inicio para construir camino en orden correcto
-            camino.insert(0, cur)
-            #avanzar al predecesor
-            cur = prev.get(cur, None)
-        #validar que el primer nodo del camino sea el origen esperado
-        if len(camino) == 0 or camino[0] != origen:
-            #si no coincide, devolver lista con solo el origen para indicar ausencia de camino real
-            return [origen]  # indicar "sin camino real"
-        #devolver la lista con el camino correcto
-        return camino
+        return reconstruir_camino(prev, origen, destino)
 
     #anima el avion por el camino resaltando las aristas en rojo
     def animar_camino(self, camino):
@@ -494,34 +4083,30 @@ class VentanaGrafo:
             #obtener coordenadas inicio y fin
             x1, y1 = self.posiciones[u]
             x2, y2 = self.posiciones[v]
-            #sobrescribir la arista con una linea mas gruesa y roja
-            self.canvas.create_line(x1, y1, x2, y2, arrow=tk.LAST, fill="#cc0000", width=3)
+            #sobrescribir la arista con una linea mas gruesa y roja (en coordenadas de la vista actual)
+            item = self.canvas.create_line(*self.vista.a_pantalla(x1, y1), *self.vista.a_pantalla(x2, y2),
+                                           arrow=tk.LAST, fill="#cc0000", width=3)
+            #se guardan las coordenadas del mapa para moverla al hacer zoom o arrastrar
+            self._resaltados.append((item, x1, y1, x2, y2))
+        self._id_inicio_animacion = None
+        #puntos del recorrido (las ciudades sin posicion se saltan)
+        puntos = [self.posiciones[c] for c in camino if c in self.posiciones]
+        if not puntos:
+            return
         #crear el avion como un oval azul en el primer nodo del camino
-        start = camino[0]
-        x0, y0 = self.posiciones[start]
+        x0, y0 = self.vista.a_pantalla(*puntos[0])
         avion = self.canvas.create_oval(x0-5, y0-5, x0+5, y0+5, fill="#0000cc", outline="white")
 
-        #mover el avion suavemente por cada segmento del camino
-        for i in range(len(camino)-1):
-            u, v = camino[i], camino[i+1]
-            #si faltan posiciones, saltar ese segmento
-            if u not in self.posiciones or v not in self.posiciones:
-                continue
-            #coordenadas de inicio y fin del segmento
-            x1, y1 = self.posiciones[u]
-            x2, y2 = self.posiciones[v]
-            #numero de pasos para interpolar la posicion del avion
-            pasos = 80
-            #iterar cada paso y actualizar las coordenadas del oval que representa el avion
-            for t in range(pasos + 1):
-                x = x1 + (x2 - x1) * (t / pasos)
-                y = y1 + (y2 - y1) * (t / pasos)
-                #mover el oval a la nueva posicion calculada
-                self.canvas.coords(avion, x-6, y-6, x+6, y+6)
-                #forzar actualizacion de la ventana para que se vea el movimiento
-                self.win.update()
-                #pequeña pausa para controlar la velocidad de animacion
-                time.sleep(0.015)  # velocidad de la animacion (ajustable)
+        #al aterrizar queda en el ultimo punto; desde ahi lo mueve _redibujar
+        def aterrizar():
+            self._avion_final = (avion, *puntos[-1])
+
+        #el motor mueve el avion por cada segmento con after() sin bloquear la ventana
+        #1.2 s por tramo (ajustable), la misma velocidad que tenia la animacion original
+        #los puntos van en coordenadas del mapa y se pasan a la vista vigente en cada cuadro
+        self.animaciones.agregar_vuelo(self.canvas, avion, puntos, duracion_tramo=1.2,
+                                       al_terminar=aterrizar,
+                                       transformar=lambda x, y: self.vista.a_pantalla(x, y))
 
     #metodo que se ejecuta al cerrar la ventana y compara dijkstra vs bellman-ford
     def on_close(self):
@@ -530,142 +4115,512 @@ class VentanaGrafo:
          1) grafo forzado sin pesos negativos (cada peso = max(1, peso_actual))
          2) grafo con los pesos actuales (puede contener negativos)
         mide tiempos y muestra comparación, además comprueba si los resultados coinciden.
+        La comparación corre en el hilo de cálculo; la ventana se cierra al mostrar el resultado.
         """
+        #ignorar clics repetidos en cerrar mientras se compara
+        if self._cerrando:
+            return
+        self._cerrando = True
+        #detener la animacion (y su arranque si todavia no empezaba) antes de cerrar
+        self.animaciones.detener()
+        #sin zoom ni redibujos pendientes mientras se compara
+        self._listo = False
+        if self._id_redibujo is not None:
+            self.win.after_cancel(self._id_redibujo)
+            self._id_redibujo = None
+        if self._id_capa is not None:
+            self.win.after_cancel(self._id_capa)
+            self._id_capa = None
+        #una capa que aun no empieza no hace esperar a la comparacion
+        if self._trabajo_capa is not None:
+            self._trabajo_capa.cancelar()
+        if self._id_inicio_animacion is not None:
+            self.win.after_cancel(self._id_inicio_animacion)
+            self._id_inicio_animacion = None
+        #cancelar el calculo de la ruta: si ni siquiera empezo no hay nada que comparar
+        if self._trabajo_ruta.cancelar():
+            self._destruir()
+            return
+        self.estado.config(text="Comparando algoritmos...")
+        #el hilo es uno solo: la comparacion corre despues de que termine el calculo de la ruta
+        self.calculos.enviar(self._comparar_algoritmos,
+                             al_terminar=self._mostrar_comparacion,
+                             al_error=self._error_comparacion,
+                             al_progreso=self._mostrar_progreso)
+
+    #arma el texto de la comparacion (corre en el hilo de calculo, no toca widgets)
+    def _comparar_algoritmos(self, trabajo):
+        #base: vista del grafo actual (puede contener negativos); si se modificara, el original no cambia
+        grafo_neg = self.grafo.copia_ligera()
+
+        #vista del grafo donde los pesos se fuerzan a ser al menos 1 hora, sin copiar las aristas
+        grafo_nonneg = self.grafo.con_pesos(minimo=1)
+
+        #guardar origen y destino actuales para pasar a los algoritmos
+        origen = self.origen
+        destino = self.destino
+
+        #nombre del algoritmo exacto elegido (bellman-ford o spfa) para los mensajes
+        nombre_bf = Grafo.NOMBRES_ALGORITMOS[self.algoritmo_exacto]
+
+        #funcion auxiliar que ejecuta un metodo por su nombre corto y mide su tiempo y sus contadores
+        def ejecutar_y_medir(grafo_obj, metodo_nombre):
+            estadisticas = EstadisticasRuta()
+            #elegir metodo segun nombre (sin cache para medir el algoritmo y no una consulta guardada)
+            dist, prev = grafo_obj.rutas_desde(origen, metodo_nombre, usar_cache=False, estadisticas=estadisticas)
+            #devolver dist, prev y las estadisticas (tiempo en estadisticas.segundos)
+            return dist, prev, estadisticas
+
+        #1) ejecutar ambos algoritmos en la version sin negativos
+        trabajo.reportar(0.25, "Comparando en el grafo sin pesos negativos...")
+        bf_dist_nn, bf_prev_nn, bf_est_nn = ejecutar_y_medir(grafo_nonneg, self.algoritmo_exacto)
+        dj_dist_nn, dj_prev_nn, dj_est_nn = ejecutar_y_medir(grafo_nonneg, "dijkstra")
+
+        #preparar variables para comparar resultados en la version sin negativos
+        iguales_nn = False
+        ruta_bf_nn = []
+        ruta_dj_nn = []
+        #si bellman devolvio resultados validos y dijkstra tambien
+        if bf_dist_nn is not None and bf_dist_nn != {} and dj_dist_nn != {}:
+            #reconstruir rutas usando prev
+            ruta_bf_nn = self.reconstruir_camino(bf_prev_nn, origen, destino)
+            ruta_dj_nn = self.reconstruir_camino(dj_prev_nn, origen, destino)
+            #obtener valores numericos de distancia al destino (si existen)
+            val_bf = bf_dist_nn.get(destino, float("inf"))
+            val_dj = dj_dist_nn.get(destino, float("inf"))
+            #comparar valores con tolerancia muy pequeña
+            iguales_nn = abs((val_bf if val_bf != float("inf") else float("inf")) - (val_dj if val_dj != float("inf") else float("inf"))) < 1e-9
+
+        #si el usuario ya no espera el resultado no seguir calculando
+        if trabajo.cancelado():
+            return None
+        #2) ejecutar ambos algoritmos en el grafo con pesos actuales (puede tener negativos)
+        trabajo.reportar(0.6, "Comparando en el grafo con pesos actuales...")
+        bf_dist_neg, bf_prev_neg, bf_est_neg = ejecutar_y_medir(grafo_neg, self.algoritmo_exacto)
+        dj_dist_neg, dj_prev_neg, dj_est_neg = ejecutar_y_medir(grafo_neg, "dijkstra")
+
+        #comprobar si bellman detecto ciclo negativo (en cuyo caso bf_dist_neg es None)
+        bf_neg_detected = (bf_dist_neg is None)
+
+        #inicializar variables para la comparacion en grafo con negativos
+        iguales_neg = False
+        ruta_bf_neg = []
+        ruta_dj_neg = []
+        #si bellman no detecto ciclo negativo y ambos devolvieron diccionarios
+        if not bf_neg_detected and bf_dist_neg != {} and dj_dist_neg != {}:
+            #reconstruir rutas desde prev para cada algoritmo
+            ruta_bf_neg = self.reconstruir_camino(bf_prev_neg, origen, destino)
+            ruta_dj_neg = self.reconstruir_camino(dj_prev_neg, origen, destino)
+            #obtener valores numericos de distancia al destino en ambos casos
+            val_bf_n = bf_dist_neg.get(destino, float("inf"))
+            val_dj_n = dj_dist_neg.get(destino, float("inf"))
+            #comparar si coinciden (si dijkstra no fallo)
+            iguales_neg = abs((val_bf_n if val_bf_n != float("inf") else float("inf")) - (val_dj_n if val_dj_n != float("inf") else float("inf"))) < 1e-9
+
+        #construir una lista de lineas que serviran como resumen para mostrar en un messagebox
+        msg_lines = []
+        msg_lines.append("Comparación de tiempos y resultados:")
+        msg_lines.append("")
+        msg_lines.append("GRAFO SIN PESOS NEGATIVOS (se forzaron pesos >= 1):")
+        #añadir linea con tiempo de bellman-ford en la version sin negativos
+        msg_lines.append(f"  {nombre_bf}: {bf_est_nn.segundos:.6f} s ({bf_est_nn.relajaciones} relajaciones)")
+        #añadir linea con tiempo de dijkstra en la version sin negativos
+        msg_lines.append(f"  Dijkstra:     {dj_est_nn.segundos:.6f} s ({dj_est_nn.relajaciones} relajaciones)")
+        #si bellman regreso None informar deteccion de ciclo negativo (caso inesperado aqui)
+        if bf_dist_nn is None:
+            msg_lines.append(f"  {nombre_bf}: detectó ciclo negativo (inexplicable en versión sin negativos).")
+        else:
+            #obtener distancias finales al destino para mostrarlas
+            bf_val = bf_dist_nn.get(destino, None)
+            dj_val = dj_dist_nn.get(destino, None)
+            msg_lines.append(f"  distancia ({nombre_bf}) al destino '{destino}': {bf_val}")
+            msg_lines.append(f"  distancia (Dijkstra)       al destino '{destino}': {dj_val}")
+            msg_lines.append(f"  rutas reconstruidas BF: {' → '.join(ruta_bf_nn) if ruta_bf_nn else '(no hay)'}")
+            msg_lines.append(f"  rutas reconstruidas DJ: {' → '.join(ruta_dj_nn) if ruta_dj_nn else '(no hay)'}")
+            msg_lines.append(f"  ¿Resultados iguales? {'Sí' if iguales_nn else 'No'}")
+
+
+        msg_lines.append("")
+        msg_lines.append("GRAFO CON PESOS ACTUALES (puede tener negativos):")
+        msg_lines.append("")
+        #explicacion breve y sencilla sobre por que dijkstra no es valido con negativos
+        msg_lines.append("En este caso, el grafo conserva sus pesos originales, por lo que pueden existir aristas con pesos negativos.")
+        msg_lines.append("Dijkstra no puede manejar correctamente pesos negativos, ya que asume que una vez que se encuentra")
+        msg_lines.append("la ruta más corta hacia un nodo, esta no puede mejorar. Si existen pesos negativos, podría aparecer un")
+        msg_lines.append("camino más corto después, pero Dijkstra no lo revisará nuevamente, produciendo resultados incorrectos.")
+        msg_lines.append("")
+        msg_lines.append("Bellman-Ford, en cambio, sí admite pesos negativos porque relaja todas las aristas repetidamente,")
+        msg_lines.append("ajustando las distancias aunque se descubra un camino más corto más adelante. Además, puede detectar")
+        msg_lines.append("la presencia de ciclos negativos.")
+        msg_lines.append("")
+
+        #unir las lineas con saltos para mostrarlas en un cuadro de dialogo
+        return "\n".join(msg_lines)
+
+    #muestra el resumen de la comparacion y cierra la ventana
+    def _mostrar_comparacion(self, texto):
+        try:
+            nombre_bf = Grafo.NOMBRES_ALGORITMOS[self.algoritmo_exacto]
+            #mostrar el resumen en un cuadro de dialogo (messagebox)
+            messagebox.showinfo(f"Comparación Dijkstra vs {nombre_bf}", texto)
+        finally:
+            self._destruir()
+
+    #si ocurre cualquier error durante la comparacion, mostrar mensaje de error con la excepcion
+    def _error_comparacion(self, e):
         try:
-            #base: clonar el grafo actual (puede contener negativos)
-            grafo_neg = Grafo()
-            #usar deepcopy para que no compartan referencias internas
-            grafo_neg.adyacencia = deepcopy(self.grafo.adyacencia)
-
-            #crear una version del grafo donde los pesos se fuerzan a ser no negativos
-            grafo_nonneg = Grafo()
-            grafo_nonneg.adyacencia = {}
-            #recorrer cada origen y su lista de aristas
-            for u, lista in self.grafo.adyacencia.items():
-                nueva_lista = []
-                for v, w in lista:
-                    #forzar minimo 1 hora para evitar negativos en esta copia
-                    w_nn = max(1, w)  # fuerza no negativo (al menos 1)
-                    nueva_lista.append((v, w_nn))
-                #asignar la lista modificada al grafo sin negativos
-                grafo_nonneg.adyacencia[u] = nueva_lista
-
-            #guardar origen y destino actuales para pasar a los algoritmos
-            origen = self.origen
-            destino = self.destino
-
-            #funcion auxiliar que ejecuta un metodo (bellman o dijkstra) y mide su tiempo
-            def ejecutar_y_medir(grafo_obj, metodo_nombre):
-                #marcar tiempo de inicio con alta precision
-                start = time.perf_counter()
-                #elegir metodo segun nombre
-                if metodo_nombre == "bellman":
-                    dist, prev = grafo_obj.bellman_ford_con_prev(origen)
-                else:
-                    dist, prev = grafo_obj.dijkstra_con_prev(origen)
-                #marcar tiempo de fin y calcular duracion
-                end = time.perf_counter()
-                dur = end - start
-                #devolver dist, prev y tiempo empleado
-                return dist, prev, dur
-
-            #1) ejecutar ambos algoritmos en la version sin negativos
-            bf_dist_nn, bf_prev_nn, bf_time_nn = ejecutar_y_medir(grafo_nonneg, "bellman")
-            dj_dist_nn, dj_prev_nn, dj_time_nn = ejecutar_y_medir(grafo_nonneg, "dijkstra")
-
-            #preparar variables para comparar resultados en la version sin negativos
-            iguales_nn = False
-            ruta_bf_nn = []
-            ruta_dj_nn = []
-            #si bellman devolvio resultados validos y dijkstra tambien
-            if bf_dist_nn is not None and bf_dist_nn != {} and dj_dist_nn != {}:
-                #reconstruir rutas usando prev
-                ruta_bf_nn = self.reconstruir_camino(bf_prev_nn, origen, destino)
-                ruta_dj_nn = self.reconstruir_camino(dj_prev_nn, origen, destino)
-                #obtener valores numericos de distancia al destino (si existen)
-                val_bf = bf_dist_nn.get(destino, float("inf"))
-                val_dj = dj_dist_nn.get(destino, float("inf"))
-                #comparar valores con tolerancia muy pequeña
-                iguales_nn = abs((val_bf if val_bf != float("inf") else float("inf")) - (val_dj if val_dj != float("inf") else float("inf"))) < 1e-9
-
-            #2) ejecutar ambos algoritmos en el grafo con pesos actuales (puede tener negativos)
-            bf_dist_neg, bf_prev_neg, bf_time_neg = ejecutar_y_medir(grafo_neg, "bellman")
-            dj_dist_neg, dj_prev_neg, dj_time_neg = ejecutar_y_medir(grafo_neg, "dijkstra")
-
-            #comprobar si bellman detecto ciclo negativo (en cuyo caso bf_dist_neg es None)
-            bf_neg_detected = (bf_dist_neg is None)
-
-            #inicializar variables para la comparacion en grafo con negativos
-            iguales_neg = False
-            ruta_bf_neg = []
-            ruta_dj_neg = []
-            #si bellman no detecto ciclo negativo y ambos devolvieron diccionarios
-            if not bf_neg_detected and bf_dist_neg != {} and dj_dist_neg != {}:
-                #reconstruir rutas desde prev para cada algoritmo
-                ruta_bf_neg = self.reconstruir_camino(bf_prev_neg, origen, destino)
-                ruta_dj_neg = self.reconstruir_camino(dj_prev_neg, origen, destino)
-                #obtener valores numericos de distancia al destino en ambos casos
-                val_bf_n = bf_dist_neg.get(destino, float("inf"))
-                val_dj_n = dj_dist_neg.get(destino, float("inf"))
-                #comparar si coinciden (si dijkstra no fallo)
-                iguales_neg = abs((val_bf_n if val_bf_n != float("inf") else float("inf")) - (val_dj_n if val_dj_n != float("inf") else float("inf"))) < 1e-9
-
-            #construir una lista de lineas que serviran como resumen para mostrar en un messagebox
-            msg_lines = []
-            msg_lines.append("Comparación de tiempos y resultados:")
-            msg_lines.append("")
-            msg_lines.append("GRAFO SIN PESOS NEGATIVOS (se forzaron pesos >= 1):")
-            #añadir linea con tiempo de bellman-ford en la version sin negativos
-            msg_lines.append(f"  Bellman-Ford: {bf_time_nn:.6f} s")
-            #añadir linea con tiempo de dijkstra en la version sin negativos
-            msg_lines.append(f"  Dijkstra:     {dj_time_nn:.6f} s")
-            #si bellman regreso None informar deteccion de ciclo negativo (caso inesperado aqui)
-            if bf_dist_nn is None:
-                msg_lines.append("  Bellman-Ford: detectó ciclo negativo (inexplicable en versión sin negativos).")
-            else:
-                #obtener distancias finales al destino para mostrarlas
-                bf_val = bf_dist_nn.get(destino, None)
-                dj_val = dj_dist_nn.get(destino, None)
-                msg_lines.append(f"  distancia (Bellman-Ford) al destino '{destino}': {bf_val}")
-                msg_lines.append(f"  distancia (Dijkstra)       al destino '{destino}': {dj_val}")
-                msg_lines.append(f"  rutas reconstruidas BF: {' → '.join(ruta_bf_nn) if ruta_bf_nn else '(no hay)'}")
-                msg_lines.append(f"  rutas reconstruidas DJ: {' → '.join(ruta_dj_nn) if ruta_dj_nn else '(no hay)'}")
-                msg_lines.append(f"  ¿Resultados iguales? {'Sí' if iguales_nn else 'No'}")
-
-
-            msg_lines.append("")
-            msg_lines.append("GRAFO CON PESOS ACTUALES (puede tener negativos):")
-            msg_lines.append("")
-            #explicacion breve y sencilla sobre por que dijkstra no es valido con negativos
-            msg_lines.append("En este caso, el grafo conserva sus pesos originales, por lo que pueden existir aristas con pesos negativos.")
-            msg_lines.append("Dijkstra no puede manejar correctamente pesos negativos, ya que asume que una vez que se encuentra")
-            msg_lines.append("la ruta más corta hacia un nodo, esta no puede mejorar. Si existen pesos negativos, podría aparecer un")
-            msg_lines.append("camino más corto después, pero Dijkstra no lo revisará nuevamente, produciendo resultados incorrectos.")
-            msg_lines.append("")
-            msg_lines.append("Bellman-Ford, en cambio, sí admite pesos negativos porque relaja todas las aristas repetidamente,")
-            msg_lines.append("ajustando las distancias aunque se descubra un camino más corto más adelante. Además, puede detectar")
-            msg_lines.append("la presencia de ciclos negativos.")
-            msg_lines.append("")
-
-            #mostrar el resumen en un cuadro de dialogo (messagebox) con las lineas unidas por saltos
-            messagebox.showinfo("Comparación Dijkstra vs Bellman-Ford", "\n".join(msg_lines))
-        except Exception as e:
-            #si ocurre cualquier error durante la comparacion, mostrar mensaje de error con la excepcion
             messagebox.showerror("Error en comparación", f"Ocurrió un error al comparar:\n{e}")
         finally:
-            #en cualquier caso, intentar cerrar la ventana visual del grafo
-            try:
-                self.win.destroy()
-            except:
-                #si ocurre error al destruir la ventana, se ignora para evitar bloquear la aplicacion
-                pass
+            self._destruir()
+
+    #cierra el servicio de calculo y la ventana visual del grafo
+    def _destruir(self):
+        self.calculos.cerrar()
+        try:
+            self.win.destroy()
+        except Exception:
+            #si ocurre error al destruir la ventana, se ignora para evitar bloquear la aplicacion
+            pass
 
 
-#bloque principal que arranca la aplicacion cuando se ejecute el script directamente
-if __name__ == "__main__":
+#abre la interfaz grafica (la ventana inicial con los botones de tipo de mapa)
+def iniciar_gui():
+    cargar_gui()
     #crear la ventana raiz
     root = tk.Tk()
     #crear la instancia de la ventana inicial que contiene los botones de tipo de mapa
     app = VentanaInicio(root)
     #iniciar el bucle principal de eventos de tkinter
     root.mainloop()
+    return app
+
+
+#lee pares (origen, destino) de un csv; "-" lee de la entrada estandar; ignora el encabezado
+def leer_pares(ruta):
+    f = sys.stdin if ruta == "-" else open(ruta, newline="", encoding="utf-8")
+    try:
+        for i, fila in enumerate(csv.reader(f)):
+            if len(fila) < 2 or (i == 0 and fila[:2] == ["origen", "destino"]):
+                continue
+            yield fila[0], fila[1]
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+#comando "query": responde pares origen/destino sin interfaz grafica
+def consultar(args):
+    #los .gcsr se mapean en memoria y se consultan directo sobre el csr
+    csr = grafo = None
+    if str(args.graph).endswith(".gcsr"):
+        csr = cargar_snapshot(args.graph)
+        #spfa, las busquedas de punto a punto y los contadores de --stats solo existen en Grafo:
+        #en ese caso se arma en una sola pasada sobre los buffers
+        if args.stats or args.algo not in list(GrafoCSR.ALGORITMOS) + ["johnson", "ch"]:
+            grafo = Grafo.desde_csr(csr)
+    else:
+        grafo = cargar_grafo(args.graph)
+    #coordenadas opcionales para la cota de a*
+    if args.airports and grafo is not None:
+        grafo.fijar_coordenadas((nombre, (lat, lon)) for nombre, lat, lon in leer_coordenadas_csv(args.airports))
+    tabla = None
+    if args.algo == "johnson":
+        tabla = grafo.todos_los_pares() if grafo is not None else csr.johnson()
+    #jerarquia de contraccion: la guardada con "preprocess" o una nueva sobre max(1, w)
+    jerarquia = None
+    if args.algo == "ch":
+        if args.hierarchy:
+            jerarquia = cargar_jerarquia(args.hierarchy)
+        elif grafo is not None:
+            jerarquia = grafo.jerarquia()
+        else:
+            jerarquia = JerarquiaContraccion.desde_aristas(csr.aristas())
+    #csr: (origen, dist, prev) de la ultima corrida, los pares seguidos con el mismo origen la reutilizan
+    ultimo = None
+
+    #contadores por origen en json lines (solo los origenes que no salieron del cache)
+    registro = None
+    if args.stats:
+        registro = sys.stderr if args.stats == "-" else open(args.stats, "w", encoding="utf-8")
+
+    salida = sys.stdout if args.out == "-" else open(args.out, "w", newline="", encoding="utf-8")
+    try:
+        escritor = csv.writer(salida)
+        escritor.writerow(["origen", "destino", "distancia", "ruta"])
+        for origen, destino in leer_pares(args.pairs):
+            if args.algo == "johnson":
+                #johnson: si hay ciclo negativo la tabla es None
+                if tabla is None:
+                    escritor.writerow([origen, destino, "ciclo_negativo", ""])
+                    continue
+                distancia = tabla.distancia(origen, destino)
+                camino = tabla.camino(origen, destino)
+            elif jerarquia is not None:
+                distancia, camino = jerarquia.ruta(origen, destino)
+            elif args.algo in Grafo.PUNTO_A_PUNTO:
+                #busqueda de punto a punto: se detiene al llegar al destino
+                distancia, camino = grafo.ruta_entre(origen, destino, args.algo)
+                if distancia is None:
+                    escritor.writerow([origen, destino, "ciclo_negativo", ""])
+                    continue
+            elif grafo is None:
+                if ultimo is None or ultimo[0] != origen:
+                    ultimo = (origen, *getattr(csr, GrafoCSR.ALGORITMOS[args.algo])(origen))
+                _, dist, prev = ultimo
+                if dist is None:
+                    escritor.writerow([origen, destino, "ciclo_negativo", ""])
+                    continue
+                distancia = dist.get(destino, float("inf"))
+                camino = reconstruir_camino(prev, origen, destino)
+            else:
+                #las consultas con el mismo origen reutilizan el cache del grafo
+                estadisticas = EstadisticasRuta() if registro is not None else None
+                dist, prev = grafo.rutas_desde(origen, args.algo, estadisticas=estadisticas)
+                if estadisticas is not None and not estadisticas.desde_cache:
+                    registro.write(json.dumps(estadisticas.como_dict(), ensure_ascii=False, default=str) + "\n")
+                if dist is None:
+                    escritor.writerow([origen, destino, "ciclo_negativo", ""])
+                    continue
+                distancia = dist.get(destino, float("inf"))
+                camino = reconstruir_camino(prev, origen, destino)
+            #sin camino real: distancia inf y ruta vacia
+            if origen != destino and len(camino) <= 1:
+                escritor.writerow([origen, destino, "inf", ""])
+            else:
+                escritor.writerow([origen, destino, distancia, " > ".join(map(str, camino))])
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+        if registro is not None and registro is not sys.stderr:
+            registro.close()
+
+
+#lee una lista de origenes: primera columna de un csv, sin encabezado "origen"
+def leer_origenes(ruta):
+    f = sys.stdin if ruta == "-" else open(ruta, newline="", encoding="utf-8")
+    try:
+        for i, fila in enumerate(csv.reader(f)):
+            if not fila or (i == 0 and fila[0] == "origen"):
+                continue
+            yield fila[0]
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+#comando "matrix": distancias desde muchos origenes en paralelo, una fila por destino alcanzable
+def matriz(args):
+    csr = cargar_csr(args.graph)
+    origenes = None if args.sources is None else leer_origenes(args.sources)
+    salida = sys.stdout if args.out == "-" else open(args.out, "w", newline="", encoding="utf-8")
+    try:
+        escritor = csv.writer(salida)
+        escritor.writerow(["origen", "destino", "distancia"])
+        #cada origen se escribe en cuanto llega y se descarta
+        for origen, dist, _ in rutas_multiorigen(csr, origenes, args.algo, args.procs):
+            if dist is None:
+                escritor.writerow([origen, "", "ciclo_negativo"])
+                continue
+            for destino, d in dist.items():
+                if d != float("inf"):
+                    escritor.writerow([origen, destino, d])
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+
+
+#comando "preprocess": contrae el grafo y guarda la jerarquia en disco
+def preprocesar(args):
+    minimo = int(args.min) if float(args.min).is_integer() else args.min
+    jerarquia = JerarquiaContraccion.desde_aristas(cargar_csr(args.graph).aristas(), minimo)
+    guardar_jerarquia(jerarquia, args.out)
+    print(f"{len(jerarquia.nombres)} vertices, {len(jerarquia.origenes)} aristas "
+          f"({len(jerarquia.medio_de)} atajos) -> {args.out}", file=sys.stderr)
+
+
+#comando "scenarios": distribucion del tiempo de ruta y de los caminos elegidos en k escenarios
+def escenarios(args):
+    csr = cargar_csr(args.graph)
+    #un aeropuerto desconocido termina con un mensaje y codigo 1, no con un traceback
+    for nombre in (args.origin, args.dest):
+        if nombre not in csr.indice:
+            sys.exit(f"{nombre} no esta en el grafo {args.graph}")
+    reporte = resumen_escenarios(csr, args.origin, args.dest, args.k,
+                                 (args.min_delta, args.max_delta), args.seed, args.min)
+    texto = json.dumps(reporte, indent=2, ensure_ascii=False)
+    if args.out == "-":
+        print(texto)
+    else:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(texto)
+
+
+#comando "alternatives": las k rutas sin ciclos mas cortas de cada par origen/destino
+def alternativas(args):
+    grafo = cargar_grafo(args.graph)
+    salida = sys.stdout if args.out == "-" else open(args.out, "w", newline="", encoding="utf-8")
+    try:
+        escritor = csv.writer(salida)
+        escritor.writerow(["origen", "destino", "k", "distancia", "ruta"])
+        for origen, destino in leer_pares(args.pairs):
+            #los pares con el mismo destino reutilizan el arbol de distancias hacia el destino
+            #(el grafo guarda los de los ultimos MAX_ARBOLES_DESTINO destinos)
+            rutas = grafo.k_rutas_mas_cortas(origen, destino, args.k)
+            if rutas is None:
+                escritor.writerow([origen, destino, "", "ciclo_negativo", ""])
+                continue
+            #sin ruta (o con un aeropuerto que no esta en el grafo) se escribe inf como en query,
+            #asi cada par de la entrada tiene al menos una fila
+            if not rutas:
+                escritor.writerow([origen, destino, "", "inf", ""])
+                continue
+            for numero, (distancia, camino) in enumerate(rutas, 1):
+                escritor.writerow([origen, destino, numero, distancia, " > ".join(map(str, camino))])
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+
+
+#comando "pareto": todas las rutas que no pierden a la vez en tiempo, tarifa y escalas
+def pareto(args):
+    grafo = cargar_grafo(args.graph)
+    #las tarifas salen de la columna tarifa de --fares o del mismo archivo de rutas si es csv
+    tarifas = args.fares or args.graph
+    if str(tarifas).endswith(".csv"):
+        grafo.fijar_tarifas(leer_tarifas_csv(tarifas))
+    frontera = grafo.rutas_pareto(args.origin, args.dest, args.epsilon, args.max_stops)
+    salida = sys.stdout if args.out == "-" else open(args.out, "w", newline="", encoding="utf-8")
+    try:
+        escritor = csv.writer(salida)
+        escritor.writerow(["tiempo", "tarifa", "escalas", "ruta"])
+        if frontera is None:
+            escritor.writerow(["ciclo_negativo", "", "", ""])
+            return
+        for tiempo, tarifa, escalas, camino in frontera:
+            escritor.writerow([tiempo, tarifa, escalas, " > ".join(map(str, camino))])
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+
+
+#comando "timetable": llegada mas temprana (o perfil de salidas) con horarios de vuelo
+def horario(args):
+    tabla = cargar_horario(args.schedule, args.days, args.mct)
+    salida = sys.stdout if args.out == "-" else open(args.out, "w", newline="", encoding="utf-8")
+    try:
+        escritor = csv.writer(salida)
+        if args.profile:
+            #todas las salidas que valen la pena entre --depart y --until
+            escritor.writerow(["salida", "llegada", "duracion_min"])
+            opciones = tabla.perfil(args.origin, args.dest, args.depart, args.until)
+            for hora_salida, hora_llegada in opciones:
+                escritor.writerow([formato_hora(hora_salida), formato_hora(hora_llegada),
+                                   hora_llegada - hora_salida])
+        else:
+            escritor.writerow(["vuelo", "origen", "destino", "salida", "llegada"])
+            llegada, tramos = tabla.llegada_mas_temprana(args.origin, args.dest, args.depart)
+            opciones = tramos
+            for vuelo, o, d, hora_salida, hora_llegada in tramos:
+                escritor.writerow([vuelo, o, d, formato_hora(hora_salida), formato_hora(hora_llegada)])
+        if not opciones:
+            print(f"No hay vuelos de {args.origin} a {args.dest} en el horario.", file=sys.stderr)
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+
+
+#arma el parser de la linea de comandos
+def crear_parser():
+    parser = argparse.ArgumentParser(
+        description="Simulador de rutas aéreas. Sin comando abre la interfaz gráfica.")
+    sub = parser.add_subparsers(dest="comando")
+    q = sub.add_parser("query", aliases=["consulta"],
+                       help="calcula distancias y rutas para pares origen,destino sin interfaz gráfica")
+    q.add_argument("--graph", required=True, help="archivo de rutas (.csv, .json, .jsonl o .gcsr)")
+    q.add_argument("--pairs", default="-", help="csv con columnas origen,destino (- = entrada estándar)")
+    q.add_argument("--algo", default="bellman",
+                   choices=list(Grafo.ALGORITMOS) + list(Grafo.PUNTO_A_PUNTO) + ["johnson", "ch"],
+                   help="algoritmo a usar (default: bellman); ch responde sobre los pesos max(1, w)")
+    q.add_argument("--hierarchy", default=None, help="jerarquia guardada con preprocess para --algo ch")
+    q.add_argument("--stats", default=None,
+                   help="archivo json lines con los contadores de cada origen calculado (- = error estándar)")
+    q.add_argument("--airports", default=None,
+                   help="csv con columnas nombre,lat,lon para la cota de astar (opcional)")
+    q.add_argument("--out", default="-", help="archivo csv de salida (- = salida estándar)")
+    q.set_defaults(funcion=consultar)
+    m = sub.add_parser("matrix", aliases=["matriz"],
+                       help="distancias desde muchos origenes repartidos en varios procesos")
+    m.add_argument("--graph", required=True, help="archivo de rutas (.csv, .json, .jsonl o .gcsr)")
+    m.add_argument("--sources", default=None,
+                   help="csv con una columna origen (- = entrada estándar; default: todos los vértices)")
+    m.add_argument("--algo", default="dijkstra", choices=list(GrafoCSR.ALGORITMOS),
+                   help="algoritmo a usar (default: dijkstra)")
+    m.add_argument("--procs", type=int, default=None, help="procesos a usar (default: todos los núcleos)")
+    m.add_argument("--out", default="-", help="archivo csv de salida (- = salida estándar)")
+    m.set_defaults(funcion=matriz)
+    p = sub.add_parser("preprocess", aliases=["preprocesar"],
+                       help="construye y guarda la jerarquia de contraccion para query --algo ch")
+    p.add_argument("--graph", required=True, help="archivo de rutas (.csv, .json, .jsonl o .gcsr)")
+    p.add_argument("--out", required=True, help="archivo de salida (.gch)")
+    p.add_argument("--min", type=float, default=1, help="peso mínimo de cada arista (default: 1)")
+    p.set_defaults(funcion=preprocesar)
+    e = sub.add_parser("scenarios", aliases=["escenarios"],
+                       help="simula variaciones de los tiempos y resume la ruta entre dos aeropuertos")
+    e.add_argument("--graph", required=True, help="archivo de rutas (.csv, .json, .jsonl o .gcsr)")
+    e.add_argument("--origin", required=True)
+    e.add_argument("--dest", required=True)
+    e.add_argument("-k", type=int, default=1000, help="número de escenarios (default: 1000)")
+    e.add_argument("--min-delta", type=int, default=-2, help="menor variación por vuelo en horas")
+    e.add_argument("--max-delta", type=int, default=2, help="mayor variación por vuelo en horas")
+    e.add_argument("--min", type=int, default=None, help="peso mínimo después de variar (opcional)")
+    e.add_argument("--seed", type=int, default=None, help="semilla para repetir los mismos escenarios")
+    e.add_argument("--out", default="-", help="archivo json de salida (- = salida estándar)")
+    e.set_defaults(funcion=escenarios)
+    r = sub.add_parser("alternatives", aliases=["alternativas"],
+                       help="las k rutas más cortas sin ciclos para cada par origen,destino")
+    r.add_argument("--graph", required=True, help="archivo de rutas (.csv, .json o .jsonl)")
+    r.add_argument("--pairs", default="-", help="csv con columnas origen,destino (- = entrada estándar)")
+    r.add_argument("-k", type=int, default=3, help="rutas por par (default: 3)")
+    r.add_argument("--out", default="-", help="archivo csv de salida (- = salida estándar)")
+    r.set_defaults(funcion=alternativas)
+    f = sub.add_parser("pareto", aliases=["frontera"],
+                       help="rutas que no pierden a la vez en tiempo, tarifa y número de escalas")
+    f.add_argument("--graph", required=True, help="archivo de rutas (.csv, .json o .jsonl)")
+    f.add_argument("--fares", default=None,
+                   help="csv con columnas origen,destino,tarifa (default: la columna tarifa de --graph)")
+    f.add_argument("--origin", required=True)
+    f.add_argument("--dest", required=True)
+    f.add_argument("--epsilon", type=float, default=0,
+                   help="tolerancia relativa para descartar rutas casi iguales (default: 0, frontera exacta)")
+    f.add_argument("--max-stops", type=int, default=None, help="máximo de escalas (opcional)")
+    f.add_argument("--out", default="-", help="archivo csv de salida (- = salida estándar)")
+    f.set_defaults(funcion=pareto)
+    h = sub.add_parser("timetable", aliases=["horario"],
+                       help="llegada más temprana con horarios de vuelo y tiempos mínimos de conexión")
+    h.add_argument("--schedule", required=True,
+                   help="csv con columnas vuelo,origen,destino,salida,llegada (horas HH:MM)")
+    h.add_argument("--origin", required=True)
+    h.add_argument("--dest", required=True)
+    h.add_argument("--depart", default="00:00", help="hora desde la que se puede salir (default: 00:00)")
+    h.add_argument("--profile", action="store_true",
+                   help="lista todas las salidas útiles y su llegada en lugar de un solo itinerario")
+    h.add_argument("--until", default=None, help="última hora de salida para --profile (opcional)")
+    h.add_argument("--mct", type=int, default=45, help="minutos mínimos para cambiar de avión (default: 45)")
+    h.add_argument("--days", type=int, default=7, help="días que se repite el horario diario (default: 7)")
+    h.add_argument("--out", default="-", help="archivo csv de salida (- = salida estándar)")
+    h.set_defaults(funcion=horario)
+    return parser
+
+
+#punto de entrada: sin comando abre la interfaz grafica, con comando trabaja en consola
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    if args.comando is None:
+        iniciar_gui()
+    else:
+        args.funcion(args)
+
+
+#bloque principal que arranca la aplicacion cuando se ejecute el script directamente
+if __name__ == "__main__":
+    main()
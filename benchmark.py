@@ -0,0 +1,218 @@
+#banco de pruebas reproducible para comparar los motores de caminos minimos de aeropuerto.py
+#ejemplo: python benchmark.py --tamanos 10 1000 100000 --salida resultados.json
+#esta linea importa argparse para leer las opciones de la linea de comandos
+import argparse
+#esta linea importa json para escribir los resultados en un formato que lean otras herramientas
+import json
+#esta linea importa math para las distancias de los grafos geometricos
+import math
+#esta linea importa platform para guardar con que maquina se midio
+import platform
+#esta linea importa random para generar grafos con semilla fija
+import random
+#esta linea importa statistics para la mediana de los tiempos
+import statistics
+#esta linea importa sys para la version de python
+import sys
+#esta linea importa time para medir con perf_counter
+import time
+#esta linea importa tracemalloc para medir el pico de memoria
+import tracemalloc
+
+#esta linea trae el grafo y los motores del simulador (no importa la interfaz grafica)
+import aeropuerto
+from aeropuerto import Grafo, GrafoCSR, percentil
+
+
+#genera una red de hubs conectados entre si y aeropuertos pequeños colgados de 1 o 2 hubs
+def red_hubs(aristas_objetivo, rng):
+    #cada aeropuerto pequeño aporta ~3 aristas de ida y vuelta, los hubs forman un grafo completo
+    hubs = max(2, int(math.sqrt(aristas_objetivo) / 4))
+    pequenos = max(1, (aristas_objetivo - hubs * (hubs - 1)) // 3)
+    aristas = []
+    for i in range(hubs):
+        for j in range(hubs):
+            if i != j:
+                aristas.append((f"H{i}", f"H{j}", rng.randint(2, 12)))
+    for k in range(pequenos):
+        #cada aeropuerto pequeño sale a un hub y regresa de otro (o del mismo)
+        h1, h2 = rng.randrange(hubs), rng.randrange(hubs)
+        aristas.append((f"A{k}", f"H{h1}", rng.randint(1, 4)))
+        aristas.append((f"H{h1}", f"A{k}", rng.randint(1, 4)))
+        aristas.append((f"H{h2}", f"A{k}", rng.randint(1, 4)))
+    return aristas
+
+
+#genera puntos al azar en el cuadrado unitario y une los que estan a menos de un radio
+def red_geometrica(aristas_objetivo, rng):
+    #con grado promedio ~8 hacen falta aristas/8 vertices
+    n = max(2, aristas_objetivo // 8)
+    puntos = [(rng.random(), rng.random()) for _ in range(n)]
+    #radio tal que el numero esperado de vecinos sea ~8: n * pi * r^2 = 8
+    radio = math.sqrt(8 / (math.pi * n))
+    #rejilla de celdas del tamaño del radio para no comparar todos contra todos
+    celdas = {}
+    for i, (x, y) in enumerate(puntos):
+        celdas.setdefault((int(x / radio), int(y / radio)), []).append(i)
+    aristas = []
+    for i, (x, y) in enumerate(puntos):
+        cx, cy = int(x / radio), int(y / radio)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for j in celdas.get((cx + dx, cy + dy), ()):
+                    if j == i:
+                        continue
+                    d = math.hypot(puntos[j][0] - x, puntos[j][1] - y)
+                    if d <= radio:
+                        #peso en horas proporcional a la distancia, al menos 1
+                        aristas.append((f"P{i}", f"P{j}", 1 + int(12 * d / radio)))
+    return aristas
+
+
+#genera una rejilla con aristas en ambos sentidos entre vecinos
+def red_rejilla(aristas_objetivo, rng):
+    #una rejilla de l x l tiene ~4*l*l aristas dirigidas
+    lado = max(2, int(math.sqrt(aristas_objetivo / 4)))
+    aristas = []
+    for i in range(lado):
+        for j in range(lado):
+            for di, dj in ((0, 1), (1, 0), (0, -1), (-1, 0)):
+                a, b = i + di, j + dj
+                if 0 <= a < lado and 0 <= b < lado:
+                    aristas.append((f"{i},{j}", f"{a},{b}", rng.randint(1, 9)))
+    return aristas
+
+
+#familias de grafos sinteticos disponibles
+FAMILIAS = {
+    "hubs": red_hubs,
+    "geometrica": red_geometrica,
+    "rejilla": red_rejilla,
+}
+
+
+#construye un Grafo de listas de adyacencia a partir de las aristas
+def a_grafo(aristas):
+    grafo = Grafo()
+    for o, d, w in aristas:
+        grafo.agregar_arista(o, d, w)
+    return grafo
+
+
+#motores a comparar: nombre -> (representacion, funcion(grafo, origen), maximo de aristas)
+#el maximo evita corridas de horas: bellman-ford en python puro es O(V*E)
+MOTORES = {
+    "grafo.bellman": ("grafo", lambda g, o: g.bellman_ford_con_prev(o), 10 ** 5),
+    "grafo.spfa": ("grafo", lambda g, o: g.spfa_con_prev(o), 10 ** 6),
+    "grafo.dijkstra": ("grafo", lambda g, o: g.dijkstra_con_prev(o), 10 ** 6),
+    "grafo.dijkstra.heap": ("grafo", lambda g, o: g.dijkstra_con_prev(o, "heap"), 10 ** 6),
+    "grafo.dijkstra.indexado": ("grafo", lambda g, o: g.dijkstra_con_prev(o, "indexado"), 10 ** 6),
+    "csr.bellman": ("csr", lambda g, o: g.bellman_ford_con_prev(o), 10 ** 5),
+    "csr.vectorizado": ("csr", lambda g, o: g.bellman_ford_vectorizado(o), 10 ** 6),
+    "csr.dijkstra": ("csr", lambda g, o: g.dijkstra_con_prev(o), 10 ** 6),
+    "csr.johnson": ("csr", lambda g, o: g.johnson(), 10 ** 3),
+}
+
+
+#mide un motor: calentamiento, repeticiones cronometradas y una corrida aparte para la memoria
+def medir(funcion, grafo, origen, repeticiones, calentamiento):
+    for _ in range(calentamiento):
+        funcion(grafo, origen)
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(grafo, origen)
+        tiempos.append(time.perf_counter() - inicio)
+    #tracemalloc hace lenta la ejecucion, por eso la memoria se mide en una corrida separada
+    tracemalloc.start()
+    funcion(grafo, origen)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "mediana_s": statistics.median(tiempos),
+        "p95_s": percentil(sorted(tiempos), 95),
+        "min_s": min(tiempos),
+        "pico_memoria_bytes": pico,
+        "repeticiones": repeticiones,
+    }
+
+
+#ejecuta todas las combinaciones familia x tamaño x motor y devuelve el reporte
+def ejecutar(familias, tamanos, motores, repeticiones, calentamiento, semilla, progreso=None):
+    resultados = []
+    for familia in familias:
+        for tamano in tamanos:
+            #la misma semilla por (familia, tamaño) hace que el grafo sea identico entre versiones
+            rng = random.Random(f"{semilla}-{familia}-{tamano}")
+            aristas = FAMILIAS[familia](tamano, rng)
+            representaciones = {"grafo": a_grafo(aristas), "csr": GrafoCSR.desde_aristas(aristas)}
+            vertices = representaciones["csr"].nombres
+            origen = vertices[rng.randrange(len(vertices))]
+            for nombre in motores:
+                tipo, funcion, maximo = MOTORES[nombre]
+                fila = {
+                    "familia": familia,
+                    "tamano_objetivo": tamano,
+                    "vertices": len(vertices),
+                    "aristas": len(aristas),
+                    "motor": nombre,
+                    "origen": origen,
+                }
+                if len(aristas) > maximo:
+                    fila["omitido"] = f"mas de {maximo} aristas"
+                else:
+                    fila.update(medir(funcion, representaciones[tipo], origen, repeticiones, calentamiento))
+                resultados.append(fila)
+                if progreso is not None:
+                    progreso(fila)
+    return {
+        "meta": {
+            "semilla": semilla,
+            "python": sys.version.split()[0],
+            "numpy": getattr(aeropuerto.cargar_numpy(), "__version__", None),
+            "plataforma": platform.platform(),
+            "procesador": platform.processor(),
+            "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeticiones": repeticiones,
+            "calentamiento": calentamiento,
+        },
+        "resultados": resultados,
+    }
+
+
+#arma el parser de la linea de comandos
+def crear_parser():
+    parser = argparse.ArgumentParser(description="Banco de pruebas de Bellman-Ford, SPFA y Dijkstra.")
+    parser.add_argument("--familias", nargs="+", default=list(FAMILIAS), choices=list(FAMILIAS))
+    parser.add_argument("--tamanos", nargs="+", type=int, default=[10, 100, 1000, 10 ** 4, 10 ** 5, 10 ** 6],
+                        help="numero aproximado de aristas de cada grafo")
+    parser.add_argument("--motores", nargs="+", default=list(MOTORES), choices=list(MOTORES))
+    parser.add_argument("--repeticiones", type=int, default=7)
+    parser.add_argument("--calentamiento", type=int, default=1)
+    parser.add_argument("--semilla", type=int, default=2024)
+    parser.add_argument("--salida", default="-", help="archivo json de salida (- = salida estandar)")
+    return parser
+
+
+#punto de entrada del banco de pruebas
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+
+    #avance legible en stderr para no mezclarlo con el json
+    def progreso(fila):
+        estado = fila.get("omitido") or f"mediana {fila['mediana_s']:.6f} s"
+        print(f"{fila['familia']:>10} {fila['aristas']:>8} aristas  {fila['motor']:<16} {estado}", file=sys.stderr)
+
+    reporte = ejecutar(args.familias, args.tamanos, args.motores, args.repeticiones,
+                       args.calentamiento, args.semilla, progreso)
+    texto = json.dumps(reporte, indent=2, ensure_ascii=False)
+    if args.salida == "-":
+        print(texto)
+    else:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            f.write(texto)
+
+
+#bloque principal
+if __name__ == "__main__":
+    main()
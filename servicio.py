@@ -0,0 +1,457 @@
+#servicio local de consultas de rutas: http con json sobre asyncio, sin dependencias externas
+#ejemplo: python servicio.py servir --grafo datos/nacional_rutas.csv --puerto 8080
+#         python servicio.py carga --grafo datos/nacional_rutas.csv --concurrencia 64 --total 5000
+#consultas: GET /ruta?origen=Tijuana&destino=Cancún (o POST /ruta con {"origen": ..., "destino": ...})
+#contadores: GET /estadisticas
+#esta linea importa argparse para leer las opciones de la linea de comandos
+import argparse
+#esta linea importa asyncio para atender muchas conexiones en un solo hilo
+import asyncio
+#esta linea importa json para las consultas y las respuestas
+import json
+#esta linea importa random para los pares de la prueba de carga
+import random
+#esta linea importa sys para escribir avisos en stderr
+import sys
+#esta linea importa time para medir latencias con perf_counter
+import time
+#estas lineas importan el cache lru y la ventana de latencias recientes
+from collections import OrderedDict, deque
+#estas lineas importan las utilidades para leer y armar urls
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+#esta linea trae el grafo y el pool de procesos del simulador (no importa la interfaz grafica)
+import aeropuerto
+from aeropuerto import GrafoCSR, PoolRutas, cargar_csr, leer_pares, percentil, reconstruir_camino
+
+
+#textos de los codigos http que usa el servicio
+MOTIVOS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           500: "Internal Server Error"}
+
+
+#resumen en milisegundos de una lista de latencias en segundos
+def resumen_latencias(latencias):
+    ordenadas = sorted(latencias)
+    if not ordenadas:
+        return {}
+    return {
+        "p50": round(percentil(ordenadas, 50) * 1000, 3),
+        "p95": round(percentil(ordenadas, 95) * 1000, 3),
+        "p99": round(percentil(ordenadas, 99) * 1000, 3),
+        "max": round(ordenadas[-1] * 1000, 3),
+    }
+
+
+#contadores de latencia y rendimiento del servicio (se leen con GET /estadisticas)
+class Contadores:
+    #constructor; muestras limita cuantas latencias recientes se guardan
+    def __init__(self, muestras=10000):
+        self.inicio = time.perf_counter()
+        #consultas de ruta recibidas, respondidas y con error
+        self.solicitudes = 0
+        self.respuestas = 0
+        self.errores = 0
+        #origenes calculados por el pool, en cuantos lotes, y consultas que no hicieron calcular nada
+        self.corridas = 0
+        self.lotes = 0
+        self.coalescidas = 0
+        self.aciertos_cache = 0
+        #latencias (segundos) y momentos de las ultimas respuestas
+        self.latencias = deque(maxlen=muestras)
+        self.momentos = deque(maxlen=muestras)
+
+    #anota una respuesta de /ruta con su latencia
+    def registrar(self, segundos, error=False):
+        self.respuestas += 1
+        if error:
+            self.errores += 1
+        self.latencias.append(segundos)
+        self.momentos.append(time.perf_counter())
+
+    #contadores como diccionario listo para json
+    def como_dict(self):
+        ahora = time.perf_counter()
+        activo = ahora - self.inicio
+        #rendimiento de los ultimos 10 segundos (o desde que arranco, si es menos)
+        ventana = min(10.0, activo) or 1.0
+        recientes = sum(1 for t in self.momentos if ahora - t <= ventana)
+        return {
+            "segundos_activo": round(activo, 3),
+            "solicitudes": self.solicitudes,
+            "respuestas": self.respuestas,
+            "errores": self.errores,
+            "corridas": self.corridas,
+            "lotes": self.lotes,
+            "origenes_por_lote": round(self.corridas / self.lotes, 2) if self.lotes else 0,
+            "coalescidas": self.coalescidas,
+            "aciertos_cache": self.aciertos_cache,
+            "por_segundo": round(self.respuestas / activo, 2) if activo else 0,
+            "por_segundo_reciente": round(recientes / ventana, 2),
+            "latencia_ms": resumen_latencias(self.latencias),
+        }
+
+
+#servicio de rutas sobre un GrafoCSR compartido con un pool de procesos
+class ServicioRutas:
+    """
+    Las consultas que piden un origen que ya se esta calculando esperan esa misma corrida
+    (coalescencia). Los origenes distintos que llegan dentro de ventana_ms se juntan en un
+    lote de hasta lote_maximo y van juntos a un trabajador del pool. Las ultimas
+    cache_maximo corridas (dist, prev) se guardan por origen.
+    """
+    #constructor que recibe un Grafo o GrafoCSR y las opciones del pool
+    def __init__(self, grafo, algoritmo="dijkstra", procesos=None, ventana_ms=2.0, lote_maximo=32,
+                 cache_maximo=64):
+        if algoritmo not in GrafoCSR.ALGORITMOS:
+            raise ValueError(f"algoritmo desconocido: {algoritmo}")
+        self.csr = grafo.a_csr() if isinstance(grafo, aeropuerto.Grafo) else grafo
+        self.algoritmo = algoritmo
+        self.procesos = procesos
+        self.ventana = ventana_ms / 1000
+        self.lote_maximo = lote_maximo
+        self.cache_maximo = cache_maximo
+        self.pool = None
+        #cache lru origen -> (dist, prev)
+        self.cache = OrderedDict()
+        #origen -> future de asyncio de la corrida en curso
+        self.en_curso = {}
+        #origenes esperando a que se despache el lote y el temporizador de la ventana
+        self._lote = []
+        self._temporizador = None
+        self.contadores = Contadores()
+
+    #arranca el pool (copia el grafo a memoria compartida una sola vez)
+    def iniciar(self):
+        if self.pool is None:
+            self.pool = PoolRutas(self.csr, self.procesos)
+
+    #cierra el pool sin bloquear el bucle de eventos
+    async def cerrar(self):
+        if self._temporizador is not None:
+            self._temporizador.cancel()
+            self._temporizador = None
+        if self.pool is not None:
+            pool, self.pool = self.pool, None
+            await asyncio.get_running_loop().run_in_executor(None, pool.cerrar)
+
+    #(dist, prev) desde origen: del cache, de una corrida en curso o de un lote nuevo
+    async def rutas(self, origen):
+        guardado = self.cache.get(origen)
+        if guardado is not None:
+            self.cache.move_to_end(origen)
+            self.contadores.aciertos_cache += 1
+            return guardado
+        futuro = self.en_curso.get(origen)
+        if futuro is not None:
+            self.contadores.coalescidas += 1
+        else:
+            futuro = self.en_curso[origen] = asyncio.get_running_loop().create_future()
+            self._lote.append(origen)
+            if len(self._lote) >= self.lote_maximo:
+                self._despachar()
+            elif self._temporizador is None:
+                self._temporizador = asyncio.get_running_loop().call_later(self.ventana, self._despachar)
+        #shield: si un cliente se desconecta no se cancela la corrida que comparten los demas
+        return await asyncio.shield(futuro)
+
+    #manda los origenes acumulados como un solo lote al pool
+    def _despachar(self):
+        if self._temporizador is not None:
+            self._temporizador.cancel()
+            self._temporizador = None
+        lote, self._lote = self._lote, []
+        if not lote:
+            return
+        self.contadores.lotes += 1
+        self.contadores.corridas += len(lote)
+        futuro = asyncio.wrap_future(self.pool.enviar(lote, self.algoritmo))
+        futuro.add_done_callback(lambda f: self._entregar(lote, f))
+
+    #reparte el resultado del lote entre las consultas que lo esperan
+    def _entregar(self, lote, futuro):
+        error = asyncio.CancelledError() if futuro.cancelled() else futuro.exception()
+        if error is not None:
+            for origen in lote:
+                esperando = self.en_curso.pop(origen, None)
+                if esperando is not None and not esperando.done():
+                    esperando.set_exception(error)
+            return
+        for origen, dist, prev in futuro.result():
+            if self.cache_maximo > 0:
+                self.cache[origen] = (dist, prev)
+                if len(self.cache) > self.cache_maximo:
+                    self.cache.popitem(last=False)
+            esperando = self.en_curso.pop(origen, None)
+            if esperando is not None and not esperando.done():
+                esperando.set_result((dist, prev))
+
+    #responde una consulta origen/destino como diccionario (KeyError si el aeropuerto no existe)
+    async def consultar(self, origen, destino):
+        for nombre in (origen, destino):
+            if nombre not in self.csr.indice:
+                raise KeyError(nombre)
+        dist, prev = await self.rutas(origen)
+        respuesta = {"origen": origen, "destino": destino, "distancia": None, "ruta": []}
+        if dist is None:
+            respuesta["ciclo_negativo"] = True
+        elif dist.get(destino, float("inf")) != float("inf"):
+            respuesta["distancia"] = dist[destino]
+            respuesta["ruta"] = reconstruir_camino(prev, origen, destino)
+        return respuesta
+
+    #despacha una peticion http ya leida y devuelve (estado, datos)
+    async def _responder(self, metodo, objetivo, cuerpo):
+        partes = urlsplit(objetivo)
+        if partes.path == "/ruta":
+            if metodo == "GET":
+                consulta = {k: v[-1] for k, v in parse_qs(partes.query).items()}
+            elif metodo == "POST":
+                try:
+                    consulta = json.loads(cuerpo or b"{}")
+                except ValueError:
+                    return 400, {"error": "el cuerpo no es json"}
+                if not isinstance(consulta, dict):
+                    return 400, {"error": "se esperaba un objeto json"}
+            else:
+                return 405, {"error": "use GET o POST"}
+            origen, destino = consulta.get("origen"), consulta.get("destino")
+            if not origen or not destino:
+                return 400, {"error": "faltan origen y destino"}
+            try:
+                return 200, await self.consultar(origen, destino)
+            except KeyError as e:
+                return 404, {"error": f"aeropuerto desconocido: {e.args[0]}"}
+        if partes.path == "/estadisticas":
+            return 200, self.contadores.como_dict()
+        if partes.path == "/salud":
+            return 200, {"estado": "ok", "vertices": self.csr.num_vertices(), "aristas": self.csr.num_aristas(),
+                         "algoritmo": self.algoritmo}
+        return 404, {"error": f"no existe {partes.path}"}
+
+    #escribe una respuesta json con su estado
+    @staticmethod
+    async def _escribir(escritor, estado, datos, cerrar):
+        datos = json.dumps(datos, ensure_ascii=False).encode("utf-8")
+        escritor.write(
+            f"HTTP/1.1 {estado} {MOTIVOS[estado]}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(datos)}\r\n"
+            f"Connection: {'close' if cerrar else 'keep-alive'}\r\n\r\n".encode("latin-1") + datos)
+        await escritor.drain()
+
+    #atiende una conexion: varias peticiones http/1.1 seguidas (keep-alive)
+    async def atender(self, lector, escritor):
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                try:
+                    metodo, objetivo, version = linea.decode("latin-1").split()
+                except ValueError:
+                    break
+                cabeceras = {}
+                while True:
+                    cabecera = await lector.readline()
+                    if cabecera in (b"\r\n", b"\n", b""):
+                        break
+                    nombre, _, valor = cabecera.decode("latin-1").partition(":")
+                    cabeceras[nombre.strip().lower()] = valor.strip()
+                #un content-length invalido deja el flujo desalineado: responder 400 y cerrar
+                largo = cabeceras.get("content-length") or "0"
+                if not (largo.isascii() and largo.isdigit()):
+                    await self._escribir(escritor, 400, {"error": f"content-length invalido: {largo}"}, True)
+                    break
+                cuerpo = await lector.readexactly(int(largo))
+                es_ruta = objetivo.startswith("/ruta")
+                if es_ruta:
+                    self.contadores.solicitudes += 1
+                inicio = time.perf_counter()
+                try:
+                    estado, datos = await self._responder(metodo, objetivo, cuerpo)
+                except Exception as e:
+                    estado, datos = 500, {"error": str(e)}
+                if es_ruta:
+                    self.contadores.registrar(time.perf_counter() - inicio, estado >= 400)
+                cerrar = cabeceras.get("connection", "").lower() == "close" or version == "HTTP/1.0"
+                await self._escribir(escritor, estado, datos, cerrar)
+                if cerrar:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+
+    #arranca el pool y empieza a escuchar; devuelve el servidor de asyncio
+    async def abrir(self, host="127.0.0.1", puerto=8080):
+        self.iniciar()
+        return await asyncio.start_server(self.atender, host, puerto)
+
+
+#lee una respuesta http: (estado, datos json)
+async def _leer_respuesta(lector):
+    estado = int((await lector.readline()).split()[1])
+    largo = 0
+    while True:
+        cabecera = await lector.readline()
+        if cabecera in (b"\r\n", b"\n", b""):
+            break
+        nombre, _, valor = cabecera.decode("latin-1").partition(":")
+        if nombre.strip().lower() == "content-length":
+            largo = int(valor)
+    return estado, json.loads(await lector.readexactly(largo))
+
+
+#una sola peticion GET con conexion nueva (para /estadisticas y /salud)
+async def pedir(host, puerto, ruta):
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    try:
+        escritor.write(f"GET {ruta} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode("utf-8"))
+        await escritor.drain()
+        return await _leer_respuesta(lector)
+    finally:
+        escritor.close()
+
+
+#un cliente de la prueba de carga: manda sus consultas una tras otra por la misma conexion
+async def _cliente(host, puerto, consultas, latencias, errores):
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    try:
+        for origen, destino in consultas:
+            inicio = time.perf_counter()
+            escritor.write(f"GET /ruta?{urlencode({'origen': origen, 'destino': destino})} HTTP/1.1\r\n"
+                           f"Host: {host}\r\n\r\n".encode("utf-8"))
+            await escritor.drain()
+            estado, _ = await _leer_respuesta(lector)
+            latencias.append(time.perf_counter() - inicio)
+            if estado != 200:
+                errores.append(estado)
+    finally:
+        escritor.close()
+
+
+#prueba de carga: total consultas al azar entre pares, repartidas en concurrencia conexiones
+async def carga(host, puerto, pares, concurrencia=32, total=2000, semilla=2024):
+    rng = random.Random(semilla)
+    consultas = [rng.choice(pares) for _ in range(total)]
+    latencias = []
+    errores = []
+    inicio = time.perf_counter()
+    await asyncio.gather(*(_cliente(host, puerto, consultas[i::concurrencia], latencias, errores)
+                           for i in range(min(concurrencia, total))))
+    segundos = time.perf_counter() - inicio
+    _, servidor = await pedir(host, puerto, "/estadisticas")
+    return {
+        "consultas": total,
+        "concurrencia": concurrencia,
+        "segundos": round(segundos, 3),
+        "por_segundo": round(total / segundos, 2) if segundos else 0,
+        "errores": len(errores),
+        "latencia_ms": resumen_latencias(latencias),
+        "servidor": servidor,
+    }
+
+
+#crea el servicio con las opciones de la linea de comandos
+def _crear_servicio(args):
+    return ServicioRutas(cargar_csr(args.grafo), args.algoritmo, args.procesos, args.ventana_ms,
+                         args.lote, args.cache)
+
+
+#comando "servir": escucha hasta que se interrumpe con ctrl+c
+async def _servir(args):
+    servicio = _crear_servicio(args)
+    servidor = await servicio.abrir(args.host, args.puerto)
+    print(f"escuchando en http://{args.host}:{args.puerto} ({servicio.csr.num_vertices()} vertices)",
+          file=sys.stderr)
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        await servicio.cerrar()
+
+
+#comando "carga": contra un servicio ya corriendo (--url) o uno propio en un puerto libre (--grafo)
+async def _probar(args):
+    servicio = servidor = None
+    if args.url:
+        host, _, puerto = args.url.removeprefix("http://").partition(":")
+        puerto = int(puerto or 80)
+    else:
+        servicio = _crear_servicio(args)
+        servidor = await servicio.abrir("127.0.0.1", 0)
+        host, puerto = servidor.sockets[0].getsockname()[:2]
+    try:
+        if args.pares:
+            pares = list(leer_pares(args.pares))
+        elif servicio is not None:
+            #sin archivo de pares: pares al azar entre todos los aeropuertos
+            rng = random.Random(args.semilla)
+            nombres = servicio.csr.nombres
+            pares = [(rng.choice(nombres), rng.choice(nombres)) for _ in range(max(1, args.total))]
+        else:
+            raise SystemExit("con --url hace falta --pares")
+        return await carga(host, puerto, pares, args.concurrencia, args.total, args.semilla)
+    finally:
+        if servidor is not None:
+            servidor.close()
+            await servidor.wait_closed()
+            await servicio.cerrar()
+
+
+#opciones del servicio compartidas por los dos comandos
+def _opciones_servicio(parser):
+    parser.add_argument("--algoritmo", default="dijkstra", choices=list(GrafoCSR.ALGORITMOS))
+    parser.add_argument("--procesos", type=int, default=None,
+                        help="procesos del pool (default: todos los núcleos; 0 = un hilo en este proceso)")
+    parser.add_argument("--ventana-ms", type=float, default=2.0,
+                        help="espera máxima para juntar orígenes distintos en un lote")
+    parser.add_argument("--lote", type=int, default=32, help="máximo de orígenes por lote")
+    parser.add_argument("--cache", type=int, default=64, help="corridas guardadas por origen (0 = sin cache)")
+
+
+#arma el parser de la linea de comandos
+def crear_parser():
+    parser = argparse.ArgumentParser(description="Servicio local de rutas (HTTP + JSON) y su prueba de carga.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    s = sub.add_parser("servir", help="atiende consultas de rutas en localhost")
+    s.add_argument("--grafo", required=True, help="archivo de rutas (.csv, .json, .jsonl o .gcsr)")
+    s.add_argument("--host", default="127.0.0.1")
+    s.add_argument("--puerto", type=int, default=8080)
+    _opciones_servicio(s)
+    c = sub.add_parser("carga", help="manda consultas concurrentes y reporta latencias y rendimiento")
+    c.add_argument("--url", default=None, help="host:puerto de un servicio ya corriendo")
+    c.add_argument("--grafo", default=None, help="sin --url: levanta un servicio propio con este archivo")
+    c.add_argument("--pares", default=None, help="csv con columnas origen,destino (default: pares al azar)")
+    c.add_argument("--concurrencia", type=int, default=32, help="conexiones abiertas a la vez")
+    c.add_argument("--total", type=int, default=2000, help="consultas en total")
+    c.add_argument("--semilla", type=int, default=2024)
+    c.add_argument("--salida", default="-", help="archivo json de salida (- = salida estándar)")
+    _opciones_servicio(c)
+    return parser
+
+
+#punto de entrada del servicio
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    if args.comando == "servir":
+        try:
+            asyncio.run(_servir(args))
+        except KeyboardInterrupt:
+            pass
+        return
+    if not args.url and not args.grafo:
+        raise SystemExit("indique --url o --grafo")
+    reporte = asyncio.run(_probar(args))
+    texto = json.dumps(reporte, indent=2, ensure_ascii=False)
+    if args.salida == "-":
+        print(texto)
+    else:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            f.write(texto)
+
+
+#bloque principal
+if __name__ == "__main__":
+    main()
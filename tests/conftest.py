@@ -0,0 +1,48 @@
+#configuracion comun de las pruebas: aeropuerto.py se importa desde la raiz del repositorio
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aeropuerto
+
+
+#fabrica de grafos aleatorios chicos con vertices v0..v(n-1); con bajo < 0 puede haber ciclos negativos
+@pytest.fixture
+def grafo_aleatorio():
+    def fabricar(semilla, n=12, m=40, bajo=-3, alto=15):
+        r = random.Random(semilla)
+        grafo = aeropuerto.Grafo()
+        for _ in range(m):
+            grafo.agregar_arista(f"v{r.randrange(n)}", f"v{r.randrange(n)}", r.randint(bajo, alto))
+        return grafo
+    return fabricar
+
+
+#revisa que prev sea un arbol de caminos minimos para dist: cada vertice alcanzado llega
+#desde su predecesor por una arista que da exactamente su distancia
+@pytest.fixture
+def comprobar_arbol():
+    def comprobar(grafo, inicio, dist, prev):
+        for v, d in dist.items():
+            if v == inicio or d == float("inf"):
+                continue
+            p = prev[v]
+            assert p is not None
+            assert dist[p] + grafo.peso(p, v) == d
+    return comprobar
+
+
+#corre cada prueba con numpy y sin numpy (cargar_numpy devuelve None si ya se reviso y np es None)
+@pytest.fixture(params=["numpy", "python"])
+def motor(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+        assert aeropuerto.cargar_numpy() is not None
+    else:
+        monkeypatch.setattr(aeropuerto, "np", None)
+        monkeypatch.setattr(aeropuerto, "_numpy_revisado", True)
+    return request.param
@@ -0,0 +1,71 @@
+#pruebas de las k rutas mas cortas sin ciclos (yen) contra todos los caminos simples
+import csv
+
+import pytest
+
+import aeropuerto
+
+
+#costos de todos los caminos simples (secuencias de aeropuertos, cada tramo con su vuelo mas corto)
+def _costos_simples(grafo, origen, destino):
+    costos = []
+    pila = [(origen, 0, [origen])]
+    while pila:
+        u, costo, camino = pila.pop()
+        if u == destino:
+            costos.append(costo)
+            continue
+        for v in {v for v, _ in grafo.adyacencia.get(u, ())}:
+            if v not in camino:
+                pila.append((v, costo + grafo.peso(u, v), camino + [v]))
+    return sorted(costos)
+
+
+@pytest.mark.parametrize("semilla", range(40))
+def test_k_rutas_igual_que_fuerza_bruta(grafo_aleatorio, semilla):
+    #pesos desde -1 para cubrir tambien el arbol hacia el destino con bellman-ford
+    grafo = grafo_aleatorio(semilla, n=8, m=24, bajo=-1)
+    for destino in ["v1", "v2", "v5"]:
+        if grafo.bellman_ford_con_prev("v0")[0] is None:
+            continue
+        rutas = grafo.k_rutas_mas_cortas("v0", destino, 6)
+        if rutas is None:
+            #solo un ciclo negativo que llega al destino (aunque no salga de v0) da None
+            assert grafo._arbol_hacia(destino) == (None, None)
+            continue
+        assert [d for d, _ in rutas] == _costos_simples(grafo, "v0", destino)[:6]
+        caminos = [tuple(camino) for _, camino in rutas]
+        assert len(set(caminos)) == len(caminos)
+        for distancia, camino in rutas:
+            assert camino[0] == "v0" and camino[-1] == destino and len(set(camino)) == len(camino)
+            assert sum(grafo.peso(a, b) for a, b in zip(camino, camino[1:])) == distancia
+
+
+#el arbol hacia el destino se reutiliza y se descarta cuando el grafo cambia
+def test_arbol_por_destino(grafo_aleatorio):
+    grafo = grafo_aleatorio(2, bajo=0)
+    grafo.k_rutas_mas_cortas("v0", "v3", 4)
+    arbol = grafo._arboles_destino["v3"]
+    assert grafo.k_rutas_mas_cortas("v1", "v3", 4) is not None
+    assert grafo._arboles_destino["v3"] is arbol
+    grafo.agregar_arista("v0", "v3", 0)
+    assert grafo.k_rutas_mas_cortas("v0", "v3", 4)[0] == (0, ["v0", "v3"])
+    assert grafo._arboles_destino["v3"] is not arbol
+
+
+#alternatives escribe una fila inf por cada par sin ruta, asi cada par tiene al menos una fila
+def test_cli_pares_sin_ruta(tmp_path, capsys):
+    rutas = tmp_path / "rutas.csv"
+    rutas.write_text("origen,destino,horas\nA,B,1\nB,C,1\nA,C,3\n", encoding="utf-8")
+    pares = tmp_path / "pares.csv"
+    pares.write_text("origen,destino\nA,C\nNowhere,C\nA,Nowhere\nC,A\n", encoding="utf-8")
+    aeropuerto.main(["alternatives", "--graph", str(rutas), "--pairs", str(pares), "-k", "3"])
+    filas = list(csv.reader(capsys.readouterr().out.splitlines()))
+    assert filas == [
+        ["origen", "destino", "k", "distancia", "ruta"],
+        ["A", "C", "1", "2", "A > B > C"],
+        ["A", "C", "2", "3", "A > C"],
+        ["Nowhere", "C", "", "inf", ""],
+        ["A", "Nowhere", "", "inf", ""],
+        ["C", "A", "", "inf", ""],
+    ]
@@ -0,0 +1,39 @@
+#pruebas del cache lru de rutas por (algoritmo, origen)
+import aeropuerto
+
+
+#los resultados se reutilizan hasta que el grafo cambia de revision
+def test_aciertos_y_revision(grafo_aleatorio):
+    grafo = grafo_aleatorio(1, bajo=0)
+    dist, _ = grafo.rutas_desde("v0", "dijkstra")
+    assert grafo.rutas_desde("v0", "dijkstra")[0] is dist
+    assert (grafo.cache_aciertos, grafo.cache_fallos) == (1, 1)
+    grafo.agregar_arista("v0", "v1", 0)
+    #dijkstra no se repara: se vuelve a calcular con la arista nueva
+    assert grafo.rutas_desde("v0", "dijkstra")[0]["v1"] == 0
+    assert grafo.cache_fallos == 2
+
+
+#se expulsan los de uso menos reciente al pasar el limite de entradas o de bytes
+def test_limites(grafo_aleatorio):
+    grafo = grafo_aleatorio(2, n=30, m=90, bajo=0)
+    grafo.cache_max_entradas = 3
+    for origen in ["v0", "v1", "v2", "v0", "v3"]:
+        grafo.rutas_desde(origen, "bellman")
+    assert list(grafo._cache) == [("bellman", "v2"), ("bellman", "v0"), ("bellman", "v3")]
+    tam = grafo._cache[("bellman", "v0")][2]
+    grafo.cache_max_bytes = 2 * tam
+    grafo.rutas_desde("v4", "bellman")
+    assert len(grafo._cache) == 2 and grafo._cache_bytes <= 2 * tam
+    #sin cache no se guarda nada
+    antes = dict(grafo._cache)
+    assert grafo.rutas_desde("v5", "bellman", usar_cache=False) == grafo.bellman_ford_con_prev("v5")
+    assert grafo._cache == antes
+
+
+#un resultado mas grande que todo el cache no se guarda
+def test_resultado_que_no_cabe():
+    grafo = aeropuerto.Grafo(cache_max_bytes=10)
+    grafo.agregar_arista("A", "B", 1)
+    grafo.rutas_desde("A")
+    assert not grafo._cache and grafo._cache_bytes == 0
@@ -0,0 +1,49 @@
+#pruebas de las colas de dijkstra (heapq, heap indexado y cubetas de dial)
+import random
+
+import pytest
+
+import aeropuerto
+
+
+#cada cola da las distancias de bellman-ford con pesos enteros no negativos
+@pytest.mark.parametrize("cola", ["auto", "heap", "indexado", "cubetas"])
+@pytest.mark.parametrize("semilla", range(30))
+def test_dijkstra_por_cola(grafo_aleatorio, comprobar_arbol, cola, semilla):
+    grafo = grafo_aleatorio(semilla, n=20, m=70, bajo=0)
+    for inicio in grafo.obtener_vertices():
+        dist, prev = grafo.dijkstra_con_prev(inicio, cola=cola)
+        assert dist == grafo.bellman_ford_con_prev(inicio)[0]
+        comprobar_arbol(grafo, inicio, dist, prev)
+
+
+#con pesos flotantes o enteros grandes auto elige el heap indexado y sigue siendo exacto
+@pytest.mark.parametrize("peso_extra", [0.25, aeropuerto.Grafo.CUBETAS_MAXIMO + 1])
+def test_auto_sin_cubetas(grafo_aleatorio, peso_extra):
+    grafo = grafo_aleatorio(1, bajo=0)
+    grafo.agregar_arista("v0", "v1", peso_extra)
+    assert grafo._elegir_cola() == "indexado"
+    for inicio in grafo.obtener_vertices():
+        assert grafo.dijkstra_con_prev(inicio)[0] == grafo.bellman_ford_con_prev(inicio)[0]
+
+
+#cada cola con decrease-key saca siempre una clave con la menor prioridad pendiente
+@pytest.mark.parametrize("fabricar", [aeropuerto.HeapIndexado, lambda: aeropuerto.ColaCubetas(10)],
+                         ids=["indexado", "cubetas"])
+@pytest.mark.parametrize("semilla", range(20))
+def test_cola_contra_diccionario(fabricar, semilla):
+    r = random.Random(semilla)
+    cola = fabricar()
+    pendientes = {}
+    actual = 0
+    for _ in range(300):
+        if pendientes and r.random() < 0.4:
+            prioridad, clave = cola.extraer()
+            assert prioridad == min(pendientes.values()) == pendientes.pop(clave)
+            actual = prioridad
+        else:
+            #como en dijkstra: las prioridades nuevas estan en [actual, actual + peso_maximo]
+            clave, prioridad = r.randrange(30), actual + r.randint(0, 10)
+            pendientes[clave] = min(prioridad, pendientes.get(clave, prioridad))
+            cola.insertar_o_bajar(clave, prioridad)
+        assert len(cola) == len(pendientes)
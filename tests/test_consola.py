@@ -0,0 +1,49 @@
+#pruebas del modo consola: query sobre un .csv y sobre su snapshot .gcsr da la misma salida
+import csv
+
+import pytest
+
+import aeropuerto
+
+
+#red chica con un aeropuerto sin salidas y pares que incluyen uno desconocido
+@pytest.fixture
+def red(tmp_path, grafo_aleatorio):
+    grafo = grafo_aleatorio(5, bajo=0)
+    grafo.agregar_arista("v1", "Tijuana", 4)
+    rutas = tmp_path / "rutas.csv"
+    with open(rutas, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.writer(f)
+        escritor.writerow(["origen", "destino", "horas"])
+        for u, lista in grafo.adyacencia.items():
+            escritor.writerows((u, v, w) for v, w in lista)
+    snapshot = tmp_path / "rutas.gcsr"
+    aeropuerto.guardar_snapshot(aeropuerto.cargar_csr(rutas), snapshot)
+    pares = tmp_path / "pares.csv"
+    with open(pares, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.writer(f)
+        escritor.writerow(["origen", "destino"])
+        escritor.writerows([("v0", "Tijuana"), ("v0", "v3"), ("v2", "v0"), ("Tijuana", "v0"),
+                            ("Nowhere", "v0"), ("v0", "Nowhere"), ("v0", "v0")])
+    return rutas, snapshot, pares
+
+
+@pytest.mark.parametrize("algo", list(aeropuerto.Grafo.ALGORITMOS) + list(aeropuerto.Grafo.PUNTO_A_PUNTO)
+                         + ["johnson", "ch"])
+def test_query_gcsr_igual_que_csv(red, capsys, algo):
+    rutas, snapshot, pares = red
+    salidas = []
+    for archivo in (rutas, snapshot):
+        aeropuerto.main(["query", "--graph", str(archivo), "--pairs", str(pares), "--algo", algo])
+        salidas.append(capsys.readouterr().out)
+    assert salidas[0] == salidas[1]
+    #una fila por par mas el encabezado
+    assert len(salidas[0].splitlines()) == 8
+
+
+#desde_csr arma la misma adyacencia que agregar_arista vuelo por vuelo
+def test_grafo_desde_csr(grafo_aleatorio):
+    grafo = grafo_aleatorio(9)
+    copia = aeropuerto.Grafo.desde_csr(grafo.a_csr())
+    assert copia.adyacencia == grafo.adyacencia
+    assert copia.bellman_ford_con_prev("v0") == grafo.bellman_ford_con_prev("v0")
@@ -0,0 +1,48 @@
+#pruebas del backend compacto GrafoCSR contra el bellman-ford de Grafo
+import pytest
+
+import aeropuerto
+
+
+#bellman-ford sobre el csr da las mismas distancias que Grafo, incluso con pesos negativos
+@pytest.mark.parametrize("semilla", range(40))
+def test_bellman_csr_igual_que_grafo(grafo_aleatorio, comprobar_arbol, semilla):
+    grafo = grafo_aleatorio(semilla)
+    csr = grafo.a_csr()
+    for inicio in grafo.obtener_vertices():
+        esperado, _ = grafo.bellman_ford_con_prev(inicio)
+        dist, prev = csr.bellman_ford_con_prev(inicio)
+        assert dist == esperado
+        if dist is not None:
+            comprobar_arbol(grafo, inicio, dist, prev)
+
+
+#dijkstra sobre el csr con pesos no negativos coincide con bellman-ford de Grafo
+@pytest.mark.parametrize("semilla", range(40))
+def test_dijkstra_csr_igual_que_bellman(grafo_aleatorio, comprobar_arbol, semilla):
+    grafo = grafo_aleatorio(semilla, bajo=0)
+    csr = grafo.a_csr()
+    for inicio in grafo.obtener_vertices():
+        dist, prev = csr.dijkstra_con_prev(inicio)
+        assert dist == grafo.bellman_ford_con_prev(inicio)[0]
+        comprobar_arbol(grafo, inicio, dist, prev)
+
+
+#el csr conserva todas las aristas (incluidos vuelos paralelos) y el tipo de los pesos
+def test_aristas_y_tipo_de_pesos():
+    grafo = aeropuerto.Grafo()
+    grafo.agregar_arista("A", "B", 3)
+    grafo.agregar_arista("A", "B", 2)
+    grafo.agregar_arista("B", "C", 1)
+    csr = grafo.a_csr()
+    assert sorted(csr.aristas()) == [("A", "B", 2), ("A", "B", 3), ("B", "C", 1)]
+    assert (csr.num_vertices(), csr.num_aristas(), csr.tipo_pesos()) == (3, 3, "q")
+    grafo.agregar_arista("C", "A", 0.5)
+    assert grafo.a_csr().tipo_pesos() == "d"
+
+
+#un inicio que no esta en el grafo devuelve diccionarios vacios igual que Grafo
+def test_inicio_desconocido():
+    csr = aeropuerto.GrafoCSR.desde_aristas([("A", "B", 1)])
+    assert csr.bellman_ford_con_prev("Z") == ({}, {})
+    assert csr.dijkstra_con_prev("Z") == ({}, {})
@@ -0,0 +1,45 @@
+#pruebas de los escenarios de pesos resueltos en lote (numpy o python puro)
+import pytest
+
+import aeropuerto
+
+
+#rutas_por_escenario resuelve cada fila de pesos igual que un bellman-ford con esos pesos,
+#incluida la deteccion de ciclos negativos por escenario
+@pytest.mark.parametrize("minimo", [0, None])
+@pytest.mark.parametrize("semilla", range(10))
+def test_rutas_por_escenario(grafo_aleatorio, motor, semilla, minimo):
+    csr = grafo_aleatorio(semilla, bajo=0).a_csr()
+    inicio = csr.nombres[0]
+    pesos = csr.escenarios_pesos(6, (-2, 2), semilla=semilla, minimo=minimo)
+    dist, _, ciclo = csr.rutas_por_escenario(inicio, pesos)
+    for i, fila in enumerate(pesos):
+        escenario = aeropuerto.GrafoCSR(csr.nombres, csr.offsets, csr.destinos, [int(w) for w in fila])
+        esperado, _ = escenario.bellman_ford_con_prev(inicio)
+        assert bool(ciclo[i]) == (esperado is None)
+        if esperado is not None:
+            assert {csr.nombres[v]: d for v, d in enumerate(dist[i])} == esperado
+
+
+#el resumen cuenta todos los escenarios, sus rutas son caminos reales y la semilla lo fija
+def test_resumen_escenarios(grafo_aleatorio, motor):
+    grafo = grafo_aleatorio(3, n=10, m=40, bajo=1)
+    reporte = aeropuerto.resumen_escenarios(grafo, "v0", "v5", k=300, semilla=4, minimo=1, lote=64)
+    assert reporte == aeropuerto.resumen_escenarios(grafo, "v0", "v5", k=300, semilla=4, minimo=1, lote=100)
+    con_ruta = sum(ruta["veces"] for ruta in reporte["rutas"])
+    assert con_ruta + reporte["sin_ruta"] + reporte["ciclos_negativos"] == 300
+    for ruta in reporte["rutas"]:
+        camino = ruta["camino"]
+        assert camino[0] == "v0" and camino[-1] == "v5"
+        assert all(grafo.peso(a, b) is not None for a, b in zip(camino, camino[1:]))
+    if con_ruta:
+        tiempo = reporte["tiempo"]
+        assert tiempo["minimo"] <= tiempo["p50"] <= tiempo["maximo"]
+
+
+#un aeropuerto que no esta en el grafo termina con un mensaje en vez de un traceback
+def test_cli_aeropuerto_desconocido(tmp_path):
+    rutas = tmp_path / "rutas.csv"
+    rutas.write_text("origen,destino,horas\nA,B,1\n", encoding="utf-8")
+    with pytest.raises(SystemExit, match="Nowhere no esta en el grafo"):
+        aeropuerto.main(["scenarios", "--graph", str(rutas), "--origin", "A", "--dest", "Nowhere"])
@@ -0,0 +1,94 @@
+#pruebas del connection scan (llegada mas temprana y perfil) contra una busqueda por punto fijo
+import random
+
+import pytest
+
+import aeropuerto
+
+
+#llegada mas temprana por fuerza bruta: marca conexiones alcanzables hasta que nada cambia
+def _llegada_bruta(horario, origen, destino, salida):
+    s, t = horario.indice[origen], horario.indice[destino]
+    n = len(horario)
+    #siguiente tramo del mismo avion (seguir sentado no pide tiempo de conexion)
+    siguiente = {}
+    por_viaje = {}
+    for c in range(n):
+        por_viaje.setdefault(horario.viajes[c], []).append(c)
+    for tramos in por_viaje.values():
+        tramos.sort(key=lambda c: horario.salidas[c])
+        siguiente.update(zip(tramos, tramos[1:]))
+    alcanzada = [False] * n
+    listo = {s: salida}
+    cambio = True
+    while cambio:
+        cambio = False
+        for c in range(n):
+            u = horario.desde[c]
+            if not alcanzada[c] and u in listo and listo[u] <= horario.salidas[c]:
+                alcanzada[c] = cambio = True
+            if not alcanzada[c]:
+                continue
+            if c in siguiente and not alcanzada[siguiente[c]]:
+                alcanzada[siguiente[c]] = cambio = True
+            v = horario.hacia[c]
+            disponible = horario.llegadas[c] + horario.transbordo[v]
+            if disponible < listo.get(v, float("inf")):
+                listo[v] = disponible
+                cambio = True
+    return min([horario.llegadas[c] for c in range(n) if alcanzada[c] and horario.hacia[c] == t]
+               + [float("inf")])
+
+
+#horario al azar: pocos aeropuertos, codigos repetidos (aviones con escalas) y vuelos nocturnos
+def _horario(semilla):
+    r = random.Random(semilla)
+    aeropuertos = [f"E{i}" for i in range(r.randint(2, 7))]
+    vuelos = []
+    for _ in range(r.randint(1, 25)):
+        o, d = r.sample(aeropuertos, 2)
+        salida = r.randrange(1440)
+        vuelos.append((f"V{r.randint(0, 12)}", o, d, salida, (salida + r.randint(30, 400)) % 1440))
+    return aeropuerto.HorarioVuelos.desde_vuelos(vuelos, dias=2, transbordo=r.choice([0, 30, 60])), r
+
+
+@pytest.mark.parametrize("semilla", range(100))
+def test_llegada_igual_que_fuerza_bruta(semilla):
+    horario, r = _horario(semilla)
+    for _ in range(10):
+        origen, destino = r.sample(horario.nombres, 2)
+        salida = r.randrange(2000)
+        llegada, tramos = horario.llegada_mas_temprana(origen, destino, salida)
+        assert llegada == _llegada_bruta(horario, origen, destino, salida)
+        if not tramos:
+            continue
+        #un tramo por avion, encadenados y respetando el tiempo de conexion
+        assert tramos[0][1] == origen and tramos[0][3] >= salida
+        assert tramos[-1][2] == destino and tramos[-1][4] == llegada
+        for a, b in zip(tramos, tramos[1:]):
+            assert a[2] == b[1] and b[3] >= a[4] + horario.transbordo[horario.indice[a[2]]]
+
+
+#el perfil da, para cualquier hora, la misma llegada que una consulta de llegada mas temprana
+@pytest.mark.parametrize("semilla", range(100))
+def test_perfil_igual_que_llegada(semilla):
+    horario, r = _horario(semilla)
+    origen, destino = r.sample(horario.nombres, 2)
+    perfil = horario.perfil(origen, destino)
+    #sin opciones dominadas: salir mas tarde siempre es llegar mas tarde
+    assert all(a[0] < b[0] and a[1] < b[1] for a, b in zip(perfil, perfil[1:]))
+    for salida in [r.randrange(3000) for _ in range(8)] + [salida for salida, _ in perfil]:
+        esperado = min([llegada for hora, llegada in perfil if hora >= salida] + [float("inf")])
+        assert horario.llegada_mas_temprana(origen, destino, salida)[0] == esperado
+
+
+#horas "HH:MM", vuelos que cruzan la medianoche y aeropuertos desconocidos
+def test_horas_y_medianoche():
+    horario = aeropuerto.HorarioVuelos.desde_vuelos(
+        [("AM1", "Tijuana", "CDMX", "22:30", "04:10"), ("AM2", "CDMX", "Cancún", "05:00", "07:20")],
+        dias=2, transbordo=45)
+    llegada, tramos = horario.llegada_mas_temprana("Tijuana", "Cancún", "20:00")
+    assert aeropuerto.formato_hora(llegada) == "07:20 +1"
+    assert [tramo[0] for tramo in tramos] == ["AM1", "AM2"]
+    assert horario.llegada_mas_temprana("Tijuana", "Nowhere") == (float("inf"), [])
+    assert horario.perfil("Nowhere", "CDMX") == []
@@ -0,0 +1,50 @@
+#pruebas de la jerarquia de contraccion contra bellman-ford sobre los pesos max(minimo, w)
+import pytest
+
+import aeropuerto
+
+
+#revisa cada par de la jerarquia contra bellman-ford en la vista con pesos max(minimo, w)
+def _comprobar(jerarquia, grafo, minimo):
+    vista = grafo.con_pesos(minimo=minimo)
+    vertices = grafo.obtener_vertices()
+    for origen in vertices:
+        esperado = vista.bellman_ford_con_prev(origen)[0]
+        for destino in vertices:
+            distancia, camino = jerarquia.ruta(origen, destino)
+            assert distancia == esperado[destino]
+            if distancia == float("inf"):
+                assert camino == [origen]
+            else:
+                #el camino desempacado solo usa vuelos originales y suma la distancia
+                assert camino[0] == origen and camino[-1] == destino
+                assert sum(vista.peso(a, b) for a, b in zip(camino, camino[1:])) == distancia
+
+
+@pytest.mark.parametrize("semilla", range(30))
+def test_jerarquia_igual_que_bellman(grafo_aleatorio, semilla):
+    grafo = grafo_aleatorio(semilla, n=20, m=60)
+    _comprobar(grafo.jerarquia(), grafo, 1)
+
+
+#minimo=0 deja los vuelos de peso 0 (empates entre caminos y atajos)
+@pytest.mark.parametrize("semilla", range(10))
+def test_minimo_cero(grafo_aleatorio, semilla):
+    grafo = grafo_aleatorio(semilla, n=15, m=50, bajo=-2, alto=3)
+    _comprobar(aeropuerto.JerarquiaContraccion.desde_grafo(grafo, minimo=0), grafo, 0)
+
+
+#con un limite de testigos muy bajo sobran atajos pero las respuestas siguen siendo exactas
+def test_limite_de_testigos(grafo_aleatorio):
+    grafo = grafo_aleatorio(2, n=25, m=90)
+    _comprobar(aeropuerto.JerarquiaContraccion.desde_grafo(grafo, limite_testigos=1), grafo, 1)
+
+
+#guardar y cargar la jerarquia da las mismas rutas
+def test_guardar_y_cargar(tmp_path, grafo_aleatorio):
+    grafo = grafo_aleatorio(6, n=20, m=60)
+    ruta = tmp_path / "red.gchr"
+    aeropuerto.guardar_jerarquia(grafo.jerarquia(), ruta)
+    _comprobar(aeropuerto.cargar_jerarquia(ruta), grafo, 1)
+    #un origen o destino que no esta en la jerarquia no tiene ruta
+    assert aeropuerto.cargar_jerarquia(ruta).ruta("Nowhere", "v0") == (float("inf"), ["Nowhere"])
@@ -0,0 +1,39 @@
+#pruebas de la tabla de todos los pares (johnson) contra un bellman-ford por origen
+import pytest
+
+import aeropuerto
+
+
+#cada distancia y cada camino de la tabla coinciden con bellman-ford; None si hay ciclo negativo
+@pytest.mark.parametrize("semilla", range(40))
+def test_johnson_igual_que_bellman(grafo_aleatorio, semilla):
+    #con pesos desde -1 cerca de la mitad de los grafos no tiene ciclo negativo
+    grafo = grafo_aleatorio(semilla, bajo=-1)
+    tabla = grafo.todos_los_pares()
+    vertices = grafo.obtener_vertices()
+    resultados = {u: grafo.bellman_ford_con_prev(u)[0] for u in vertices}
+    if any(dist is None for dist in resultados.values()):
+        assert tabla is None
+        return
+    for u, dist in resultados.items():
+        for v in vertices:
+            assert tabla.distancia(u, v) == dist[v]
+            camino = tabla.camino(u, v)
+            if dist[v] == float("inf"):
+                assert camino == [u]
+            else:
+                #el camino empieza y termina donde debe y su costo es la distancia minima
+                assert camino[0] == u and camino[-1] == v
+                assert sum(grafo.peso(a, b) for a, b in zip(camino, camino[1:])) == dist[v]
+
+
+#la tabla se reutiliza hasta que el grafo cambia
+def test_tabla_por_revision():
+    grafo = aeropuerto.Grafo()
+    grafo.agregar_arista("A", "B", 2)
+    tabla = grafo.todos_los_pares()
+    assert grafo.todos_los_pares() is tabla
+    grafo.agregar_arista("B", "C", -1)
+    tabla = grafo.todos_los_pares()
+    assert tabla.distancia("A", "C") == 1 and tabla.camino("A", "C") == ["A", "B", "C"]
+    assert tabla.distancia("A", "Z") == float("inf") and tabla.camino("A", "Z") == ["A"]
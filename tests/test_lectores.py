@@ -0,0 +1,74 @@
+#pruebas de ida y vuelta de los lectores de aristas (csv, json por bloques y json lines)
+import csv
+import json
+import random
+
+import pytest
+
+import aeropuerto
+
+
+#aristas al azar con pesos enteros y flotantes; miles para que el .json ocupe varios bloques
+@pytest.fixture
+def aristas():
+    r = random.Random(7)
+    filas = []
+    for _ in range(5000):
+        peso = r.randint(-5, 40) if r.random() < 0.5 else round(r.uniform(0, 20), 3)
+        filas.append((f"A{r.randrange(300)}", f"Ciudad de México {r.randrange(300)}", peso))
+    return filas
+
+
+#lista de objetos con las columnas que espera el lector
+def _objetos(aristas):
+    return [{"origen": o, "destino": d, "horas": w} for o, d, w in aristas]
+
+
+def test_csv(tmp_path, aristas):
+    ruta = tmp_path / "rutas.csv"
+    with open(ruta, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.writer(f)
+        escritor.writerow(["origen", "destino", "horas"])
+        escritor.writerows(aristas)
+    assert list(aeropuerto.leer_aristas(ruta)) == aristas
+
+
+#lista suelta y lista dentro de {"rutas": [...]} despues de otras claves
+@pytest.mark.parametrize("envolver", [False, True])
+def test_json_por_bloques(tmp_path, aristas, envolver):
+    ruta = tmp_path / "rutas.json"
+    datos = _objetos(aristas)
+    if envolver:
+        datos = {"version": 2, "notas": {"rutas": "no es esta"}, "rutas": datos, "fin": [1, 2]}
+    ruta.write_text(json.dumps(datos, ensure_ascii=False, indent=1), encoding="utf-8")
+    assert ruta.stat().st_size > 4 * (1 << 16)
+    assert list(aeropuerto.leer_aristas(ruta)) == aristas
+
+
+#el lector por bloques decodifica igual aunque cada bloque corte numeros y cadenas a la mitad
+def test_bloques_chicos(tmp_path, aristas):
+    ruta = tmp_path / "rutas.json"
+    ruta.write_text(json.dumps({"rutas": _objetos(aristas[:40])}), encoding="utf-8")
+    for bloque in (1, 2, 7):
+        with open(ruta, encoding="utf-8") as f:
+            lector = aeropuerto._LectorJson(f, bloque)
+            lector.tomar("{")
+            assert lector.valor() == "rutas"
+            lector.tomar(":")
+            assert lector.valor() == _objetos(aristas[:40])
+
+
+def test_json_vacio_y_sin_rutas(tmp_path):
+    ruta = tmp_path / "rutas.json"
+    ruta.write_text("[ ]", encoding="utf-8")
+    assert list(aeropuerto.leer_aristas(ruta)) == []
+    ruta.write_text('{"aeropuertos": []}', encoding="utf-8")
+    with pytest.raises(KeyError):
+        list(aeropuerto.leer_aristas(ruta))
+
+
+def test_json_lines(tmp_path, aristas):
+    ruta = tmp_path / "rutas.jsonl"
+    lineas = [json.dumps(obj, ensure_ascii=False) for obj in _objetos(aristas)]
+    ruta.write_text("\n".join(lineas[:10]) + "\n\n" + "\n".join(lineas[10:]) + "\n", encoding="utf-8")
+    assert list(aeropuerto.leer_aristas(ruta)) == aristas
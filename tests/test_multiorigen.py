@@ -0,0 +1,28 @@
+#pruebas de las rutas desde muchos origenes con procesos y memoria compartida
+import pytest
+
+import aeropuerto
+
+
+#cada origen repartido en los procesos da lo mismo que una corrida local sobre el csr
+@pytest.mark.parametrize("algoritmo", list(aeropuerto.GrafoCSR.ALGORITMOS))
+def test_rutas_multiorigen(grafo_aleatorio, algoritmo):
+    grafo = grafo_aleatorio(11, n=30, m=120, bajo=0)
+    csr = grafo.a_csr()
+    resultados = {origen: (dist, prev)
+                  for origen, dist, prev in aeropuerto.rutas_multiorigen(grafo, None, algoritmo, procesos=2, en_vuelo=3)}
+    assert set(resultados) == set(csr.nombres)
+    for origen, (dist, prev) in resultados.items():
+        assert (dist, prev) == getattr(csr, csr.ALGORITMOS[algoritmo])(origen)
+        assert dist == grafo.bellman_ford_con_prev(origen)[0]
+
+
+#el pool de larga vida responde lotes con procesos y en un hilo (procesos=0)
+@pytest.mark.parametrize("procesos", [0, 2])
+def test_pool_rutas(grafo_aleatorio, procesos):
+    grafo = grafo_aleatorio(12, bajo=0)
+    with aeropuerto.PoolRutas(grafo, procesos) as pool:
+        lote = pool.enviar(["v0", "v1", "Nowhere"]).result()
+    assert [origen for origen, _, _ in lote] == ["v0", "v1", "Nowhere"]
+    assert lote[0][1] == grafo.bellman_ford_con_prev("v0")[0]
+    assert lote[2][1:] == ({}, {})
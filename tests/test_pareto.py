@@ -0,0 +1,61 @@
+#pruebas de la frontera de pareto (tiempo, tarifa, escalas) contra todos los caminos simples
+import random
+
+import pytest
+
+import aeropuerto
+
+
+#todos los caminos simples de origen a destino como (tiempo, tarifa, escalas), vuelo por vuelo
+def _caminos(grafo, origen, destino):
+    resultados = []
+    pila = [(origen, 0, 0, [origen])]
+    while pila:
+        u, tiempo, tarifa, camino = pila.pop()
+        if u == destino:
+            resultados.append((tiempo, tarifa, len(camino) - 2))
+            continue
+        for v, w in grafo.adyacencia.get(u, ()):
+            if v not in camino:
+                pila.append((v, tiempo + w, tarifa + grafo.tarifas.get((u, v), 0), camino + [v]))
+    return resultados
+
+
+#vectores que ninguno otro iguala o mejora en los tres criterios
+def _no_dominados(vectores):
+    return {a for a in vectores
+            if not any(b != a and all(x <= y for x, y in zip(b, a)) for b in vectores)}
+
+
+@pytest.mark.parametrize("semilla", range(40))
+def test_frontera_igual_que_fuerza_bruta(grafo_aleatorio, semilla):
+    grafo = grafo_aleatorio(semilla, n=7, m=18, bajo=0)
+    r = random.Random(semilla)
+    grafo.fijar_tarifas(((u, v), r.randint(0, 20)) for u, lista in grafo.adyacencia.items() for v, _ in lista)
+    for destino in ["v1", "v2", "v3"]:
+        frontera = grafo.rutas_pareto("v0", destino)
+        assert {ruta[:3] for ruta in frontera} == _no_dominados(set(_caminos(grafo, "v0", destino)))
+        assert frontera == sorted(frontera, key=lambda ruta: ruta[:3])
+        for tiempo, tarifa, escalas, camino in frontera:
+            #cada ruta es un camino real sin aeropuertos repetidos con los costos que dice
+            assert camino[0] == "v0" and camino[-1] == destino and len(set(camino)) == len(camino)
+            assert escalas == len(camino) - 2
+        #con limite de escalas solo quedan las que lo cumplen y ninguna de ellas se pierde
+        limitada = grafo.rutas_pareto("v0", destino, max_escalas=1)
+        assert {ruta[:3] for ruta in limitada} == _no_dominados(
+            {c for c in _caminos(grafo, "v0", destino) if c[2] <= 1})
+
+
+#con epsilon cada ruta exacta queda cubierta por una aproximada con no mas escalas; la
+#tolerancia se puede acumular una vez por tramo, de ahi (1 + epsilon) ** tramos
+@pytest.mark.parametrize("semilla", range(20))
+def test_epsilon(grafo_aleatorio, semilla):
+    grafo = grafo_aleatorio(semilla, n=9, m=30, bajo=1)
+    r = random.Random(semilla)
+    grafo.fijar_tarifas(((u, v), r.randint(0, 50)) for u, lista in grafo.adyacencia.items() for v, _ in lista)
+    exacta = grafo.rutas_pareto("v0", "v4")
+    aproximada = grafo.rutas_pareto("v0", "v4", epsilon=0.2)
+    assert len(aproximada) <= len(exacta)
+    for tiempo, tarifa, escalas, _ in exacta:
+        factor = 1.2 ** (escalas + 1)
+        assert any(t <= factor * tiempo and f <= factor * tarifa and k <= escalas for t, f, k, _ in aproximada)
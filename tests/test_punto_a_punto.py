@@ -0,0 +1,60 @@
+#pruebas de dijkstra bidireccional y a* contra el bellman-ford de Grafo
+import random
+
+import pytest
+
+import aeropuerto
+
+
+#coordenadas al azar para los vertices; a* debe dar la ruta minima aunque la cota sea floja
+def _con_coordenadas(grafo, semilla):
+    r = random.Random(semilla)
+    grafo.fijar_coordenadas((v, (r.uniform(14, 33), r.uniform(-118, -86))) for v in grafo.obtener_vertices())
+    return grafo
+
+
+#revisa (distancia, camino) contra las distancias de bellman-ford desde el origen
+def _comprobar_ruta(grafo, origen, destino, distancia, camino, esperado):
+    assert distancia == esperado.get(destino, float("inf"))
+    if distancia == float("inf"):
+        assert camino == [origen]
+    else:
+        assert camino[0] == origen and camino[-1] == destino
+        assert sum(grafo.peso(a, b) for a, b in zip(camino, camino[1:])) == distancia
+
+
+@pytest.mark.parametrize("algoritmo", list(aeropuerto.Grafo.PUNTO_A_PUNTO))
+@pytest.mark.parametrize("semilla", range(25))
+def test_ruta_igual_que_bellman(grafo_aleatorio, algoritmo, semilla):
+    grafo = _con_coordenadas(grafo_aleatorio(semilla, n=15, m=45, bajo=1), semilla)
+    vertices = grafo.obtener_vertices() + ["Nowhere"]
+    for origen in vertices:
+        esperado = grafo.bellman_ford_con_prev(origen)[0]
+        for destino in vertices:
+            if origen == destino:
+                continue
+            distancia, camino = grafo.ruta_entre(origen, destino, algoritmo)
+            _comprobar_ruta(grafo, origen, destino, distancia, camino, esperado)
+
+
+#con pesos negativos se responde con bellman-ford: (None, None) si hay ciclo negativo alcanzable
+@pytest.mark.parametrize("algoritmo", list(aeropuerto.Grafo.PUNTO_A_PUNTO))
+@pytest.mark.parametrize("semilla", range(10))
+def test_pesos_negativos(grafo_aleatorio, algoritmo, semilla):
+    grafo = grafo_aleatorio(semilla, bajo=-1)
+    for origen in grafo.obtener_vertices():
+        esperado = grafo.bellman_ford_con_prev(origen)[0]
+        distancia, camino = grafo.ruta_entre(origen, "v1", algoritmo)
+        if esperado is None:
+            assert (distancia, camino) == (None, None)
+        elif origen != "v1":
+            _comprobar_ruta(grafo, origen, "v1", distancia, camino, esperado)
+
+
+#sin coordenadas a* se comporta como dijkstra
+def test_a_estrella_sin_coordenadas(grafo_aleatorio):
+    grafo = grafo_aleatorio(4, bajo=0)
+    esperado = grafo.bellman_ford_con_prev("v0")[0]
+    for destino in grafo.obtener_vertices():
+        if destino != "v0":
+            _comprobar_ruta(grafo, "v0", destino, *grafo.a_estrella("v0", destino), esperado)
@@ -0,0 +1,60 @@
+#pruebas de la reparacion incremental del cache de rutas al cambiar aristas
+import random
+
+import pytest
+
+import aeropuerto
+
+
+#tras cada cambio las rutas guardadas (reparadas o no) son las de una corrida nueva
+@pytest.mark.parametrize("semilla", range(150))
+def test_cache_reparado_igual_que_corrida_nueva(semilla):
+    r = random.Random(semilla)
+    grafo = aeropuerto.Grafo()
+    n = r.randint(3, 8)
+    for _ in range(r.randint(2, 14)):
+        u, v = r.randrange(n), r.randrange(n)
+        if u != v:
+            grafo.agregar_arista(f"v{u}", f"v{v}", r.randint(-1, 9))
+    origenes = grafo.obtener_vertices()
+    for _ in range(8):
+        for inicio in origenes:
+            grafo.rutas_desde(inicio, r.choice(["bellman", "spfa"]))
+        #un cambio al azar: quitar, cambiar el peso o agregar una arista (quiza con un vertice nuevo)
+        aristas = [(u, v) for u, lista in grafo.adyacencia.items() for v, _ in lista]
+        opcion = r.random()
+        if opcion < 0.4 and aristas:
+            grafo.eliminar_arista(*r.choice(aristas))
+        elif opcion < 0.7 and aristas:
+            grafo.actualizar_peso(*r.choice(aristas), r.randint(-1, 9))
+        else:
+            u, v = r.randrange(n + 2), r.randrange(n + 2)
+            if u != v:
+                grafo.agregar_arista(f"v{u}", f"v{v}", r.randint(-1, 9))
+        #el tamaño anotado de cada entrada y el total siguen siendo consistentes
+        for dist, prev, tam in grafo._cache.values():
+            assert tam == grafo._tam_resultado(dist, prev)
+        assert grafo._cache_bytes == sum(tam for _, _, tam in grafo._cache.values())
+        for (algoritmo, inicio) in list(grafo._cache):
+            dist, prev = grafo.rutas_desde(inicio, algoritmo)
+            esperado, esperado_prev = grafo.bellman_ford_con_prev(inicio)
+            assert dist == esperado
+            if dist is not None:
+                assert set(prev) == set(esperado_prev)
+        #un origen que se quedo sin aristas responde como una corrida nueva
+        for inicio in origenes:
+            if inicio not in grafo.obtener_vertices():
+                assert grafo.rutas_desde(inicio, "bellman") == ({}, {})
+
+
+#subir un peso repara la entrada guardada en lugar de descartarla
+def test_cambio_de_peso_es_acierto():
+    grafo = aeropuerto.Grafo()
+    for u, v, w in [("A", "B", 1), ("B", "C", 1), ("A", "C", 5)]:
+        grafo.agregar_arista(u, v, w)
+    grafo.rutas_desde("A", "bellman")
+    grafo.actualizar_peso("B", "C", 10)
+    aciertos = grafo.cache_aciertos
+    dist, prev = grafo.rutas_desde("A", "bellman")
+    assert grafo.cache_aciertos == aciertos + 1
+    assert dist == {"A": 0, "B": 1, "C": 5} and prev["C"] == "A"
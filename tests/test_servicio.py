@@ -0,0 +1,114 @@
+#pruebas del servicio de rutas: coalescencia, lotes, cache y el protocolo http
+import asyncio
+import json
+
+import pytest
+
+import aeropuerto
+import servicio
+
+
+#corre una corrutina con un servicio sobre un grafo aleatorio y lo cierra al terminar
+def _con_servicio(grafo, prueba, **opciones):
+    async def correr():
+        servidor = servicio.ServicioRutas(grafo, **opciones)
+        servidor.iniciar()
+        try:
+            return await prueba(servidor)
+        finally:
+            await servidor.cerrar()
+    return asyncio.run(correr())
+
+
+#respuesta esperada calculada con bellman-ford directo sobre el grafo
+def _esperado(grafo, origen, destino):
+    dist, prev = grafo.bellman_ford_con_prev(origen)
+    if dist[destino] == float("inf"):
+        return {"origen": origen, "destino": destino, "distancia": None, "ruta": []}
+    return {"origen": origen, "destino": destino, "distancia": dist[destino],
+            "ruta": aeropuerto.reconstruir_camino(prev, origen, destino)}
+
+
+#muchas consultas simultaneas del mismo origen comparten una sola corrida
+@pytest.mark.parametrize("procesos", [0, 2])
+def test_coalescencia(grafo_aleatorio, procesos):
+    grafo = grafo_aleatorio(1, n=20, m=80, bajo=0)
+    destinos = [f"v{i % 20}" for i in range(50)]
+
+    async def prueba(servidor):
+        respuestas = await asyncio.gather(*(servidor.consultar("v0", d) for d in destinos))
+        return respuestas, servidor.contadores
+
+    respuestas, contadores = _con_servicio(grafo, prueba, procesos=procesos, cache_maximo=0)
+    assert (contadores.corridas, contadores.lotes, contadores.coalescidas) == (1, 1, 49)
+    for destino, respuesta in zip(destinos, respuestas):
+        esperado = _esperado(grafo, "v0", destino)
+        assert respuesta["distancia"] == esperado["distancia"]
+        if respuesta["ruta"]:
+            camino = respuesta["ruta"]
+            assert camino[0] == "v0" and camino[-1] == destino
+            assert sum(grafo.peso(a, b) for a, b in zip(camino, camino[1:])) == esperado["distancia"]
+
+
+#origenes distintos dentro de la ventana se juntan en lotes de a lo mas lote_maximo
+def test_lotes_y_cache(grafo_aleatorio):
+    grafo = grafo_aleatorio(2, n=20, m=80, bajo=0)
+    origenes = [f"v{i}" for i in range(20)]
+
+    async def prueba(servidor):
+        primeras = await asyncio.gather(*(servidor.consultar(o, "v1") for o in origenes))
+        segundas = await asyncio.gather(*(servidor.consultar(o, "v1") for o in origenes))
+        return primeras, segundas, servidor.contadores
+
+    primeras, segundas, contadores = _con_servicio(grafo, prueba, procesos=0, ventana_ms=50,
+                                                   lote_maximo=8, cache_maximo=64)
+    assert primeras == segundas
+    assert contadores.corridas == 20 and contadores.lotes == 3
+    assert contadores.aciertos_cache == 20
+
+
+def test_aeropuerto_desconocido(grafo_aleatorio):
+    async def prueba(servidor):
+        with pytest.raises(KeyError):
+            await servidor.consultar("v0", "Nowhere")
+    _con_servicio(grafo_aleatorio(3, bajo=0), prueba, procesos=0)
+
+
+#peticiones http reales: get, post, errores y content-length invalido (responde 400 y cierra)
+def test_http(grafo_aleatorio):
+    grafo = grafo_aleatorio(4, bajo=0)
+
+    async def prueba(servidor):
+        tcp = await asyncio.start_server(servidor.atender, "127.0.0.1", 0)
+        host, puerto = tcp.sockets[0].getsockname()[:2]
+        try:
+            resultados = [
+                await servicio.pedir(host, puerto, "/ruta?origen=v0&destino=v5"),
+                await servicio.pedir(host, puerto, "/ruta?origen=v0&destino=Nowhere"),
+                await servicio.pedir(host, puerto, "/ruta?origen=v0"),
+                await servicio.pedir(host, puerto, "/nada"),
+            ]
+            lector, escritor = await asyncio.open_connection(host, puerto)
+            cuerpo = json.dumps({"origen": "v0", "destino": "v5"}).encode()
+            escritor.write(b"POST /ruta HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % len(cuerpo) + cuerpo)
+            resultados.append(await servicio._leer_respuesta(lector))
+            escritor.write(b"POST /ruta HTTP/1.1\r\nContent-Length: -3\r\n\r\n{}")
+            resultados.append(await servicio._leer_respuesta(lector))
+            #despues del 400 el servidor cierra la conexion
+            resultados.append(await lector.read())
+            escritor.close()
+            return resultados
+        finally:
+            tcp.close()
+            await tcp.wait_closed()
+
+    ruta, desconocido, incompleta, no_existe, post, invalida, resto = _con_servicio(grafo, prueba, procesos=0)
+    assert ruta == (200, _esperado(grafo, "v0", "v5")) == post
+    assert desconocido[0] == 404 and incompleta[0] == 400 and no_existe[0] == 404
+    assert invalida[0] == 400 and resto == b""
+
+
+#percentil por rango mas cercano compartido con benchmark.py
+def test_percentil():
+    assert aeropuerto.percentil([], 50) is None
+    assert [aeropuerto.percentil([1, 2, 3, 4], p) for p in (0, 25, 50, 95, 100)] == [1, 1, 2, 4, 4]
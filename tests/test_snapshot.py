@@ -0,0 +1,36 @@
+#pruebas de ida y vuelta del snapshot binario (.gcsr) mapeado en memoria
+import pytest
+
+import aeropuerto
+
+
+#guardar y cargar conserva nombres, aristas, tipo de pesos y las rutas calculadas
+@pytest.mark.parametrize("semilla", range(10))
+@pytest.mark.parametrize("flotantes", [False, True])
+def test_ida_y_vuelta(tmp_path, grafo_aleatorio, semilla, flotantes):
+    grafo = grafo_aleatorio(semilla, bajo=0)
+    if flotantes:
+        grafo.agregar_arista("v0", "Mérida", 1.5)
+    csr = grafo.a_csr()
+    ruta = tmp_path / "red.gcsr"
+    aeropuerto.guardar_snapshot(csr, ruta)
+    cargado = aeropuerto.cargar_csr(ruta)
+    assert cargado.nombres == csr.nombres
+    assert cargado.tipo_pesos() == csr.tipo_pesos() == ("d" if flotantes else "q")
+    assert list(cargado.aristas()) == list(csr.aristas())
+    for inicio in csr.nombres:
+        assert cargado.dijkstra_con_prev(inicio) == csr.dijkstra_con_prev(inicio)
+
+
+def test_grafo_vacio(tmp_path):
+    ruta = tmp_path / "vacio.gcsr"
+    aeropuerto.guardar_snapshot(aeropuerto.GrafoCSR.desde_aristas([]), ruta)
+    cargado = aeropuerto.cargar_snapshot(ruta)
+    assert (cargado.num_vertices(), cargado.num_aristas()) == (0, 0)
+
+
+def test_archivo_que_no_es_snapshot(tmp_path):
+    ruta = tmp_path / "otro.gcsr"
+    ruta.write_bytes(b"XXXX" + bytes(64))
+    with pytest.raises(ValueError):
+        aeropuerto.cargar_snapshot(ruta)
@@ -0,0 +1,17 @@
+#pruebas de spfa (heuristicas SLF y LLL) contra el bellman-ford de Grafo
+import pytest
+
+
+#mismas distancias que bellman-ford y la misma deteccion de ciclo negativo (None, None)
+@pytest.mark.parametrize("semilla", range(60))
+def test_spfa_igual_que_bellman(grafo_aleatorio, comprobar_arbol, semilla):
+    grafo = grafo_aleatorio(semilla)
+    for inicio in grafo.obtener_vertices():
+        esperado, _ = grafo.bellman_ford_con_prev(inicio)
+        dist, prev = grafo.spfa_con_prev(inicio)
+        assert dist == esperado
+        if dist is None:
+            assert prev is None
+        else:
+            comprobar_arbol(grafo, inicio, dist, prev)
+
@@ -0,0 +1,34 @@
+#pruebas del bellman-ford por rondas (numpy o python puro) y de la extraccion del ciclo negativo
+import pytest
+
+import aeropuerto
+
+
+#sin ciclo negativo da las mismas distancias que Grafo; con ciclo devuelve un ciclo negativo real
+@pytest.mark.parametrize("semilla", range(40))
+def test_vectorizado_igual_que_bellman(grafo_aleatorio, comprobar_arbol, motor, semilla):
+    grafo = grafo_aleatorio(semilla)
+    csr = grafo.a_csr()
+    for inicio in grafo.obtener_vertices():
+        esperado, _ = grafo.bellman_ford_con_prev(inicio)
+        dist, prev, ciclo = csr.bellman_ford_vectorizado(inicio)
+        if esperado is None:
+            assert dist is None and prev is None
+            #el ciclo viene cerrado, en el sentido de los vuelos y con peso total negativo
+            assert len(ciclo) >= 2 and ciclo[0] == ciclo[-1]
+            assert sum(grafo.peso(u, v) for u, v in zip(ciclo, ciclo[1:])) < 0
+        else:
+            assert ciclo is None
+            assert dist == esperado
+            comprobar_arbol(grafo, inicio, dist, prev)
+
+
+#un ciclo negativo conocido se devuelve completo (la rotacion depende de donde se detecte)
+def test_ciclo_conocido(motor):
+    grafo = aeropuerto.Grafo()
+    for u, v, w in [("A", "B", 1), ("B", "C", 2), ("C", "D", -4), ("D", "B", 1), ("D", "E", 1)]:
+        grafo.agregar_arista(u, v, w)
+    dist, prev, ciclo = grafo.bellman_ford_vectorizado("A")
+    assert dist is None and prev is None
+    assert sorted(ciclo[:-1]) == ["B", "C", "D"] and ciclo[0] == ciclo[-1]
+
@@ -0,0 +1,54 @@
+#pruebas de las vistas que comparten la topologia del grafo base
+import pytest
+
+import aeropuerto
+
+
+#copia del grafo con cada peso ya transformado, para comparar con la vista
+def _transformado(grafo, vista):
+    copia = aeropuerto.Grafo()
+    for u, lista in grafo.adyacencia.items():
+        for v, w in lista:
+            copia.agregar_arista(u, v, vista.transformar(w))
+    return copia
+
+
+#cada algoritmo sobre VistaPesos da lo mismo que sobre un grafo con los pesos ya transformados
+@pytest.mark.parametrize("semilla", range(30))
+def test_vista_pesos_igual_que_copia(grafo_aleatorio, semilla):
+    grafo = grafo_aleatorio(semilla)
+    vista = grafo.con_pesos(minimo=1, escala=2, desplazamiento=-3)
+    copia = _transformado(grafo, vista)
+    for inicio in list(grafo.adyacencia)[:4]:
+        for metodo in aeropuerto.Grafo.ALGORITMOS.values():
+            assert getattr(vista, metodo)(inicio) == getattr(copia, metodo)(inicio)
+
+
+#la lista de la vista se lee como secuencia sin copiar la del grafo base y sigue sus cambios
+def test_lista_transformada():
+    grafo = aeropuerto.Grafo()
+    grafo.agregar_arista("A", "B", -4)
+    grafo.agregar_arista("A", "C", 7)
+    vista = grafo.con_pesos(minimo=0, maximo=5)
+    lista = vista.adyacencia["A"]
+    assert list(lista) == [lista[0], lista[1]] == lista[:] == [("B", 0), ("C", 5)]
+    assert len(lista) == 2 and lista[-1] == ("C", 5)
+    grafo.actualizar_peso("A", "B", 3)
+    assert list(vista.adyacencia["A"]) == [("B", 3), ("C", 5)]
+    assert vista.rutas_desde("A")[0] == {"A": 0, "B": 3, "C": 5}
+    with pytest.raises(TypeError):
+        vista.agregar_arista("B", "C", 1)
+
+
+#la copia con escritura cambia solo en la vista y sigue viendo los cambios del base en lo demas
+def test_copia_ligera():
+    grafo = aeropuerto.Grafo()
+    grafo.agregar_arista("A", "B", 1)
+    grafo.agregar_arista("B", "C", 1)
+    copia = grafo.copia_ligera()
+    copia.actualizar_peso("A", "B", 10)
+    copia.agregar_arista("A", "C", 4)
+    assert grafo.rutas_desde("A")[0] == {"A": 0, "B": 1, "C": 2}
+    assert copia.rutas_desde("A")[0] == {"A": 0, "B": 10, "C": 4}
+    grafo.actualizar_peso("B", "C", 5)
+    assert copia.rutas_desde("B")[0] == {"A": float("inf"), "B": 0, "C": 5}